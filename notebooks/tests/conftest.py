@@ -74,3 +74,34 @@ def _make_es_hit(article_number: str, title: str, score: float = 1.0) -> dict:
 def make_es_hit():
     """Factory fixture for creating fake ES hit dicts."""
     return _make_es_hit
+
+
+def _bulk_ok_response(operations: list, status: int = 201) -> dict:
+    """Helper to build a fake ``_bulk`` response with one item per action."""
+    items = []
+    for op in operations:
+        if len(op) == 1 and next(iter(op)) in ("index", "create", "update", "delete"):
+            op_type, meta = next(iter(op.items()))
+            items.append({op_type: {"_id": meta.get("_id"), "status": status}})
+    return {"errors": False, "items": items}
+
+
+@pytest.fixture
+def language_dumps(sample_markdown, tmp_path):
+    """Two local 'language editions' (en, de) so nothing hits the network."""
+    paths = {}
+    for lang in ("en", "de"):
+        path = tmp_path / f"{lang}.md"
+        path.write_text(sample_markdown, encoding="utf-8")
+        paths[lang] = str(path)
+    return paths
+
+
+@pytest.fixture
+def fake_bulk_client():
+    """MagicMock ES client whose ``bulk`` acknowledges every action."""
+    from unittest.mock import MagicMock
+
+    es = MagicMock()
+    es.bulk.side_effect = lambda operations, **kw: _bulk_ok_response(operations)
+    return es
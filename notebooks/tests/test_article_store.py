@@ -0,0 +1,104 @@
+"""Unit tests for notebooks/utils/article_store.py."""
+
+import pyarrow as pa
+import pytest
+
+from utils.article_store import (
+    articles_frame,
+    articles_to_table,
+    iter_actions,
+    iter_articles_from_store,
+    iter_record_batches,
+    read_articles,
+    write_articles,
+)
+from utils.chunking import iter_passages
+from utils.indexing import bulk_index
+from utils.parsing import parse_articles
+
+
+@pytest.fixture
+def articles(sample_markdown):
+    return parse_articles(sample_markdown, "en") + parse_articles(sample_markdown, "de")
+
+
+@pytest.fixture(params=[".arrow", ".parquet"])
+def store(request, articles, tmp_path):
+    path = tmp_path / f"articles{request.param}"
+    write_articles(path, articles, batch_size=2)
+    return path
+
+
+class TestWriteRead:
+    def test_roundtrip(self, store, articles):
+        assert read_articles(store).to_pylist() == articles
+
+    def test_dictionary_encoded_columns(self, store):
+        schema = read_articles(store).schema
+        for name in ("language", "url"):
+            assert pa.types.is_dictionary(schema.field(name).type)
+        assert schema.field("text").type == pa.string()
+
+    def test_arrow_file_is_memory_mapped(self, articles, tmp_path):
+        records = [{**a, "id": f"{a['id']}_{i}"} for i in range(50) for a in articles]
+        path = tmp_path / "articles.arrow"
+        write_articles(path, records, batch_size=100)
+        before = pa.total_allocated_bytes()
+        table = read_articles(path)
+        # Text buffers point into the mapping; only the small dictionaries
+        # (merged from their deltas) are allocated.
+        text_bytes = table.column("text").nbytes
+        assert pa.total_allocated_bytes() - before < text_bytes / 20
+        assert table.num_rows == len(records)
+
+    def test_columns(self, store):
+        assert read_articles(store, columns=["id", "language"]).column_names == ["id", "language"]
+
+    def test_passages(self, articles, tmp_path):
+        passages = list(iter_passages(articles, max_tokens=40, overlap_tokens=5))
+        path = tmp_path / "passages.parquet"
+        assert write_articles(path, passages) == len(passages)
+        assert read_articles(path).to_pylist() == passages
+
+    def test_empty(self, tmp_path):
+        assert write_articles(tmp_path / "empty.arrow", []) == 0
+        assert read_articles(tmp_path / "empty.arrow").num_rows == 0
+
+    def test_unsupported_suffix(self, articles, tmp_path):
+        with pytest.raises(ValueError, match="Unsupported"):
+            write_articles(tmp_path / "articles.csv", articles)
+
+    def test_failed_write_leaves_no_file(self, articles, tmp_path):
+        def records():
+            yield from articles
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            write_articles(tmp_path / "articles.arrow", records(), batch_size=2)
+        assert list(tmp_path.iterdir()) == []
+
+
+class TestRecordBatches:
+    def test_batch_size(self, store, articles):
+        batches = list(iter_record_batches(store, batch_size=3))
+        assert all(b.num_rows <= 3 for b in batches)
+        assert sum(b.num_rows for b in batches) == len(articles)
+
+    def test_from_table(self, articles):
+        table = articles_to_table(articles)
+        assert table.column("language").num_chunks == 1
+        assert list(iter_articles_from_store(table, batch_size=4)) == articles
+
+    def test_iter_actions_feed_bulk_index(self, store, articles, fake_bulk_client):
+        result = bulk_index(fake_bulk_client, iter_actions(store, "idx"), verbose=False)
+        assert result["indexed"] == len(articles)
+        ops = fake_bulk_client.bulk.call_args[1]["operations"]
+        assert ops[0] == {"index": {"_index": "idx", "_id": articles[0]["id"]}}
+        assert ops[1] == articles[0]
+
+    def test_articles_frame_categoricals(self, store, articles):
+        frame = articles_frame(store, columns=["id", "language"])
+        assert list(frame.columns) == ["id", "language"]
+        assert str(frame["language"].dtype) == "category"
+        assert set(frame["language"]) == {"en", "de"}
+        assert len(frame) == len(articles)
@@ -0,0 +1,98 @@
+"""Unit tests for the parsing benchmark runner."""
+
+import json
+
+import pytest
+
+from utils.benchmark import (
+    PARSERS,
+    benchmark_parser,
+    compare_results,
+    iter_corpus,
+    main,
+    run_benchmarks,
+    write_corpus,
+)
+from utils.parsing import parse_articles
+
+
+class TestCorpus:
+    def test_reaches_target_size(self):
+        size = sum(len(p.encode("utf-8")) for p in iter_corpus(200_000))
+        assert 200_000 <= size < 220_000
+
+    def test_deterministic_per_seed(self):
+        assert "".join(iter_corpus(50_000, seed=1)) == "".join(iter_corpus(50_000, seed=1))
+        assert "".join(iter_corpus(50_000, seed=1)) != "".join(iter_corpus(50_000, seed=2))
+
+    def test_parses_into_unique_articles(self):
+        articles = parse_articles("".join(iter_corpus(100_000)))
+        ids = [a["id"] for a in articles]
+        assert len(ids) > 10
+        assert len(ids) == len(set(ids))
+        assert not any("CHAPTER" in a["text"] for a in articles)
+
+
+class TestBenchmark:
+    def test_all_parsers_agree_on_article_count(self, tmp_path):
+        path = write_corpus(tmp_path / "c.md", 0.1)
+        expected = len(parse_articles(path.read_text(encoding="utf-8")))
+        for name in PARSERS:
+            if name == "iter_sections":
+                continue
+            result = benchmark_parser(name, path, repeat=1, memory=False)
+            assert result["articles"] == expected, name
+            assert result["mb_per_sec"] > 0
+            assert result["peak_mb"] is None
+
+    def test_peak_memory_measured(self, tmp_path):
+        path = write_corpus(tmp_path / "c.md", 0.1)
+        result = benchmark_parser("parse_articles", path, repeat=1)
+        assert result["peak_mb"] > 0
+
+    def test_run_benchmarks_unknown_parser(self):
+        with pytest.raises(ValueError, match="Unknown parser"):
+            run_benchmarks([0.1], parsers=["nope"])
+
+    def test_run_benchmarks_grid(self, tmp_path):
+        results = run_benchmarks(
+            [0.05, 0.1], ["iter_articles", "parse_articles_file"],
+            repeat=1, memory=False, workdir=tmp_path, verbose=False,
+        )
+        assert [(r["parser"], r["size_mb"]) for r in results] == [
+            ("iter_articles", 0.05), ("parse_articles_file", 0.05),
+            ("iter_articles", 0.1), ("parse_articles_file", 0.1),
+        ]
+        assert list(tmp_path.iterdir()) == []
+
+
+class TestCompareResults:
+    BASE = [{"parser": "p", "size_mb": 1.0, "mb_per_sec": 100.0, "peak_mb": 10.0}]
+
+    def test_within_tolerance(self):
+        current = [{"parser": "p", "size_mb": 1.0, "mb_per_sec": 85.0, "peak_mb": 11.0}]
+        assert compare_results(current, self.BASE) == []
+
+    def test_throughput_and_memory_regressions(self):
+        current = [{"parser": "p", "size_mb": 1.0, "mb_per_sec": 50.0, "peak_mb": 20.0}]
+        regressions = compare_results(current, self.BASE)
+        assert len(regressions) == 2
+        assert "MB/s" in regressions[0]
+        assert "MiB peak" in regressions[1]
+
+    def test_missing_pairs_ignored(self):
+        current = [{"parser": "q", "size_mb": 1.0, "mb_per_sec": 1.0, "peak_mb": None}]
+        assert compare_results(current, self.BASE) == []
+
+    def test_main_exits_nonzero_on_regression(self, tmp_path, capsys):
+        baseline = tmp_path / "base.json"
+        output = tmp_path / "out.json"
+        args = ["--sizes", "0.05", "--parsers", "iter_articles", "--repeat", "1",
+                "--no-memory", "--workdir", str(tmp_path)]
+        assert main(args + ["--output", str(output)]) == 0
+
+        results = json.loads(output.read_text())
+        results[0]["mb_per_sec"] *= 1000
+        baseline.write_text(json.dumps(results))
+        assert main(args + ["--baseline", str(baseline)]) == 1
+        assert "Regression" in capsys.readouterr().out
@@ -0,0 +1,83 @@
+"""Unit tests for notebooks/utils/chunking.py."""
+
+import pytest
+
+from utils.chunking import chunk_article, chunk_text, iter_passages
+from utils.parsing import parse_articles
+
+
+def _article(text: str) -> dict:
+    return {
+        "id": "en_art_5",
+        "article_number": "5",
+        "title": "Prohibited artificial intelligence practices",
+        "text": text,
+        "language": "en",
+        "url": "https://example.test#Art5",
+    }
+
+
+def _words(n: int, prefix: str = "w") -> str:
+    return " ".join(f"{prefix}{i}" for i in range(n))
+
+
+class TestChunkText:
+    def test_short_text_single_span(self):
+        text = "  one two three  "
+        assert chunk_text(text, max_tokens=10, overlap_tokens=0) == [(2, 15)]
+
+    def test_empty_text(self):
+        assert chunk_text("   ") == []
+
+    def test_respects_budget_and_overlap(self):
+        text = _words(100)
+        spans = chunk_text(text, max_tokens=30, overlap_tokens=5)
+        pieces = [text[s:e].split() for s, e in spans]
+        assert all(len(p) <= 30 for p in pieces)
+        for prev, nxt in zip(pieces, pieces[1:]):
+            assert prev[-5:] == nxt[:5]
+        assert pieces[-1][-1] == "w99"
+
+    def test_prefers_paragraph_boundary(self):
+        text = _words(20, "a") + "\n\n" + _words(20, "b")
+        spans = chunk_text(text, max_tokens=30, overlap_tokens=0)
+        assert text[spans[0][0]:spans[0][1]] == _words(20, "a")
+        assert text[spans[1][0]:spans[1][1]] == _words(20, "b")
+
+    def test_prefers_numbered_point_boundary(self):
+        text = "1. " + _words(20, "a") + "\n(a) " + _words(20, "b")
+        spans = chunk_text(text, max_tokens=30, overlap_tokens=0)
+        assert text[spans[1][0]:].startswith("(a) b0")
+
+    def test_hard_cut_without_boundaries(self):
+        spans = chunk_text(_words(50), max_tokens=20, overlap_tokens=0)
+        assert len(spans) == 3
+
+    def test_invalid_overlap(self):
+        with pytest.raises(ValueError, match="overlap_tokens"):
+            chunk_text("a b c", max_tokens=5, overlap_tokens=5)
+
+
+class TestChunkArticle:
+    def test_offsets_point_into_article_text(self):
+        article = _article(_words(40, "a") + "\n\n" + _words(40, "b"))
+        passages = chunk_article(article, max_tokens=50, overlap_tokens=10)
+        assert len(passages) > 1
+        for p in passages:
+            assert article["text"][p["chunk_start"]:p["chunk_end"]] == p["text"]
+            assert p["article_number"] == "5"
+            assert p["parent_id"] == "en_art_5"
+            assert p["chunk_count"] == len(passages)
+        assert [p["id"] for p in passages][:2] == ["en_art_5_chunk_0", "en_art_5_chunk_1"]
+
+    def test_short_article_is_one_passage(self, sample_markdown):
+        article = parse_articles(sample_markdown)[0]
+        passages = chunk_article(article, max_tokens=1000)
+        assert len(passages) == 1
+        assert passages[0]["text"] == article["text"]
+
+    def test_iter_passages_covers_all_articles(self, sample_markdown):
+        articles = parse_articles(sample_markdown)
+        passages = list(iter_passages(articles, max_tokens=40, overlap_tokens=8))
+        assert {p["parent_id"] for p in passages} == {a["id"] for a in articles}
+        assert len(passages) > len(articles)
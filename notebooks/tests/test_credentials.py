@@ -186,3 +186,178 @@ class TestGetElasticsearchClient:
         from utils.credentials import get_elasticsearch_client
         with pytest.raises(ValueError, match="No ELASTIC_URL or ELASTIC_CLOUD_ID"):
             get_elasticsearch_client({"ELASTIC_API_KEY": "key"})
+
+
+class TestCreateElasticsearchClient:
+    CREDS = {"ELASTIC_URL": "https://test.elastic.cloud:443", "ELASTIC_API_KEY": "key123"}
+
+    @pytest.fixture(autouse=True)
+    def _fresh_cache(self):
+        from utils.credentials import clear_client_cache
+        clear_client_cache()
+        yield
+        clear_client_cache()
+
+    def test_tuned_transport_options(self):
+        from utils.credentials import create_elasticsearch_client
+        with patch("elasticsearch.Elasticsearch") as MockES:
+            create_elasticsearch_client(self.CREDS, connections_per_node=32, request_timeout=5)
+            MockES.assert_called_once_with(
+                hosts=["https://test.elastic.cloud:443"],
+                api_key="key123",
+                connections_per_node=32,
+                http_compress=True,
+                request_timeout=5,
+                max_retries=3,
+                retry_on_status=(429, 502, 503, 504),
+                retry_on_timeout=True,
+            )
+
+    def test_shared_per_credentials(self):
+        from utils.credentials import create_elasticsearch_client
+        with patch("elasticsearch.Elasticsearch", side_effect=lambda **kw: object()) as MockES:
+            a = create_elasticsearch_client(self.CREDS)
+            b = create_elasticsearch_client(dict(self.CREDS))
+            c = create_elasticsearch_client({**self.CREDS, "ELASTIC_API_KEY": "other"})
+            d = create_elasticsearch_client(self.CREDS, shared=False)
+        assert a is b
+        assert a is not c and a is not d
+        assert MockES.call_count == 3
+
+    def test_keep_alive_off_sends_connection_close(self):
+        from utils.credentials import create_elasticsearch_client
+        with patch("elasticsearch.Elasticsearch") as MockES:
+            create_elasticsearch_client(self.CREDS, keep_alive=False)
+            assert MockES.call_args.kwargs["headers"] == {"connection": "close"}
+
+    def test_async_client_cached_per_event_loop(self):
+        import asyncio
+        from utils.credentials import create_elasticsearch_client
+
+        async def make():
+            return (create_elasticsearch_client(self.CREDS, async_client=True),
+                    create_elasticsearch_client(self.CREDS, async_client=True))
+
+        with patch("elasticsearch.AsyncElasticsearch", side_effect=lambda **kw: object()) as MockES:
+            first, again = asyncio.run(make())
+            other_loop, _ = asyncio.run(make())
+        assert first is again
+        assert first is not other_loop
+        assert MockES.call_count == 2
+
+    def test_async_client_outside_loop_not_shared(self):
+        import asyncio
+        from utils.credentials import create_elasticsearch_client
+
+        async def make():
+            return create_elasticsearch_client(self.CREDS, async_client=True)
+
+        with patch("elasticsearch.AsyncElasticsearch", side_effect=lambda **kw: object()) as MockES:
+            first = create_elasticsearch_client(self.CREDS, async_client=True)
+            second = create_elasticsearch_client(self.CREDS, async_client=True)
+            in_loop = asyncio.run(make())
+        assert first is not second
+        assert in_loop is not first and in_loop is not second
+        assert MockES.call_count == 3
+
+    def test_cloud_id(self):
+        from utils.credentials import create_elasticsearch_client
+        with patch("elasticsearch.Elasticsearch") as MockES:
+            create_elasticsearch_client({"ELASTIC_CLOUD_ID": "c:abc", "ELASTIC_API_KEY": "k"})
+            assert MockES.call_args.kwargs["cloud_id"] == "c:abc"
+
+    def test_missing_endpoint_raises(self):
+        from utils.credentials import create_elasticsearch_client
+        with pytest.raises(ValueError, match="No ELASTIC_URL or ELASTIC_CLOUD_ID"):
+            create_elasticsearch_client({"ELASTIC_API_KEY": "key"})
+
+
+class TestResolveConfig:
+    @pytest.fixture
+    def env_files(self, clean_env, tmp_path, monkeypatch):
+        import utils.credentials as creds_mod
+
+        ui_env = tmp_path / "ui_env"
+        ui_env.write_text("ELASTICSEARCH_URL=https://ui.elastic.cloud:443\nJINA_API_KEY=j1\n")
+        monkeypatch.setattr(creds_mod, "UI_ENV_FILE", ui_env)
+        monkeypatch.setattr(creds_mod, "ENV_FILE", tmp_path / "nonexistent")
+        monkeypatch.setenv("USER_SUFFIX", "test")
+        creds_mod.clear_config_cache()
+        yield ui_env
+        creds_mod.clear_config_cache()
+
+    def test_resolves_without_prompting(self, env_files):
+        from utils.credentials import resolve_config
+        with patch("utils.credentials.getpass.getpass") as mock_getpass:
+            config = resolve_config()
+            mock_getpass.assert_not_called()
+        assert config.elastic_url == "https://ui.elastic.cloud:443"
+        assert config.elastic_api_key is None
+        assert config.credentials() == {
+            "ELASTIC_URL": "https://ui.elastic.cloud:443",
+            "JINA_API_KEY": "j1",
+            "USER_SUFFIX": "test",
+        }
+
+    def test_env_files_parsed_once(self, env_files):
+        from utils.credentials import get_credentials, resolve_config
+        with patch("dotenv.dotenv_values", wraps=__import__("dotenv").dotenv_values) as spy:
+            first = resolve_config()
+            assert resolve_config() is first
+            get_credentials(require_elastic=False, save_prompt=False)
+            assert spy.call_count == 1
+
+    def test_mtime_change_invalidates(self, env_files):
+        from utils.credentials import resolve_config
+        first = resolve_config()
+        env_files.write_text("JINA_API_KEY=j2\n")
+        stat = env_files.stat()
+        os.utime(env_files, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        second = resolve_config()
+        assert second is not first
+        assert second.jina_api_key == "j2"
+        # Entries removed from the file do not linger from the first load.
+        assert second.elastic_url is None
+
+    def test_reload_replaces_primary_values(self, env_files):
+        from utils.credentials import resolve_config
+        env_files.write_text("ELASTIC_URL=https://one\n")
+        assert resolve_config().elastic_url == "https://one"
+        env_files.write_text("ELASTIC_URL=https://two\n")
+        stat = env_files.stat()
+        os.utime(env_files, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        assert resolve_config().elastic_url == "https://two"
+
+    def test_reload_keeps_real_environment(self, env_files, monkeypatch):
+        from utils.credentials import resolve_config
+        monkeypatch.setenv("JINA_API_KEY", "from-shell")
+        assert resolve_config().jina_api_key == "from-shell"
+        stat = env_files.stat()
+        os.utime(env_files, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        assert resolve_config().jina_api_key == "from-shell"
+
+    def test_fallback_suffix_stable_across_names(self, clean_env, monkeypatch):
+        import utils.credentials as creds_mod
+        monkeypatch.delenv("USER_SUFFIX", raising=False)
+        creds_mod.clear_config_cache()
+        try:
+            with patch("os.getlogin", side_effect=OSError):
+                index = creds_mod.get_index_name("idx")
+                reranker = creds_mod.get_inference_id("reranker")
+            assert index.rsplit("-", 1)[1] == reranker.rsplit("-", 1)[1]
+        finally:
+            creds_mod.clear_config_cache()
+
+    def test_import_is_lazy(self):
+        import subprocess
+        import sys
+        code = (
+            "import sys; import utils.credentials; "
+            "print(sorted(m for m in ('dotenv', 'elasticsearch', 'asyncio') if m in sys.modules))"
+        )
+        out = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=Path(__file__).parent.parent,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+        assert out == "[]"
@@ -0,0 +1,122 @@
+"""Unit tests for notebooks/utils/evaluation.py."""
+
+import json
+import math
+from unittest.mock import MagicMock
+
+import pytest
+
+from utils.evaluation import (
+    evaluate,
+    load_qrels,
+    load_queries,
+    naive_search,
+    ndcg_at_k,
+    recall_at_k,
+    reciprocal_rank,
+    reranked_search,
+    write_report,
+)
+
+QRELS = {"q1": {"a": 2, "b": 1}, "q2": {"c": 1}}
+QUERIES = {"q1": "first", "q2": "second", "q3": "unjudged"}
+
+
+class TestMetrics:
+    def test_recall(self):
+        assert recall_at_k(["a", "x", "b"], QRELS["q1"], 2) == 0.5
+        assert recall_at_k(["a", "x", "b"], QRELS["q1"], 3) == 1.0
+        assert math.isnan(recall_at_k(["a"], {"a": 0}, 1))
+
+    def test_reciprocal_rank(self):
+        assert reciprocal_rank(["x", "y", "b"], QRELS["q1"]) == pytest.approx(1 / 3)
+        assert reciprocal_rank(["x"], QRELS["q1"]) == 0.0
+        assert math.isnan(reciprocal_rank(["a"], {"a": 0}))
+
+    def test_unjudgable_query_skipped_by_every_mean(self):
+        qrels = {"q1": {"a": 1}, "q2": {"b": 0}}
+        systems = {"perfect": lambda text: ["a"] if text == "first" else ["b"]}
+        summary = evaluate(systems, {"q1": "first", "q2": "second"}, qrels,
+                           k_values=[5], verbose=False)["summary"]
+        assert summary.loc["perfect", "mrr"] == 1.0
+        assert summary.loc["perfect", "recall@5"] == 1.0
+
+    def test_ndcg(self):
+        assert ndcg_at_k(["a", "b"], QRELS["q1"], 10) == 1.0
+        swapped = ndcg_at_k(["b", "a"], QRELS["q1"], 10)
+        assert swapped == pytest.approx((1 + 2 / math.log2(3)) / (2 + 1 / math.log2(3)))
+        assert ndcg_at_k([], QRELS["q1"], 5) == 0.0
+
+
+class TestLoaders:
+    def test_trec_qrels(self, tmp_path):
+        path = tmp_path / "qrels.txt"
+        path.write_text("# comment\nq1 0 a 2\nq1 0 b 1\n\nq2 0 c 1\n")
+        assert load_qrels(path) == {"q1": {"a": 2.0, "b": 1.0}, "q2": {"c": 1.0}}
+
+    def test_trec_qrels_bad_line(self, tmp_path):
+        path = tmp_path / "qrels.txt"
+        path.write_text("q1 a 2\n")
+        with pytest.raises(ValueError, match="qrels.txt:1"):
+            load_qrels(path)
+
+    def test_json_qrels(self, tmp_path):
+        path = tmp_path / "qrels.json"
+        path.write_text(json.dumps(QRELS))
+        assert load_qrels(path)["q1"] == {"a": 2.0, "b": 1.0}
+
+    def test_queries_tsv_and_jsonl(self, tmp_path):
+        tsv = tmp_path / "queries.tsv"
+        tsv.write_text("q1\tfirst query\nq2\tsecond\twith tab\n")
+        assert load_queries(tsv) == {"q1": "first query", "q2": "second\twith tab"}
+        jsonl = tmp_path / "queries.jsonl"
+        jsonl.write_text('{"id": "q1", "text": "a"}\n{"query_id": 2, "query": "b"}\n')
+        assert load_queries(jsonl) == {"q1": "a", "2": "b"}
+
+
+class TestEvaluate:
+    def test_scores_systems_and_skips_unjudged(self):
+        systems = {
+            "perfect": lambda q: ["a", "b"] if q == "first" else ["c"],
+            "empty": lambda q: [],
+        }
+        report = evaluate(systems, QUERIES, QRELS, k_values=(1, 5), verbose=False)
+        per_query = report["per_query"]
+        assert len(per_query) == 4
+        assert set(per_query["query_id"]) == {"q1", "q2"}
+
+        summary = report["summary"]
+        assert summary.loc["perfect", "mrr"] == 1.0
+        assert summary.loc["perfect", "recall@1"] == 0.75
+        assert summary.loc["perfect", "ndcg@5"] == 1.0
+        assert summary.loc["empty", "mrr"] == 0.0
+        assert summary.loc["perfect", "queries"] == 2
+        assert "latency_p99_ms" in summary.columns
+
+    def test_errors_recorded(self):
+        def broken(query):
+            raise RuntimeError("timeout")
+
+        report = evaluate({"broken": broken}, QUERIES, QRELS, verbose=False)
+        assert report["summary"].loc["broken", "errors"] == 2
+        assert report["per_query"]["error"].iloc[0] == "RuntimeError: timeout"
+
+    def test_write_report(self, tmp_path):
+        report = evaluate({"s": lambda q: ["a"]}, QUERIES, QRELS, verbose=False)
+        write_report(report, tmp_path / "out")
+        summary = json.loads((tmp_path / "out" / "summary.json").read_text())
+        assert summary["s"]["queries"] == 2
+        assert (tmp_path / "out" / "per_query.csv").exists()
+
+
+class TestSearchFunctions:
+    def test_naive_and_reranked_requests(self):
+        es = MagicMock()
+        es.search.return_value = {"hits": {"hits": [{"_id": "en_art_5"}]}}
+        assert naive_search(es, "idx", size=3)("q") == ["en_art_5"]
+        assert es.search.call_args.kwargs["query"] == {"match": {"text": "q"}}
+
+        assert reranked_search(es, "idx", "rr", rank_window_size=20)("q") == ["en_art_5"]
+        retriever = es.search.call_args.kwargs["retriever"]["text_similarity_reranker"]
+        assert retriever["rank_window_size"] == 20
+        assert retriever["inference_id"] == "rr"
@@ -0,0 +1,149 @@
+"""Unit tests for notebooks/utils/hybrid.py."""
+
+from unittest.mock import MagicMock
+
+import pytest
+from elasticsearch import ApiError
+
+from utils.hybrid import (
+    hybrid_search,
+    lexical_retriever,
+    rrf_fuse,
+    semantic_retriever,
+)
+
+
+def _hit(doc_id, text="t"):
+    return {"_id": doc_id, "_source": {"title": doc_id, "text": text}}
+
+
+def _ranking(*ids):
+    return [_hit(i) for i in ids]
+
+
+def _api_error(status, error_type="", reason=""):
+    meta = MagicMock()
+    meta.status = status
+    body = {"error": {"root_cause": [{"type": error_type, "reason": reason}],
+                      "type": error_type, "reason": reason}}
+    return ApiError(message=error_type, meta=meta, body=body)
+
+
+LICENCE_ERROR = (403, "security_exception",
+                 "current license is non-compliant for [Reciprocal Rank Fusion (RRF)]")
+UNKNOWN_RETRIEVER_ERROR = (400, "parsing_exception", "[1:27] unknown retriever [rrf]")
+QUERY_ERROR = (400, "search_phase_execution_exception", "all shards failed")
+
+
+@pytest.fixture
+def es():
+    """Lexical search returns a, b, c; semantic search returns c, d, a."""
+    client = MagicMock()
+
+    def search(index, retriever, size, _source):
+        if "standard" not in retriever:
+            return {"hits": {"hits": _ranking("server")}}
+        query = retriever["standard"]["query"]
+        ids = ("a", "b", "c") if "multi_match" in query else ("c", "d", "a")
+        return {"hits": {"hits": _ranking(*ids)[:size]}}
+
+    client.search.side_effect = search
+    return client
+
+
+class TestRrfFuse:
+    def test_scores_and_order(self):
+        fused = rrf_fuse([_ranking("a", "b", "c"), _ranking("c", "d", "a")], rank_constant=60)
+        assert [h["_id"] for h in fused] == ["a", "c", "b", "d"]
+        assert fused[0]["_rrf_score"] == pytest.approx(1 / 61 + 1 / 63)
+
+    def test_size(self):
+        assert len(rrf_fuse([_ranking("a", "b", "c")], size=2)) == 2
+
+    def test_does_not_mutate_inputs(self):
+        ranking = _ranking("a")
+        rrf_fuse([ranking])
+        assert "_rrf_score" not in ranking[0]
+
+
+class TestHybridSearch:
+    def test_server_mode_uses_rrf_retriever(self, es):
+        hits = hybrid_search(es, "idx", "q", size=5, mode="server")
+        assert [h["_id"] for h in hits] == ["server"]
+        rrf = es.search.call_args.kwargs["retriever"]["rrf"]
+        assert rrf["retrievers"] == [lexical_retriever("q"), semantic_retriever("q")]
+        assert rrf["rank_window_size"] == 50
+
+    def test_server_rerank_wraps_fused_retriever(self, es):
+        hybrid_search(es, "idx", "q", mode="server", rerank_id="rr", rerank_window=15)
+        reranker = es.search.call_args.kwargs["retriever"]["text_similarity_reranker"]
+        assert "rrf" in reranker["retriever"]
+        assert reranker["rank_window_size"] == 15
+
+    def test_client_mode_fuses_locally(self, es):
+        hits = hybrid_search(es, "idx", "q", size=3, mode="client")
+        assert [h["_id"] for h in hits] == ["a", "c", "b"]
+        assert es.search.call_count == 2
+
+    def test_filter_applied_to_both_retrievers(self, es):
+        hybrid_search(es, "idx", "q", mode="client", filter_query={"term": {"language": "de"}})
+        for call in es.search.call_args_list:
+            assert call.kwargs["retriever"]["standard"]["filter"] == {"term": {"language": "de"}}
+
+    def test_auto_falls_back_and_remembers(self, es):
+        search = es.search.side_effect
+
+        def reject_rrf(index, retriever, size, _source):
+            if "rrf" in retriever:
+                raise _api_error(*LICENCE_ERROR)
+            return search(index, retriever, size, _source)
+
+        es.search.side_effect = reject_rrf
+        assert [h["_id"] for h in hybrid_search(es, "idx", "q", size=2)] == ["a", "c"]
+        assert es.search.call_count == 3
+        hybrid_search(es, "idx", "q")
+        assert es.search.call_count == 5  # no second rrf attempt
+
+    def test_unknown_retriever_falls_back(self, es):
+        search = es.search.side_effect
+
+        def reject_rrf(index, retriever, size, _source):
+            if "rrf" in retriever:
+                raise _api_error(*UNKNOWN_RETRIEVER_ERROR)
+            return search(index, retriever, size, _source)
+
+        es.search.side_effect = reject_rrf
+        assert [h["_id"] for h in hybrid_search(es, "idx", "q", size=2)] == ["a", "c"]
+
+    def test_query_error_does_not_disable_rrf(self, es):
+        search = es.search.side_effect
+        es.search.side_effect = _api_error(*QUERY_ERROR)
+        with pytest.raises(ApiError):
+            hybrid_search(es, "idx", "q", filter_query={"term": {"no_such": "x"}})
+
+        es.search.side_effect = search
+        hybrid_search(es, "idx", "q")
+        assert "rrf" in es.search.call_args.kwargs["retriever"]
+
+    def test_server_mode_reraises(self, es):
+        es.search.side_effect = _api_error(*UNKNOWN_RETRIEVER_ERROR)
+        with pytest.raises(ApiError):
+            hybrid_search(es, "idx", "q", mode="server")
+
+    def test_other_errors_not_swallowed(self, es):
+        es.search.side_effect = _api_error(500)
+        with pytest.raises(ApiError):
+            hybrid_search(es, "idx", "q")
+
+    def test_client_rerank_only_scores_fused_top_k(self, es):
+        es.inference.inference.return_value = {"rerank": [
+            {"index": 1, "relevance_score": 0.9}, {"index": 0, "relevance_score": 0.1},
+        ]}
+        hits = hybrid_search(es, "idx", "q", mode="client", rerank_id="rr", rerank_window=2)
+        assert [h["_id"] for h in hits] == ["c", "a"]
+        body = es.inference.inference.call_args.kwargs["body"]
+        assert len(body["input"]) == 2
+
+    def test_invalid_mode(self, es):
+        with pytest.raises(ValueError, match="mode"):
+            hybrid_search(es, "idx", "q", mode="fast")
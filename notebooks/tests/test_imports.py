@@ -0,0 +1,93 @@
+"""Import-time tests for notebooks/utils (lazy heavy dependencies)."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+NOTEBOOKS_DIR = Path(__file__).parent.parent
+HEAVY_MODULES = ("numpy", "pandas", "elasticsearch", "requests", "dotenv", "pyarrow")
+
+LIGHT_UTILS = [
+    "utils",
+    "utils.parsing",
+    "utils.article_store",
+    "utils.chunking",
+    "utils.reader",
+    "utils.reader_cache",
+    "utils.ingest",
+    "utils.pipeline",
+    "utils.indexing",
+    "utils.sync",
+    "utils.credentials",
+    "utils.inference",
+    "utils.rerank",
+    "utils.hybrid",
+    "utils.query_cache",
+    "utils.comparison",
+    "utils.evaluation",
+]
+
+
+def _importtime(module: str) -> dict[str, int]:
+    """Cumulative import time (µs) per module, from ``python -X importtime``."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=NOTEBOOKS_DIR, capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        times[name] = int(cumulative)
+    return times
+
+
+def _run(code: str) -> str:
+    return subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=NOTEBOOKS_DIR, capture_output=True, text=True, check=True,
+    ).stdout.strip()
+
+
+class TestImportTime:
+    @pytest.mark.parametrize("module", LIGHT_UTILS)
+    def test_heavy_dependencies_are_lazy(self, module):
+        times = _importtime(module)
+        assert module in times
+        loaded = [m for m in HEAVY_MODULES if m in times]
+        assert loaded == [], f"importing {module} loaded {loaded}"
+
+
+class TestPackageExports:
+    def test_attribute_imports_only_its_submodule(self):
+        out = _run(
+            "import sys, utils; utils.parse_articles; "
+            "print(sorted(m for m in sys.modules if m.startswith('utils.')))"
+        )
+        assert out == "['utils.parsing']"
+
+    def test_from_import(self):
+        from utils import parse_articles
+        from utils.parsing import parse_articles as direct
+        assert parse_articles is direct
+
+    def test_all_exports_resolve(self):
+        import utils
+        for name in utils.__all__:
+            assert getattr(utils, name) is not None
+        assert set(utils.__all__) <= set(dir(utils))
+
+    def test_unknown_attribute(self):
+        import utils
+        with pytest.raises(AttributeError, match="no_such_helper"):
+            utils.no_such_helper
+
+    def test_using_a_helper_loads_its_dependency(self):
+        out = _run(
+            "import sys; from utils.evaluation import ndcg_at_k; "
+            "print('numpy' in sys.modules, ndcg_at_k(['a'], {'a': 1}, 1), 'numpy' in sys.modules)"
+        )
+        assert out == "False 1.0 True"
@@ -0,0 +1,185 @@
+"""Unit tests for notebooks/utils/indexing.py."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from elasticsearch import ApiError
+
+from utils.indexing import (
+    _BatchSizer,
+    bulk_index,
+    iter_index_readiness,
+    wait_for_index_ready,
+)
+
+
+def _actions(n: int, text: str = "body") -> list[dict]:
+    return [
+        {"_index": "idx", "_id": f"en_art_{i}", "_source": {"id": f"en_art_{i}", "text": text}}
+        for i in range(n)
+    ]
+
+
+def _batch_sizes(es) -> list[int]:
+    return [len(call[1]["operations"]) // 2 for call in es.bulk.call_args_list]
+
+
+class TestBulkIndex:
+    def test_chunks_by_document_count(self, fake_bulk_client):
+        summary = bulk_index(fake_bulk_client, _actions(25), chunk_size=10, verbose=False)
+        assert _batch_sizes(fake_bulk_client) == [10, 10, 5]
+        assert summary["indexed"] == 25
+        assert summary["batches"] == 3
+        assert summary["errors"] == []
+
+    def test_chunks_by_bytes(self, fake_bulk_client):
+        bulk_index(fake_bulk_client, _actions(6, text="x" * 1000),
+                   chunk_size=100, max_chunk_bytes=2500, verbose=False)
+        assert _batch_sizes(fake_bulk_client) == [2, 2, 2]
+
+    def test_delete_actions_have_no_source_line(self, fake_bulk_client):
+        bulk_index(fake_bulk_client, [{"_op_type": "delete", "_index": "idx", "_id": "a"}],
+                   verbose=False)
+        assert fake_bulk_client.bulk.call_args[1]["operations"] == [
+            {"delete": {"_id": "a", "_index": "idx"}}
+        ]
+
+    @patch("utils.indexing.time.sleep")
+    def test_retries_rejected_items(self, mock_sleep):
+        es = MagicMock()
+        es.bulk.side_effect = [
+            {"items": [{"index": {"_id": "en_art_0", "status": 201}},
+                       {"index": {"_id": "en_art_1", "status": 429}}]},
+            {"items": [{"index": {"_id": "en_art_1", "status": 201}}]},
+        ]
+        summary = bulk_index(es, _actions(2), verbose=False)
+        assert summary["indexed"] == 2
+        assert summary["retried"] == 1
+        retry_ops = es.bulk.call_args_list[1][1]["operations"]
+        assert retry_ops[0] == {"index": {"_id": "en_art_1", "_index": "idx"}}
+        mock_sleep.assert_called_once()
+
+    @patch("utils.indexing.time.sleep")
+    def test_gives_up_after_max_retries(self, mock_sleep):
+        es = MagicMock()
+        es.bulk.return_value = {"items": [{"index": {"_id": "en_art_0", "status": 429}}]}
+        summary = bulk_index(es, _actions(1), max_retries=2, verbose=False)
+        assert es.bulk.call_count == 3
+        assert summary["indexed"] == 0
+        assert len(summary["errors"]) == 1
+
+    @patch("utils.indexing.time.sleep")
+    def test_retries_whole_request_429(self, mock_sleep, fake_bulk_client):
+        ok = fake_bulk_client.bulk.side_effect
+        meta = MagicMock(status=429)
+        calls = []
+
+        def _bulk(operations, **kw):
+            calls.append(1)
+            if len(calls) == 1:
+                raise ApiError("too many", meta, {})
+            return ok(operations)
+        fake_bulk_client.bulk.side_effect = _bulk
+
+        summary = bulk_index(fake_bulk_client, _actions(3), verbose=False)
+        assert summary["indexed"] == 3
+        assert summary["retried"] == 3
+
+    def test_non_429_request_error_raises(self):
+        es = MagicMock()
+        es.bulk.side_effect = ApiError("bad", MagicMock(status=400), {})
+        with pytest.raises(ApiError):
+            bulk_index(es, _actions(1), verbose=False)
+
+    def test_ignore_status(self):
+        es = MagicMock()
+        es.bulk.return_value = {"items": [{"delete": {"_id": "a", "status": 404}}]}
+        summary = bulk_index(es, [{"_op_type": "delete", "_index": "i", "_id": "a"}],
+                             ignore_status=(404,), verbose=False)
+        assert summary["indexed"] == 1 and summary["errors"] == []
+
+    def test_threads_index_everything(self, fake_bulk_client):
+        summary = bulk_index(fake_bulk_client, _actions(100), chunk_size=7,
+                             thread_count=4, verbose=False)
+        assert summary["indexed"] == 100
+        assert sum(_batch_sizes(fake_bulk_client)) == 100
+
+    def test_on_batch_reports_throughput(self, fake_bulk_client):
+        stats = []
+        bulk_index(fake_bulk_client, _actions(5), chunk_size=2,
+                   on_batch=stats.append, verbose=False)
+        assert [s["docs"] for s in stats] == [2, 2, 1]
+        assert all(s["bytes"] > 0 and "docs_per_sec" in s for s in stats)
+
+    def test_empty_actions(self, fake_bulk_client):
+        summary = bulk_index(fake_bulk_client, [], verbose=False)
+        assert summary["indexed"] == 0
+        fake_bulk_client.bulk.assert_not_called()
+
+
+class TestBatchSizer:
+    def test_fixed_without_target(self):
+        sizer = _BatchSizer(100)
+        sizer.observe(100, 10.0)
+        assert sizer.size == 100
+
+    def test_shrinks_when_slow(self):
+        sizer = _BatchSizer(100, target_seconds=1.0)
+        sizer.observe(100, 4.0)  # ideal 25 -> halfway 62
+        assert sizer.size == 62
+
+    def test_grows_when_fast_and_clamps(self):
+        sizer = _BatchSizer(100, max_size=150, target_seconds=2.0)
+        sizer.observe(100, 0.5)  # ideal 400 -> halfway 250 -> clamp 150
+        assert sizer.size == 150
+
+    def test_adaptive_bulk_changes_batch_size(self, fake_bulk_client):
+        with patch("utils.indexing.time.perf_counter", side_effect=[0.0] + [i * 10.0 for i in range(1, 100)]):
+            bulk_index(fake_bulk_client, _actions(60), chunk_size=20,
+                       target_batch_seconds=1.0, min_chunk_size=5, verbose=False)
+        sizes = _batch_sizes(fake_bulk_client)
+        assert sizes[0] == 20
+        assert sizes[1] < 20
+
+
+def _count_client(sequence):
+    """Client whose successive (total, embedded) counts follow *sequence*."""
+    es = MagicMock()
+    counts = iter(c for pair in sequence for c in pair)
+    es.count.side_effect = lambda **kw: {"count": next(counts)}
+    return es
+
+
+class TestIndexReadiness:
+    @patch("utils.indexing.time.sleep")
+    def test_ready_immediately(self, mock_sleep):
+        es = _count_client([(8, 8)])
+        progress = list(iter_index_readiness(es, "idx", 8))
+        assert len(progress) == 1 and progress[0]["ready"]
+        es.indices.refresh.assert_called_once_with(index="idx")
+        mock_sleep.assert_not_called()
+
+    @patch("utils.indexing.time.sleep")
+    def test_exponential_backoff_until_embedded(self, mock_sleep):
+        es = _count_client([(5, 0), (8, 3), (8, 7), (8, 8)])
+        progress = list(iter_index_readiness(es, "idx", 8, initial_delay=1.0, max_delay=3.0))
+        assert [p["embedded"] for p in progress] == [0, 3, 7, 8]
+        assert [c[0][0] for c in mock_sleep.call_args_list] == [1.0, 2.0, 3.0]
+
+    @patch("utils.indexing.time.sleep")
+    def test_checks_semantic_field(self, mock_sleep):
+        es = _count_client([(1, 1)])
+        list(iter_index_readiness(es, "idx", 1, semantic_field="body"))
+        assert es.count.call_args_list[1][1]["query"] == {"exists": {"field": "body"}}
+
+    @patch("utils.indexing.time.sleep")
+    @patch("utils.indexing.time.monotonic", side_effect=[0.0, 0.0, 5.0, 11.0])
+    def test_timeout(self, mock_monotonic, mock_sleep):
+        es = _count_client([(0, 0)] * 5)
+        with pytest.raises(TimeoutError, match="0/3 documents embedded"):
+            list(iter_index_readiness(es, "idx", 3, timeout=10.0, initial_delay=4.0))
+
+    @patch("utils.indexing.time.sleep")
+    def test_wait_returns_final_progress(self, mock_sleep):
+        es = _count_client([(2, 1), (2, 2)])
+        assert wait_for_index_ready(es, "idx", 2, verbose=False)["ready"] is True
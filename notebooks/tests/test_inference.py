@@ -1,24 +1,51 @@
 """Unit tests for notebooks/utils/inference.py."""
 
-from unittest.mock import MagicMock
+import asyncio
+import inspect
+import threading
+import warnings
+from unittest.mock import AsyncMock, MagicMock
 
+import numpy as np
 import pytest
 from elasticsearch import BadRequestError
 
 from utils.inference import (
+    EndpointRegistry,
+    endpoint_registry,
     verify_embedding_endpoint,
     create_embedding_inference,
     create_reranker_inference,
+    embed_texts,
+    EmbeddingCache,
+    InferenceCoalescer,
 )
 
 
+def _endpoints_client(*endpoints):
+    es = MagicMock()
+    es.inference.get.return_value = {"endpoints": [
+        {"inference_id": inference_id, "task_type": task_type}
+        for inference_id, task_type in endpoints
+    ]}
+    return es
+
+
 class TestVerifyEmbeddingEndpoint:
     def test_returns_true_when_exists(self):
-        es = MagicMock()
+        es = _endpoints_client((".jina-embeddings-v5-text-small", "text_embedding"))
         assert verify_embedding_endpoint(es, ".jina-embeddings-v5-text-small") is True
-        es.inference.get.assert_called_once_with(
-            inference_id=".jina-embeddings-v5-text-small"
-        )
+        es.inference.get.assert_called_once_with(inference_id="_all")
+
+    def test_returns_false_when_missing_from_listing(self):
+        es = _endpoints_client((".elser-2-elastic", "sparse_embedding"))
+        assert verify_embedding_endpoint(es, ".jina-embeddings-v5-text-small") is False
+
+    def test_repeat_calls_share_one_listing(self):
+        es = _endpoints_client((".jina-embeddings-v5-text-small", "text_embedding"))
+        for _ in range(3):
+            assert verify_embedding_endpoint(es, ".jina-embeddings-v5-text-small")
+        es.inference.get.assert_called_once()
 
     def test_returns_false_when_not_found(self):
         es = MagicMock()
@@ -30,12 +57,26 @@ class TestCreateEmbeddingInferenceCompat:
     """The legacy wrapper delegates to verify_embedding_endpoint."""
 
     def test_delegates_to_verify(self):
-        es = MagicMock()
+        es = _endpoints_client((".jina-embeddings-v5-text-small", "text_embedding"))
         assert create_embedding_inference(es, ".jina-embeddings-v5-text-small") is True
         es.inference.get.assert_called_once()
 
 
 class TestCreateRerankerInference:
+    def test_skips_put_when_registry_has_endpoint(self):
+        es = _endpoints_client(("jina-rr-test", "rerank"))
+        assert create_reranker_inference(es, "jina-rr-test") is False
+        es.inference.put.assert_not_called()
+
+    def test_created_endpoint_recorded_in_registry(self):
+        es = _endpoints_client()
+        registry = EndpointRegistry(es)
+        assert create_reranker_inference(es, "jina-rr-test", registry=registry) is True
+        assert registry.get("jina-rr-test")["task_type"] == "rerank"
+        assert create_reranker_inference(es, "jina-rr-test", registry=registry) is False
+        es.inference.put.assert_called_once()
+        es.inference.get.assert_called_once()
+
     def test_creates_successfully(self):
         es = MagicMock()
         assert create_reranker_inference(es, "jina-rr-test") is True
@@ -59,3 +100,255 @@ class TestCreateRerankerInference:
         )
         with pytest.raises(BadRequestError, match="invalid model"):
             create_reranker_inference(es, "jina-rr-test")
+
+
+class TestEndpointRegistry:
+    def test_indexes_by_id_and_task_type(self):
+        es = _endpoints_client(("b-rr", "rerank"), ("emb", "text_embedding"), ("a-rr", "rerank"))
+        registry = EndpointRegistry(es)
+        assert registry.get("emb")["task_type"] == "text_embedding"
+        assert registry.get("missing") is None
+        assert [ep["inference_id"] for ep in registry.by_task_type("rerank")] == ["a-rr", "b-rr"]
+        es.inference.get.assert_called_once_with(inference_id="_all")
+
+    def test_reloads_after_ttl(self, monkeypatch):
+        es = _endpoints_client(("emb", "text_embedding"))
+        registry = EndpointRegistry(es, ttl=10)
+        now = [100.0]
+        monkeypatch.setattr("utils.inference.time.monotonic", lambda: now[0])
+        registry.get("emb")
+        now[0] = 105.0
+        registry.get("emb")
+        assert es.inference.get.call_count == 1
+        now[0] = 111.0
+        registry.get("emb")
+        assert es.inference.get.call_count == 2
+
+    def test_invalidate_forces_reload(self):
+        es = _endpoints_client()
+        registry = EndpointRegistry(es)
+        registry.get("x")
+        registry.invalidate()
+        registry.get("x")
+        assert es.inference.get.call_count == 2
+
+    def test_shared_per_client(self):
+        es = _endpoints_client()
+        assert endpoint_registry(es) is endpoint_registry(es)
+        assert endpoint_registry(es) is not endpoint_registry(_endpoints_client())
+
+
+def _embedding_response(texts, dims=4):
+    return {
+        "text_embedding": [
+            {"embedding": [float(len(t))] + [0.5] * (dims - 1)} for t in texts
+        ]
+    }
+
+
+@pytest.fixture
+def embedding_client():
+    es = MagicMock()
+    es.inference.inference.side_effect = (
+        lambda inference_id, body: _embedding_response(body["input"])
+    )
+    return es
+
+
+class TestEmbeddingCache:
+    def test_key_normalizes_whitespace(self):
+        assert EmbeddingCache.key("m", "  a\n b ") == EmbeddingCache.key("m", "a b")
+        assert EmbeddingCache.key("m", "a b") != EmbeddingCache.key("other", "a b")
+
+    def test_lru_eviction(self):
+        cache = EmbeddingCache(max_entries=2)
+        cache.put("m", "a", [1.0])
+        cache.put("m", "b", [2.0])
+        cache.get("m", "a")
+        cache.put("m", "c", [3.0])
+        assert cache.get("m", "b") is None
+        assert cache.get("m", "a") is not None
+        assert len(cache) == 2
+
+    def test_float16_storage(self):
+        cache = EmbeddingCache(dtype="float16")
+        assert cache.put("m", "a", [0.1, 0.2]).dtype == np.float16
+
+    def test_rejects_other_dtypes(self):
+        with pytest.raises(ValueError, match="float16 or float32"):
+            EmbeddingCache(dtype="int8")
+
+    def test_disk_store_survives_new_instance(self, tmp_path):
+        EmbeddingCache(directory=tmp_path).put("m", "query", [1.0, 2.0])
+        fresh = EmbeddingCache(directory=tmp_path)
+        assert fresh.get("m", "query").tolist() == [1.0, 2.0]
+        assert fresh.hits == 1
+        fresh.clear()
+        assert list(tmp_path.glob("*.npy")) == []
+
+    def test_directory_true_uses_env(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("EIS_EMBEDDING_CACHE_DIR", str(tmp_path / "emb"))
+        assert EmbeddingCache(directory=True).directory == tmp_path / "emb"
+
+
+class TestEmbedTexts:
+    def test_batches_and_preserves_order(self, embedding_client):
+        vectors = embed_texts(embedding_client, ["a", "bbb", "cc"], batch_size=2)
+        assert vectors.shape == (3, 4)
+        assert vectors.dtype == np.float32
+        assert vectors[:, 0].tolist() == [1.0, 3.0, 2.0]
+        assert embedding_client.inference.inference.call_count == 2
+
+    def test_deduplicates_within_call(self, embedding_client):
+        embed_texts(embedding_client, ["a b", "a  b", "a b"])
+        embedding_client.inference.inference.assert_called_once_with(
+            inference_id=".jina-embeddings-v5-text-small",
+            body={"input": ["a b"]},
+        )
+
+    def test_cache_hits_skip_network(self, embedding_client):
+        cache = EmbeddingCache()
+        first = embed_texts(embedding_client, ["x", "yy"], cache=cache)
+        second = embed_texts(embedding_client, ["yy", "x"], cache=cache)
+        assert embedding_client.inference.inference.call_count == 1
+        assert second.tolist() == first[::-1].tolist()
+        assert cache.hits == 2
+
+    def test_empty_input(self, embedding_client):
+        assert embed_texts(embedding_client, []).shape == (0, 0)
+        embedding_client.inference.inference.assert_not_called()
+
+    def test_sparse_endpoint_rejected(self):
+        es = MagicMock()
+        es.inference.inference.return_value = {"sparse_embedding": [{}]}
+        with pytest.raises(ValueError, match="dense"):
+            embed_texts(es, ["a"], inference_id=".elser-2-elastic")
+
+
+def _rerank_response(inference_id, body):
+    return {"rerank": [
+        {"index": i, "relevance_score": float(len(doc))}
+        for i, doc in reversed(list(enumerate(body["input"])))
+    ]}
+
+
+class TestInferenceCoalescer:
+    def test_concurrent_embeds_share_one_request(self, embedding_client):
+        async def run():
+            coalescer = InferenceCoalescer(embedding_client, max_wait_ms=20)
+            return await asyncio.gather(*(coalescer.embed("x" * n) for n in range(1, 11)))
+
+        vectors = asyncio.run(run())
+        assert [v[0] for v in vectors] == [float(n) for n in range(1, 11)]
+        embedding_client.inference.inference.assert_called_once()
+
+    def test_max_batch_size_splits_requests(self, embedding_client):
+        async def run():
+            coalescer = InferenceCoalescer(embedding_client, max_batch_size=4, max_wait_ms=50)
+            await coalescer.embed_many(["t"] * 10)
+            return coalescer
+
+        coalescer = asyncio.run(run())
+        assert coalescer.requests == 10
+        assert coalescer.batches == 3
+        sizes = [len(c.kwargs["body"]["input"])
+                 for c in embedding_client.inference.inference.call_args_list]
+        assert sizes == [4, 4, 2]
+
+    def test_no_sent_batch_exceeds_max_batch_size(self):
+        es = MagicMock()
+        es.inference.inference.side_effect = _rerank_response
+
+        async def run():
+            coalescer = InferenceCoalescer(es, rerank_id="rr", max_batch_size=4, max_wait_ms=50)
+            return await asyncio.gather(
+                coalescer.rerank("q", ["a", "bb", "ccc"]),
+                coalescer.rerank("q", ["dddd", "eeeee", "ffffff"]),
+                coalescer.rerank("q", ["g" * n for n in range(7, 17)]),
+            )
+
+        scores = asyncio.run(run())
+        assert scores == [[1.0, 2.0, 3.0], [4.0, 5.0, 6.0], [float(n) for n in range(7, 17)]]
+        sizes = [len(c.kwargs["body"]["input"]) for c in es.inference.inference.call_args_list]
+        assert all(size <= 4 for size in sizes)
+        assert sum(sizes) == 16
+
+    def test_rerank_groups_by_query(self):
+        es = MagicMock()
+        es.inference.inference.side_effect = _rerank_response
+
+        async def run():
+            coalescer = InferenceCoalescer(es, rerank_id="rr")
+            return await asyncio.gather(
+                coalescer.rerank("q1", ["a", "bbb"]),
+                coalescer.rerank("q1", ["cc"]),
+                coalescer.rerank("q2", ["dddd"]),
+            )
+
+        assert asyncio.run(run()) == [[1.0, 3.0], [2.0], [4.0]]
+        assert es.inference.inference.call_count == 2
+        queries = sorted(c.kwargs["body"]["query"] for c in es.inference.inference.call_args_list)
+        assert queries == ["q1", "q2"]
+
+    def test_rerank_requires_endpoint(self, embedding_client):
+        coalescer = InferenceCoalescer(embedding_client)
+        with pytest.raises(ValueError, match="rerank_id"):
+            asyncio.run(coalescer.rerank("q", ["a"]))
+
+    def test_errors_fan_out_to_every_caller(self):
+        es = MagicMock()
+        es.inference.inference.side_effect = RuntimeError("EIS down")
+
+        async def run():
+            coalescer = InferenceCoalescer(es)
+            return await asyncio.gather(
+                coalescer.embed("a"), coalescer.embed("b"), return_exceptions=True
+            )
+
+        results = asyncio.run(run())
+        assert all(isinstance(r, RuntimeError) for r in results)
+        es.inference.inference.assert_called_once()
+
+    def test_async_client_and_cache(self):
+        es = MagicMock()
+        es.inference.inference = AsyncMock(
+            side_effect=lambda inference_id, body: _embedding_response(body["input"])
+        )
+        cache = EmbeddingCache()
+
+        async def run():
+            coalescer = InferenceCoalescer(es, cache=cache)
+            await coalescer.embed_many(["a", "bb"])
+            return await coalescer.embed("bb")
+
+        assert asyncio.run(run())[0] == 2.0
+        es.inference.inference.assert_awaited_once()
+        assert cache.hits == 1
+
+    def test_async_client_with_rewritten_methods(self):
+        # Real AsyncElasticsearch methods are wrapped by _rewrite_parameters:
+        # plain functions returning a coroutine, not coroutine functions.
+        from elasticsearch import AsyncElasticsearch
+        from elasticsearch._async.client.utils import _rewrite_parameters
+
+        threads = []
+
+        class Inference:
+            @_rewrite_parameters(body_name="body")
+            async def inference(self, *, inference_id, body):
+                threads.append(threading.get_ident())
+                return _embedding_response(body["input"])
+
+        es = MagicMock(spec=AsyncElasticsearch)
+        es.inference = Inference()
+        assert not inspect.iscoroutinefunction(es.inference.inference)
+
+        async def run():
+            coalescer = InferenceCoalescer(es)
+            return await coalescer.embed_many(["a", "bb"]), threading.get_ident()
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", RuntimeWarning)
+            vectors, loop_thread = asyncio.run(run())
+        assert [v[0] for v in vectors] == [1.0, 2.0]
+        assert threads == [loop_thread]
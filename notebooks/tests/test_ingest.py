@@ -0,0 +1,77 @@
+"""Unit tests for notebooks/utils/ingest.py."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from utils.ingest import ingest_languages, iter_language_articles, resolve_sources
+from utils.parsing import parse_articles
+
+
+class TestResolveSources:
+    def test_defaults_to_eur_lex(self):
+        sources = resolve_sources(["de", "en", "de"])
+        assert list(sources) == ["de", "en"]
+        assert "CELEX:32024R1689" in sources["de"]
+
+    def test_overrides(self):
+        assert resolve_sources(None, {"xx": "dump.md"}) == {"xx": "dump.md"}
+
+    def test_unknown_language(self):
+        with pytest.raises(ValueError, match="No EUR-Lex source"):
+            resolve_sources(["xx"])
+
+
+class TestIterLanguageArticles:
+    def test_parses_each_language_in_workers(self, language_dumps, sample_markdown):
+        articles = list(iter_language_articles(language_dumps, max_workers=2))
+        expected = parse_articles(sample_markdown, "en") + parse_articles(sample_markdown, "de")
+        assert sorted(a["id"] for a in articles) == sorted(a["id"] for a in expected)
+
+    def test_empty_sources(self):
+        assert list(iter_language_articles({})) == []
+
+    def test_worker_failure_propagates(self, tmp_path):
+        # A directory "exists" but cannot be read as a dump.
+        with pytest.raises(IsADirectoryError):
+            list(iter_language_articles({"en": str(tmp_path)}))
+
+
+class TestIngestLanguages:
+    def test_single_shared_indexer(self, fake_bulk_client, language_dumps):
+        summary = ingest_languages(fake_bulk_client, "idx", sources=language_dumps,
+                                   chunk_size=1000, verbose=False)
+
+        fake_bulk_client.bulk.assert_called_once()
+        assert summary["indexed"] == 16
+        assert summary["per_language"] == {"en": 8, "de": 8}
+        assert summary["errors"] == []
+
+    def test_collects_errors(self, language_dumps):
+        es = MagicMock()
+
+        def _bulk(operations, **kwargs):
+            metas = [op["index"] for op in operations if "index" in op]
+            return {"items": [
+                {"index": {"_id": m["_id"], "status": 201 if i % 2 == 0 else 400}}
+                for i, m in enumerate(metas)
+            ]}
+        es.bulk.side_effect = _bulk
+
+        summary = ingest_languages(es, "idx", sources={"en": language_dumps["en"]},
+                                   verbose=False)
+        assert summary["indexed"] == 4
+        assert len(summary["errors"]) == 4
+        assert summary["per_language"] == {"en": 4}
+
+    def test_actions_target_index(self, fake_bulk_client, language_dumps):
+        ingest_languages(fake_bulk_client, "my-index", sources={"en": language_dumps["en"]},
+                         verbose=False)
+        ops = fake_bulk_client.bulk.call_args[1]["operations"]
+        metas, sources = ops[0::2], ops[1::2]
+        assert {m["index"]["_index"] for m in metas} == {"my-index"}
+        assert metas[0]["index"]["_id"] == sources[0]["id"]
+
+    def test_unknown_language_raises(self):
+        with pytest.raises(ValueError, match="No EUR-Lex source"):
+            ingest_languages(MagicMock(), "idx", languages=["xx"])
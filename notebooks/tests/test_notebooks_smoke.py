@@ -113,7 +113,6 @@ class TestNotebook01FullChain:
             "import unittest.mock as _mock",
             "import requests as _req",
             "import elasticsearch as _es_mod",
-            "import elasticsearch.helpers as _es_helpers",
             "import time as _time_mod",
             "",
             "# Mock Jina Reader API",
@@ -127,16 +126,22 @@ class TestNotebook01FullChain:
             "_mock_es.info.return_value = {'version': {'number': '8.17.0'}, 'cluster_name': 'smoke-test'}",
             "_mock_es.indices.exists.return_value = False",
             "_mock_es.indices.create.return_value = {'acknowledged': True}",
-            "_mock_es.count.return_value = {'count': 3}",
+            "_mock_es.indices.refresh.return_value = {'_shards': {'failed': 0}}",
+            "# Readiness barrier: first poll sees all docs but no embeddings yet",
+            "_counts = iter([8, 0])",
+            "_mock_es.count.side_effect = lambda **kw: {'count': next(_counts, 8)}",
             "_mock_es.search.return_value = {",
             "    'hits': {'total': {'value': 3}, 'hits': [",
             "        {'_source': {'article_number': 5, 'title': 'Prohibited AI practices'}, '_score': 1.0}",
             "    ]}",
             "}",
             "_es_mod.Elasticsearch = _mock.Mock(return_value=_mock_es)",
-            "_es_helpers.bulk = _mock.Mock(return_value=(3, []))",
+            "_mock_es.bulk.side_effect = lambda operations, **kw: {",
+            "    'errors': False,",
+            "    'items': [{'index': {'_id': op['index']['_id'], 'status': 201}} for op in operations[::2]],",
+            "}",
             "",
-            "# Skip the 5-second embedding wait",
+            "# Skip the readiness barrier's backoff",
             "_time_mod.sleep = _mock.Mock()",
         ]))
 
@@ -145,7 +150,14 @@ class TestNotebook01FullChain:
 
         nb_dir = tmp_path / "notebooks"
         nb_dir.mkdir()
-        _execute(nb, str(nb_dir))
+        executed = _execute(nb, str(nb_dir))
+
+        index_cell = executed.cells[_find_cell_index(executed, r"bulk_index\(es")]
+        assert "(0 errors" in index_cell.outputs[-1]["text"]
+        ready_cell = executed.cells[_find_cell_index(executed, r"wait_for_index_ready\(es")]
+        ready_text = "".join(output.get("text", "") for output in ready_cell.outputs)
+        assert "waiting: 0/8 embedded" in ready_text
+        assert "✓ 8 documents searchable" in ready_text
 
 
 class TestNotebook02EisPlatform:
@@ -1,10 +1,21 @@
 """Unit tests for parsing and comparison utilities."""
 
+import io
+import mmap
+import types
+
+import numpy as np
 import pandas as pd
 import pytest
 
-from utils.parsing import parse_articles
-from utils.comparison import build_comparison
+from utils.parsing import (
+    iter_articles,
+    iter_articles_from_file,
+    iter_sections,
+    parse_articles,
+    parse_articles_file,
+)
+from utils.comparison import build_comparison, build_comparison_batch, rank_metrics
 
 
 class TestParseArticles:
@@ -82,6 +93,168 @@ class TestParseArticles:
         assert articles[0]["id"].startswith("en_")
 
 
+class TestIterArticles:
+    def test_is_lazy_generator(self, sample_markdown):
+        gen = iter_articles(sample_markdown)
+        assert isinstance(gen, types.GeneratorType)
+        assert next(gen)["id"] == "en_art_1"
+
+    def test_matches_parse_articles(self, sample_markdown):
+        assert list(iter_articles(sample_markdown)) == parse_articles(sample_markdown)
+
+    def test_matches_fixture_articles(self, sample_markdown, sample_articles):
+        by_id = {a["id"]: a for a in iter_articles(sample_markdown)}
+        for expected in sample_articles:
+            assert by_id[expected["id"]] == expected
+
+    @pytest.mark.parametrize("block_size", [1, 7, 64, 4096])
+    def test_file_object_matches_string(self, sample_markdown, block_size):
+        from_file = list(iter_articles(io.StringIO(sample_markdown), block_size=block_size))
+        assert from_file == parse_articles(sample_markdown)
+
+    def test_heading_split_across_blocks(self):
+        md = "Preamble\n## Artic" + "le 7\nTitle\n\nBody seven.\nArticle 8\nT8\n\nBody eight."
+        articles = list(iter_articles(io.StringIO(md), block_size=len("Preamble\n## Artic")))
+        assert [a["id"] for a in articles] == ["en_art_7", "en_art_8"]
+        assert articles[0]["text"] == "Body seven."
+
+    def test_mid_line_article_mention_is_not_a_boundary(self):
+        md = "Article 1\nTitle\n\nSee Article 2\nfor details."
+        articles = list(iter_articles(io.StringIO(md), block_size=3))
+        assert len(articles) == 1
+        assert articles[0]["text"] == "See Article 2\nfor details."
+
+    def test_line_start_reference_drops_chunk_like_before(self):
+        # A line starting with "Article N <text>" is a split point whose chunk
+        # has no title line; the original parser discarded it and so do we.
+        md = "Article 1\nTitle\n\nBody.\nArticle 2 applies here.\nMore."
+        articles = parse_articles(md)
+        assert len(articles) == 1
+        assert articles[0]["text"] == "Body."
+
+    def test_empty_file_object(self):
+        assert list(iter_articles(io.StringIO(""))) == []
+
+
+class TestParseArticlesFile:
+    def test_path_matches_string(self, sample_markdown, tmp_path):
+        path = tmp_path / "dump.md"
+        path.write_text(sample_markdown, encoding="utf-8")
+        assert parse_articles_file(path) == parse_articles(sample_markdown)
+        assert parse_articles_file(str(path)) == parse_articles(sample_markdown)
+
+    def test_bytes_and_memoryview(self, sample_markdown):
+        raw = sample_markdown.encode("utf-8")
+        expected = parse_articles(sample_markdown)
+        assert parse_articles_file(raw) == expected
+        assert parse_articles_file(memoryview(raw)) == expected
+
+    def test_mmap_buffer(self, sample_markdown, tmp_path):
+        path = tmp_path / "dump.md"
+        path.write_bytes(sample_markdown.encode("utf-8"))
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            assert parse_articles_file(buf) == parse_articles(sample_markdown)
+
+    def test_iter_articles_dispatches_path(self, sample_markdown, tmp_path):
+        path = tmp_path / "dump.md"
+        path.write_text(sample_markdown, encoding="utf-8")
+        assert list(iter_articles(path)) == parse_articles(sample_markdown)
+
+    def test_multibyte_text_decoded_per_article(self):
+        md = "Artikel\n\nArticle 3\nBegriffsbestimmungen\n\nFür die Zwecke – „KI-System“."
+        articles = parse_articles_file(md.encode("utf-8"), language="de")
+        assert articles == parse_articles(md, language="de")
+        assert articles[0]["text"] == "Für die Zwecke – „KI-System“."
+
+    def test_unicode_whitespace_in_heading(self):
+        md = "Article\u00a012\nTitle\n\nBody.\nArticle\u00a0x\nnot a heading"
+        assert parse_articles_file(md.encode("utf-8")) == parse_articles(md)
+
+    def test_long_whitespace_run_in_heading(self):
+        md = "Article" + " " * 200 + "\n9\nTitle\n\nBody nine."
+        articles = parse_articles_file(md.encode("utf-8"))
+        assert articles == parse_articles(md)
+        assert articles[0]["article_number"] == "9"
+
+    def test_empty_file(self, tmp_path):
+        path = tmp_path / "empty.md"
+        path.write_bytes(b"")
+        assert parse_articles_file(path) == []
+
+    def test_is_lazy_generator(self, sample_markdown):
+        gen = iter_articles_from_file(sample_markdown.encode("utf-8"))
+        assert isinstance(gen, types.GeneratorType)
+
+
+class TestIterSections:
+    MD = (
+        "Preamble\n\n(1) First recital.\n\n(2) Second recital.\n\n"
+        "CHAPTER I\nGENERAL PROVISIONS\n\n"
+        "Article 1\nSubject matter\n\n1. Point one.\n\n(1) not a recital\n\n"
+        "ANNEX I\nList of legislation\n\nSection A."
+    )
+
+    def test_kinds_and_schema(self):
+        sections = list(iter_sections(self.MD))
+        assert [s["id"] for s in sections] == [
+            "en_recital_1", "en_recital_2", "en_art_1", "en_annex_I",
+        ]
+        assert all("section_type" in s for s in sections)
+        assert sections[3]["title"] == "List of legislation"
+        assert sections[3]["url"].endswith("#anx_I")
+
+    def test_recitals_only_in_preamble(self):
+        article = next(s for s in iter_sections(self.MD) if s["section_type"] == "article")
+        assert "(1) not a recital" in article["text"]
+
+    def test_annex_ends_article_body(self):
+        articles = parse_articles(self.MD)
+        assert len(articles) == 1
+        assert "ANNEX" not in articles[0]["text"]
+        assert "section_type" not in articles[0]
+
+    def test_kinds_filter(self):
+        chapters = list(iter_sections(self.MD, kinds=("chapter",)))
+        assert [c["id"] for c in chapters] == ["en_chapter_I"]
+        assert chapters[0]["text"] == "GENERAL PROVISIONS"
+
+    @pytest.mark.parametrize("language,heading,number", [
+        ("de", "Artikel 5", "5"),
+        ("pl", "Artykuł 5", "5"),
+        ("hu", "5. cikk", "5"),
+        ("fi", "5 artikla", "5"),
+        ("lv", "5. pants", "5"),
+        ("el", "Άρθρο 5", "5"),
+    ])
+    def test_native_article_headings(self, language, heading, number):
+        md = f"Intro\n\n{heading}\nTitel\n\nText mit {heading} im Satz."
+        articles = parse_articles(md, language=language)
+        assert [a["article_number"] for a in articles] == [number]
+        assert articles[0]["id"] == f"{language}_art_{number}"
+        assert articles[0]["url"].startswith(
+            f"https://eur-lex.europa.eu/legal-content/{language.upper()}/"
+        )
+
+    def test_bytes_and_blocks_match_text_for_other_languages(self):
+        md = (
+            "(1) Preambulas apsvērums.\n\nI NODAĻA\nVISPĀRĪGI NOTEIKUMI\n\n"
+            "1. pants\nPriekšmets\n\nTeksts ar garumzīmēm.\n\n"
+            "2. pants\nDarbības joma\n\nVēl teksts.\n\nI PIELIKUMS\nSaraksts\n\nA."
+        )
+        expected = list(iter_sections(md, language="lv"))
+        assert [s["id"] for s in expected] == [
+            "lv_recital_1", "lv_art_1", "lv_art_2", "lv_annex_I",
+        ]
+        assert list(iter_sections(md.encode("utf-8"), language="lv")) == expected
+        for size in (1, 3, 7):
+            blocks = io.StringIO(md)
+            assert list(iter_sections(blocks, language="lv", block_size=size)) == expected
+
+    def test_unknown_language_uses_english_grammar(self):
+        articles = parse_articles("Article 2\nTitle\n\nBody.", language="xx")
+        assert articles[0]["id"] == "xx_art_2"
+
+
 class TestBuildComparison:
     def test_basic_comparison(self, make_es_hit):
         naive = [
@@ -157,3 +330,72 @@ class TestBuildComparison:
         assert len(df) == 1
         assert df.iloc[0]["Movement"] == "NEW"
         assert df.iloc[0]["Was Rank"] == ">0"
+
+
+class TestBuildComparisonBatch:
+    @pytest.fixture
+    def batch(self, make_es_hit):
+        naive = {
+            "q1": [make_es_hit(n, f"A{n}") for n in ("1", "2", "3")],
+            "q2": [make_es_hit(n, f"A{n}") for n in ("7", "8")],
+        }
+        reranked = {
+            "q1": [make_es_hit(n, f"A{n}") for n in ("3", "1", "9")],
+            "q2": [make_es_hit(n, f"A{n}") for n in ("7", "8")],
+        }
+        return naive, reranked
+
+    def test_tidy_rows(self, batch):
+        df = build_comparison_batch(*batch)
+        q1 = df[df["query"] == "q1"]
+        assert q1["article"].tolist() == ["3", "1", "9", "2"]
+        assert q1["movement"].tolist()[:2] == [2, -1]
+        assert pd.isna(q1["movement"].iloc[2])
+        assert q1["is_new"].tolist() == [False, False, True, False]
+        assert q1["dropped"].tolist() == [False, False, False, True]
+        assert q1["title"].tolist() == ["A3", "A1", "A9", "A2"]
+
+    def test_matches_single_query_builder(self, batch):
+        naive, reranked = batch
+        single = build_comparison(naive["q1"], reranked["q1"])
+        df = build_comparison_batch(naive, reranked)
+        q1 = df[(df["query"] == "q1") & ~df["dropped"]]
+        assert q1["article"].tolist() == single["Article"].tolist()
+        assert q1["is_new"].tolist() == (single["Movement"] == "NEW").tolist()
+
+    def test_kendall_tau(self, batch):
+        metrics = rank_metrics(build_comparison_batch(*batch))
+        # q1 shares articles 1 and 3 in swapped order; q2 is identical.
+        assert metrics.loc["q1", "kendall_tau"] == -1.0
+        assert metrics.loc["q2", "kendall_tau"] == 1.0
+        assert metrics.loc["q1", "new_entries"] == 1
+        assert metrics.loc["q1", "shared"] == 2
+        assert metrics["ndcg_delta"].isna().all()
+
+    def test_ndcg_delta_with_qrels(self, batch):
+        qrels = {"q1": {"3": 2, "9": 1}}
+        metrics = rank_metrics(build_comparison_batch(*batch), qrels=qrels, k=3)
+        assert metrics.loc["q1", "ndcg_reranked"] == pytest.approx(
+            (2 / 1 + 1 / 2) / (2 / 1 + 1 / np.log2(3))
+        )
+        assert metrics.loc["q1", "ndcg_delta"] > 0
+        assert pd.isna(metrics.loc["q2", "ndcg_delta"])
+
+    def test_duplicate_keys_keep_best_rank(self, make_es_hit):
+        # Chunked passages of one article share its article_number.
+        naive = {"q": [make_es_hit(n, f"A{n}") for n in ("5", "5", "6")]}
+        reranked = {"q": [make_es_hit(n, f"A{n}") for n in ("5", "6", "5")]}
+        df = build_comparison_batch(naive, reranked)
+        assert df["article"].tolist() == ["5", "6"]
+        assert df["naive_rank"].tolist() == [1, 3]
+        assert df["reranked_rank"].tolist() == [1, 2]
+        metrics = rank_metrics(df)
+        assert metrics.loc["q", "shared"] == 2
+        assert metrics.loc["q", "kendall_tau"] == 1.0
+
+    def test_scales_to_many_queries(self, make_es_hit):
+        naive = {f"q{i}": [make_es_hit(str(n), "t") for n in range(20)] for i in range(500)}
+        reranked = {q: list(reversed(hits)) for q, hits in naive.items()}
+        metrics = rank_metrics(build_comparison_batch(naive, reranked))
+        assert len(metrics) == 500
+        assert (metrics["kendall_tau"] == -1.0).all()
@@ -0,0 +1,136 @@
+"""Unit tests for notebooks/utils/pipeline.py."""
+
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from utils.parsing import parse_articles
+from utils.pipeline import (
+    main,
+    read_jsonl_gz,
+    run_pipeline,
+    write_jsonl_gz,
+)
+
+
+@pytest.fixture
+def es(fake_bulk_client):
+    fake_bulk_client.indices.exists.return_value = False
+    return fake_bulk_client
+
+
+def _run(sources, workdir, es_client=None, **kwargs):
+    kwargs.setdefault("index_name", "idx")
+    kwargs.setdefault("workers", 1)
+    return run_pipeline(sources, workdir, es_client, verbose=False, **kwargs)
+
+
+class TestJsonlGz:
+    def test_roundtrip(self, tmp_path):
+        records = [{"id": i, "text": "Données ü"} for i in range(3)]
+        assert write_jsonl_gz(tmp_path / "x.jsonl.gz", records) == 3
+        assert list(read_jsonl_gz(tmp_path / "x.jsonl.gz")) == records
+
+    def test_failed_write_leaves_no_file(self, tmp_path):
+        def records():
+            yield {"id": 1}
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            write_jsonl_gz(tmp_path / "x.jsonl.gz", records())
+        assert list(tmp_path.iterdir()) == []
+
+
+class TestRunPipeline:
+    def test_runs_all_stages(self, es, language_dumps, sample_markdown, tmp_path):
+        workdir = tmp_path / "run"
+        result = _run(language_dumps, workdir, es)
+
+        assert result["stages"] == {"fetch": "ran", "parse": "ran", "index": "ran"}
+        expected = len(parse_articles(sample_markdown, "en"))
+        assert result["summaries"]["parse"]["per_language"] == {"en": expected, "de": expected}
+        assert result["summaries"]["index"]["indexed"] == 2 * expected
+        es.indices.create.assert_called_once()
+        assert es.indices.create.call_args[1]["index"] == "idx"
+
+        articles = list(read_jsonl_gz(workdir / "parse.jsonl.gz"))
+        assert {a["language"] for a in articles} == {"en", "de"}
+        manifest = json.loads((workdir / "manifest.json").read_text())
+        assert list(manifest["stages"]) == ["fetch", "parse", "index"]
+
+    def test_resumes_after_failed_index(self, es, language_dumps, tmp_path):
+        es.bulk.side_effect = ConnectionError("cluster down")
+        with pytest.raises(ConnectionError):
+            _run(language_dumps, tmp_path / "run", es, max_retries=1)
+
+        es.bulk.side_effect = None
+        es.bulk.return_value = {"items": []}
+        with patch("utils.pipeline.fetch_language") as fetch, \
+                patch("utils.pipeline.map_languages") as parse:
+            result = _run(language_dumps, tmp_path / "run", es)
+        fetch.assert_not_called()
+        parse.assert_not_called()
+        assert result["stages"] == {"fetch": "skipped", "parse": "skipped", "index": "ran"}
+
+    def test_from_stage_reruns_later_stages(self, es, language_dumps, tmp_path):
+        _run(language_dumps, tmp_path / "run", es)
+        result = _run(language_dumps, tmp_path / "run", es, from_stage="parse")
+        assert result["stages"] == {"fetch": "skipped", "parse": "ran", "index": "ran"}
+
+    def test_changed_sources_start_over(self, es, language_dumps, tmp_path):
+        _run(language_dumps, tmp_path / "run", es)
+        result = _run({"en": language_dumps["en"]}, tmp_path / "run", es)
+        assert result["stages"]["fetch"] == "ran"
+
+    def test_other_index_reruns_index_only(self, es, language_dumps, tmp_path):
+        _run(language_dumps, tmp_path / "run", es)
+        result = _run(language_dumps, tmp_path / "run", es, index_name="other")
+        assert result["stages"] == {"fetch": "skipped", "parse": "skipped", "index": "ran"}
+
+    def test_dry_run_touches_nothing(self, language_dumps, tmp_path):
+        es = MagicMock()
+        result = _run(language_dumps, tmp_path / "run", es, dry_run=True)
+        assert result["stages"] == {"fetch": "pending", "parse": "pending", "index": "pending"}
+        assert not (tmp_path / "run").exists()
+        assert es.mock_calls == []
+
+    def test_stop_after_parse_needs_no_client(self, language_dumps, tmp_path):
+        result = _run(language_dumps, tmp_path / "run", stop_after="parse")
+        assert result["stages"] == {"fetch": "ran", "parse": "ran"}
+
+    def test_parse_in_worker_processes(self, language_dumps, tmp_path):
+        result = _run(language_dumps, tmp_path / "run", stop_after="parse", workers=2)
+        assert set(result["summaries"]["parse"]["per_language"]) == {"en", "de"}
+
+    def test_missing_embedding_endpoint(self, es, language_dumps, tmp_path):
+        es.inference.get.return_value = {"endpoints": []}
+        with pytest.raises(RuntimeError, match="not available"):
+            _run(language_dumps, tmp_path / "run", es, inference_id="missing")
+        es.bulk.assert_not_called()
+
+    def test_url_source_needs_api_key(self, tmp_path):
+        with pytest.raises(ValueError, match="JINA_API_KEY"):
+            _run({"en": "https://example.com/doc"}, tmp_path / "run", stop_after="fetch")
+
+
+class TestMain:
+    def test_dry_run(self, language_dumps, tmp_path, capsys):
+        argv = ["--workdir", str(tmp_path / "run"), "--index", "idx", "--dry-run"]
+        for lang, path in language_dumps.items():
+            argv += ["--source", f"{lang}={path}"]
+        assert main(argv) == 0
+        assert "fetch: would run" in capsys.readouterr().out
+        assert not (tmp_path / "run").exists()
+
+    def test_failure_exit_code(self, tmp_path, capsys):
+        argv = ["--workdir", str(tmp_path / "run"), "--source", "en=missing.md",
+                "--stop-after", "fetch"]
+        with patch("utils.credentials.resolve_config") as resolve:
+            resolve.return_value.jina_api_key = None
+            assert main(argv) == 1
+        assert "resume" in capsys.readouterr().out
+
+    def test_unknown_language(self, capsys):
+        assert main(["--languages", "xx", "--dry-run"]) == 2
+        assert "No EUR-Lex source" in capsys.readouterr().out
@@ -0,0 +1,174 @@
+"""Unit tests for notebooks/utils/query_cache.py."""
+
+from unittest.mock import MagicMock
+
+import pytest
+from elasticsearch import ApiError
+
+from utils.query_cache import QueryCache, index_generation, set_ingest_version
+
+
+def _shard(max_seq_no, count, deleted=0, primary=True):
+    return {
+        "routing": {"primary": primary},
+        "docs": {"count": count, "deleted": deleted},
+        "seq_no": {"max_seq_no": max_seq_no},
+    }
+
+
+def _client(seq_no=10, total=5, version=None):
+    es = MagicMock()
+    meta = {"_meta": {"ingest_version": version}} if version else {}
+    es.indices.get_mapping.return_value = {"idx": {"mappings": meta}}
+    es.indices.stats.return_value = {
+        "indices": {"idx": {"shards": {"0": [_shard(seq_no, total)]}}}
+    }
+    return es
+
+
+def _bump(es, shard="0", **changes):
+    copy = es.indices.stats.return_value["indices"]["idx"]["shards"][shard][0]
+    if "max_seq_no" in changes:
+        copy["seq_no"]["max_seq_no"] = changes.pop("max_seq_no")
+    copy["docs"].update(changes)
+
+
+class TestIndexGeneration:
+    def test_combines_version_and_shard_state(self):
+        assert index_generation(_client(10, 5, "v2"), "idx") == "v2|idx/0:10:5:0"
+        assert index_generation(_client(10, 4), "idx") == "|idx/0:10:4:0"
+
+    def test_empty_index(self):
+        assert index_generation(_client(-1, 0), "idx") == "|idx/0:-1:0:0"
+
+    def test_ignores_replicas(self):
+        es = _client()
+        es.indices.stats.return_value["indices"]["idx"]["shards"]["0"].append(
+            _shard(3, 1, primary=False)
+        )
+        assert index_generation(es, "idx") == "|idx/0:10:5:0"
+
+    def test_write_on_lagging_shard_changes_token(self):
+        # Shard 1 is behind shard 0: an update there moves neither the
+        # global max _seq_no nor the document count.
+        es = _client()
+        es.indices.stats.return_value["indices"]["idx"]["shards"]["1"] = [_shard(4, 5)]
+        before = index_generation(es, "idx")
+        _bump(es, shard="1", max_seq_no=5)
+        assert index_generation(es, "idx") != before
+
+    def test_refresh_after_update_changes_token(self):
+        es = _client()
+        before = index_generation(es, "idx")
+        _bump(es, deleted=1)
+        assert index_generation(es, "idx") != before
+
+    def test_falls_back_without_shard_stats(self):
+        es = _client(version="v2")
+        meta = MagicMock()
+        meta.status = 410
+        es.indices.stats.side_effect = ApiError(message="api_not_available", meta=meta, body={})
+        es.search.return_value = {
+            "hits": {"total": {"value": 5}},
+            "aggregations": {"max_seq_no": {"value": 12.0}},
+        }
+        assert index_generation(es, "idx") == "v2|idx:12:5"
+
+        es.search.return_value["aggregations"]["max_seq_no"]["value"] = 13.0
+        assert index_generation(es, "idx") == "v2|idx:13:5"
+        es.indices.stats.assert_called_once()
+        assert es.search.call_args.kwargs["size"] == 0
+
+    def test_index_errors_still_raise(self):
+        es = _client()
+        meta = MagicMock()
+        meta.status = 404
+        error = ApiError(message="index_not_found_exception", meta=meta, body={})
+        es.indices.stats.side_effect = error
+        es.search.side_effect = error
+        with pytest.raises(ApiError):
+            index_generation(es, "idx")
+        es.search.side_effect = None
+        es.indices.stats.side_effect = None
+        assert index_generation(es, "idx") == "|idx/0:10:5:0"
+
+    def test_set_ingest_version(self):
+        es = MagicMock()
+        set_ingest_version(es, "idx", "2026-10-17")
+        es.indices.put_mapping.assert_called_once_with(
+            index="idx", meta={"ingest_version": "2026-10-17"}
+        )
+
+
+class TestQueryCache:
+    def test_repeat_query_served_from_cache(self):
+        es = _client()
+        cache = QueryCache(generation_check_interval=60)
+        compute = MagicMock(return_value=["hit"])
+        for query in ("Facial recognition", "  facial   RECOGNITION "):
+            assert cache.lookup(es, "idx", query, compute, language="en") == ["hit"]
+        compute.assert_called_once()
+        assert cache.hits == 1
+        assert es.indices.stats.call_count == 1
+
+    def test_key_includes_language_and_config(self):
+        es = _client()
+        cache = QueryCache()
+        compute = MagicMock(return_value=[])
+        cache.lookup(es, "idx", "q", compute, language="en")
+        cache.lookup(es, "idx", "q", compute, language="de")
+        cache.lookup(es, "idx", "q", compute, language="en", config={"window": 20})
+        assert compute.call_count == 3
+
+    def test_generation_change_invalidates(self):
+        es = _client(seq_no=10)
+        cache = QueryCache(generation_check_interval=0)
+        compute = MagicMock(side_effect=[["old"], ["new"]])
+        assert cache.lookup(es, "idx", "q", compute) == ["old"]
+        assert cache.lookup(es, "idx", "q", compute) == ["old"]
+        _bump(es, max_seq_no=11)
+        assert cache.lookup(es, "idx", "q", compute) == ["new"]
+
+    def test_ttl_expiry(self, monkeypatch):
+        now = [0.0]
+        monkeypatch.setattr("utils.query_cache.time.monotonic", lambda: now[0])
+        es = _client()
+        cache = QueryCache(ttl=10, generation_check_interval=100)
+        compute = MagicMock(return_value=[])
+        cache.lookup(es, "idx", "q", compute)
+        now[0] = 9.0
+        cache.lookup(es, "idx", "q", compute)
+        now[0] = 11.0
+        cache.lookup(es, "idx", "q", compute)
+        assert compute.call_count == 2
+
+    def test_lru_eviction(self):
+        es = _client()
+        cache = QueryCache(max_entries=2)
+        compute = MagicMock(return_value=[])
+        for query in ("a", "b", "a", "c", "b"):
+            cache.lookup(es, "idx", query, compute)
+        # "b" was evicted by "c" because "a" had been used more recently.
+        assert compute.call_count == 4
+        assert len(cache) == 2
+
+    def test_invalidate_index(self):
+        es = _client()
+        cache = QueryCache()
+        cache.lookup(es, "idx", "q", lambda: 1)
+        cache.lookup(es, "other", "q", lambda: 2)
+        cache.invalidate("idx")
+        assert len(cache) == 1
+        cache.invalidate()
+        assert len(cache) == 0
+
+    def test_compute_errors_are_not_cached(self):
+        es = _client()
+        cache = QueryCache()
+
+        def boom():
+            raise RuntimeError("search failed")
+
+        with pytest.raises(RuntimeError):
+            cache.lookup(es, "idx", "q", boom)
+        assert cache.lookup(es, "idx", "q", lambda: "ok") == "ok"
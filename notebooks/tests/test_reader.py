@@ -1,17 +1,26 @@
 """Unit tests for notebooks/utils/reader.py."""
 
-from unittest.mock import Mock, patch
+from unittest.mock import MagicMock, Mock, patch
 
 import pytest
 import requests
 
-from utils.reader import fetch_with_jina_reader
+from utils.parsing import parse_articles
+from utils.reader import (
+    _reader_headers,
+    _retry_after_seconds,
+    fetch_many,
+    fetch_with_jina_reader,
+    stream_articles_with_jina_reader,
+)
+from utils.reader_cache import ReaderCache
 
 
-def _make_response(text: str, status: int = 200) -> Mock:
+def _make_response(text: str, status: int = 200, headers: dict = None) -> Mock:
     resp = Mock()
     resp.text = text
     resp.status_code = status
+    resp.headers = headers or {}
     resp.raise_for_status = Mock()
     if status >= 400:
         resp.raise_for_status.side_effect = requests.HTTPError(response=resp)
@@ -19,7 +28,7 @@ def _make_response(text: str, status: int = 200) -> Mock:
 
 
 class TestFetchWithJinaReader:
-    @patch("utils.reader.requests.get")
+    @patch("requests.get")
     def test_success_on_first_try(self, mock_get):
         mock_get.return_value = _make_response("A" * 200)
         result = fetch_with_jina_reader("https://r.jina.ai/test", "key")
@@ -27,7 +36,7 @@ class TestFetchWithJinaReader:
         assert mock_get.call_count == 1
 
     @patch("utils.reader.time.sleep")
-    @patch("utils.reader.requests.get")
+    @patch("requests.get")
     def test_retries_on_empty_then_succeeds(self, mock_get, mock_sleep):
         mock_get.side_effect = [
             _make_response("short"),
@@ -39,20 +48,20 @@ class TestFetchWithJinaReader:
         mock_sleep.assert_called_once_with(5)
 
     @patch("utils.reader.time.sleep")
-    @patch("utils.reader.requests.get")
+    @patch("requests.get")
     def test_raises_after_all_retries_exhausted(self, mock_get, mock_sleep):
         mock_get.return_value = _make_response("tiny")
         with pytest.raises(ValueError, match="empty content after multiple retries"):
             fetch_with_jina_reader("https://r.jina.ai/test", "key", max_retries=3)
         assert mock_get.call_count == 3
 
-    @patch("utils.reader.requests.get")
+    @patch("requests.get")
     def test_http_error_propagates(self, mock_get):
         mock_get.return_value = _make_response("", status=500)
         with pytest.raises(requests.HTTPError):
             fetch_with_jina_reader("https://r.jina.ai/test", "key")
 
-    @patch("utils.reader.requests.get")
+    @patch("requests.get")
     def test_custom_min_content_length(self, mock_get):
         mock_get.return_value = _make_response("X" * 50)
         result = fetch_with_jina_reader(
@@ -60,9 +69,271 @@ class TestFetchWithJinaReader:
         )
         assert len(result) == 50
 
-    @patch("utils.reader.requests.get")
+    @patch("requests.get")
     def test_auth_header_sent(self, mock_get):
         mock_get.return_value = _make_response("A" * 200)
         fetch_with_jina_reader("https://r.jina.ai/test", "my-secret-key")
         headers = mock_get.call_args[1]["headers"]
         assert headers["Authorization"] == "Bearer my-secret-key"
+
+    def test_reuses_given_session(self):
+        session = Mock()
+        session.get.return_value = _make_response("A" * 200)
+        with patch("requests.get") as mock_get:
+            fetch_with_jina_reader("https://r.jina.ai/test", "key", session=session)
+            mock_get.assert_not_called()
+        session.get.assert_called_once()
+
+
+class TestFetchWithCache:
+    @patch("requests.get")
+    def test_hit_skips_network(self, mock_get, tmp_path):
+        cache = ReaderCache(tmp_path)
+        mock_get.return_value = _make_response("A" * 200, headers={"ETag": '"v1"'})
+        fetch_with_jina_reader("https://r.jina.ai/test", "key", cache=cache)
+        assert fetch_with_jina_reader("https://r.jina.ai/test", "key", cache=cache) == "A" * 200
+        assert mock_get.call_count == 1
+
+    @patch("requests.get")
+    def test_revalidate_uses_cached_copy_on_304(self, mock_get, tmp_path):
+        cache = ReaderCache(tmp_path)
+        cache.put("https://r.jina.ai/test", "C" * 200,
+                  {"x-respond-with": "markdown", "Accept": "text/plain"}, etag='"v1"')
+        mock_get.return_value = _make_response("", status=304)
+        result = fetch_with_jina_reader(
+            "https://r.jina.ai/test", "key", cache=cache, revalidate=True
+        )
+        assert result == "C" * 200
+        assert mock_get.call_args[1]["headers"]["If-None-Match"] == '"v1"'
+
+    @patch("requests.get")
+    def test_revalidate_refreshes_changed_source(self, mock_get, tmp_path):
+        cache = ReaderCache(tmp_path)
+        mock_get.return_value = _make_response("old" * 100, headers={"ETag": '"v1"'})
+        fetch_with_jina_reader("https://r.jina.ai/test", "key", cache=cache)
+        mock_get.return_value = _make_response("new" * 100, headers={"ETag": '"v2"'})
+        result = fetch_with_jina_reader(
+            "https://r.jina.ai/test", "key", cache=cache, revalidate=True
+        )
+        assert result == "new" * 100
+        assert fetch_with_jina_reader("https://r.jina.ai/test", "key", cache=cache) == "new" * 100
+
+
+class TestRetryAfter:
+    def test_delta_seconds(self):
+        assert _retry_after_seconds(_make_response("", headers={"Retry-After": "7"})) == 7.0
+
+    def test_http_date_in_past(self):
+        resp = _make_response("", headers={"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})
+        assert _retry_after_seconds(resp) == 0.0
+
+    def test_missing_or_garbage(self):
+        assert _retry_after_seconds(_make_response("")) is None
+        assert _retry_after_seconds(_make_response("", headers={"Retry-After": "soon"})) is None
+
+
+class TestFetchMany:
+    def _session(self, responses_by_url):
+        session = Mock()
+        session.get.side_effect = lambda url, **kw: responses_by_url[url].pop(0)
+        return session
+
+    @patch("utils.reader.time.sleep")
+    def test_fetches_all_in_input_order(self, mock_sleep):
+        urls = [f"https://r.jina.ai/doc{i}" for i in range(5)]
+        session = self._session({u: [_make_response(u * 10)] for u in urls})
+        results = fetch_many(urls, "key", concurrency=3, session=session)
+        assert list(results) == urls
+        assert results[urls[2]] == urls[2] * 10
+        assert session.get.call_count == 5
+        mock_sleep.assert_not_called()
+
+    @patch("utils.reader.random.uniform", return_value=0.5)
+    @patch("utils.reader.time.sleep")
+    def test_429_honours_retry_after(self, mock_sleep, mock_uniform):
+        url = "https://r.jina.ai/doc"
+        session = self._session({url: [
+            _make_response("", status=429, headers={"Retry-After": "3"}),
+            _make_response("A" * 200),
+        ]})
+        results = fetch_many([url], "key", session=session)
+        assert results[url] == "A" * 200
+        assert mock_sleep.call_args[0][0] == pytest.approx(3, abs=0.1)
+
+    @patch("utils.reader.time.sleep")
+    def test_retry_after_beyond_max_backoff_fails(self, mock_sleep):
+        url = "https://r.jina.ai/doc"
+        session = self._session({url: [
+            _make_response("", status=429, headers={"Retry-After": "120"}),
+            _make_response("A" * 200),
+        ]})
+        with pytest.raises(requests.HTTPError):
+            fetch_many([url], "key", session=session, max_backoff=60.0)
+        assert session.get.call_count == 1
+        mock_sleep.assert_not_called()
+
+    @patch("utils.reader.random.uniform", return_value=0.5)
+    @patch("utils.reader.time.sleep")
+    def test_retry_after_waited_in_full(self, mock_sleep, mock_uniform):
+        url = "https://r.jina.ai/doc"
+        session = self._session({url: [
+            _make_response("", status=503, headers={"Retry-After": "45"}),
+            _make_response("A" * 200),
+        ]})
+        fetch_many([url], "key", session=session, backoff_base=1.0, max_backoff=60.0)
+        assert mock_sleep.call_args[0][0] == 45.0
+
+    @patch("utils.reader.random.uniform", side_effect=lambda lo, hi: hi)
+    @patch("utils.reader.time.sleep")
+    def test_exponential_backoff_on_503(self, mock_sleep, mock_uniform):
+        url = "https://r.jina.ai/doc"
+        session = self._session({url: [
+            _make_response("", status=503),
+            _make_response("", status=503),
+            _make_response("A" * 200),
+        ]})
+        fetch_many([url], "key", session=session, backoff_base=2.0)
+        assert [c[0][0] for c in mock_sleep.call_args_list] == [2.0, 4.0]
+
+    @patch("utils.reader.time.sleep")
+    def test_non_retryable_error_raises(self, mock_sleep):
+        url = "https://r.jina.ai/doc"
+        session = self._session({url: [_make_response("", status=404)]})
+        with pytest.raises(requests.HTTPError):
+            fetch_many([url], "key", session=session)
+
+    @patch("utils.reader.time.sleep")
+    def test_return_exceptions(self, mock_sleep):
+        good, bad = "https://r.jina.ai/good", "https://r.jina.ai/bad"
+        session = self._session({
+            good: [_make_response("G" * 200)],
+            bad: [_make_response("x")] * 2,
+        })
+        results = fetch_many([good, bad], "key", max_retries=2,
+                             session=session, return_exceptions=True)
+        assert results[good] == "G" * 200
+        assert isinstance(results[bad], ValueError)
+
+    def test_empty_input(self):
+        assert fetch_many([], "key") == {}
+
+    @patch("utils.reader.time.sleep")
+    def test_duplicate_urls_fetched_once(self, mock_sleep):
+        url = "https://r.jina.ai/doc"
+        session = self._session({url: [_make_response("A" * 200)]})
+        assert fetch_many([url, url], "key", session=session) == {url: "A" * 200}
+        assert session.get.call_count == 1
+
+    @patch("utils.reader.time.sleep")
+    def test_cache_hits_skip_requests(self, mock_sleep, tmp_path):
+        cache = ReaderCache(tmp_path)
+        cached, fresh = "https://r.jina.ai/cached", "https://r.jina.ai/fresh"
+        session = self._session({fresh: [_make_response("F" * 200)]})
+        fetch_many([cached], "key", session=self._session(
+            {cached: [_make_response("C" * 200)]}), cache=cache)
+
+        results = fetch_many([cached, fresh], "key", session=session, cache=cache)
+        assert results == {cached: "C" * 200, fresh: "F" * 200}
+        assert session.get.call_count == 1
+
+    @patch("utils.reader.time.sleep")
+    def test_cache_stores_validators(self, mock_sleep, tmp_path):
+        cache = ReaderCache(tmp_path)
+        url = "https://r.jina.ai/doc"
+        session = self._session({url: [_make_response(
+            "A" * 200, headers={"ETag": '"v1"', "Last-Modified": "Wed, 14 Oct 2026 07:28:00 GMT"},
+        )]})
+        fetch_many([url], "key", session=session, cache=cache)
+        entry = cache.get_entry(url, _reader_headers("key"))
+        assert entry["etag"] == '"v1"'
+        assert entry["last_modified"] == "Wed, 14 Oct 2026 07:28:00 GMT"
+
+    @patch("utils.reader.time.sleep")
+    def test_revalidate(self, mock_sleep, tmp_path):
+        cache = ReaderCache(tmp_path)
+        same, changed = "https://r.jina.ai/same", "https://r.jina.ai/changed"
+        fetch_many([same, changed], "key", cache=cache, session=self._session({
+            same: [_make_response("S" * 200, headers={"ETag": '"s1"'})],
+            changed: [_make_response("o" * 200, headers={"ETag": '"c1"'})],
+        }))
+
+        session = self._session({
+            same: [_make_response("", status=304)],
+            changed: [_make_response("n" * 200, headers={"ETag": '"c2"'})],
+        })
+        results = fetch_many([same, changed], "key", session=session, cache=cache,
+                             revalidate=True)
+        assert results == {same: "S" * 200, changed: "n" * 200}
+        sent = {c.args[0]: c.kwargs["headers"] for c in session.get.call_args_list}
+        assert sent[same]["If-None-Match"] == '"s1"'
+        assert sent[changed]["If-None-Match"] == '"c1"'
+        assert cache.get(changed, _reader_headers("key")) == "n" * 200
+        assert cache.get_entry(changed, _reader_headers("key"))["etag"] == '"c2"'
+
+
+def _make_stream(payload: bytes, chunk: int, content_type: str = "text/plain") -> MagicMock:
+    resp = MagicMock()
+    resp.__enter__.return_value = resp
+    resp.headers = {"Content-Type": content_type}
+    resp.encoding = "ISO-8859-1"
+    resp.iter_content.return_value = [
+        payload[i:i + chunk] for i in range(0, len(payload), chunk)
+    ]
+    return resp
+
+
+class TestStreamArticles:
+    @patch("requests.get")
+    def test_matches_parse_articles(self, mock_get, sample_markdown):
+        mock_get.return_value = _make_stream(sample_markdown.encode("utf-8"), 97)
+        articles = list(stream_articles_with_jina_reader("https://r.jina.ai/test", "key"))
+        assert articles == parse_articles(sample_markdown)
+        assert mock_get.call_args[1]["stream"] is True
+
+    @patch("requests.get")
+    def test_yields_before_download_finishes(self, mock_get, sample_markdown):
+        consumed = []
+        payload = sample_markdown.encode("utf-8")
+
+        def _chunks(chunk_size):
+            for i in range(0, len(payload), 64):
+                consumed.append(i)
+                yield payload[i:i + 64]
+
+        resp = _make_stream(b"", 1)
+        resp.iter_content.side_effect = _chunks
+        mock_get.return_value = resp
+
+        first = next(stream_articles_with_jina_reader("https://r.jina.ai/test", "key"))
+        assert first["id"] == "en_art_1"
+        assert len(consumed) * 64 < len(payload)
+
+    @patch("requests.get")
+    def test_utf8_split_across_chunks(self, mock_get):
+        md = "Article 1\nÜbersicht\n\nDiese Verordnung – „KI“."
+        mock_get.return_value = _make_stream(md.encode("utf-8"), 1)
+        articles = list(stream_articles_with_jina_reader(
+            "https://r.jina.ai/test", "key", language="de", min_content_length=1
+        ))
+        assert articles == parse_articles(md, language="de")
+
+    @patch("utils.reader.time.sleep")
+    @patch("requests.get")
+    def test_retries_empty_stream(self, mock_get, mock_sleep, sample_markdown):
+        mock_get.side_effect = [
+            _make_stream(b"", 1),
+            _make_stream(sample_markdown.encode("utf-8"), 512),
+        ]
+        articles = list(stream_articles_with_jina_reader(
+            "https://r.jina.ai/test", "key", max_retries=2
+        ))
+        assert len(articles) == 8
+        mock_sleep.assert_called_once_with(5)
+
+    @patch("utils.reader.time.sleep")
+    @patch("requests.get")
+    def test_raises_when_always_empty(self, mock_get, mock_sleep):
+        mock_get.side_effect = lambda *a, **kw: _make_stream(b"tiny", 4)
+        with pytest.raises(ValueError, match="empty content after multiple retries"):
+            list(stream_articles_with_jina_reader("https://r.jina.ai/test", "key"))
+        assert mock_get.call_count == 3
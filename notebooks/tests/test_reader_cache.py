@@ -0,0 +1,69 @@
+"""Unit tests for notebooks/utils/reader_cache.py."""
+
+import os
+
+from utils.reader_cache import ReaderCache, cache_key
+
+
+class TestCacheKey:
+    def test_authorization_not_part_of_key(self):
+        a = cache_key("https://r.jina.ai/x", {"Authorization": "Bearer a", "Accept": "text/plain"})
+        b = cache_key("https://r.jina.ai/x", {"Authorization": "Bearer b", "Accept": "text/plain"})
+        assert a == b
+
+    def test_headers_change_key(self):
+        a = cache_key("https://r.jina.ai/x", {"Accept": "text/plain"})
+        b = cache_key("https://r.jina.ai/x", {"Accept": "application/json"})
+        assert a != b
+
+    def test_header_order_and_case_ignored(self):
+        a = cache_key("u", {"Accept": "text/plain", "x-respond-with": "markdown"})
+        b = cache_key("u", {"X-Respond-With": "markdown", "accept": "text/plain"})
+        assert a == b
+
+
+class TestReaderCache:
+    def test_round_trip_with_validators(self, tmp_path):
+        cache = ReaderCache(tmp_path)
+        cache.put("u", "# Article 1\nÜberblick", etag='"abc"', last_modified="Tue, 01 Oct 2024 00:00:00 GMT")
+        entry = cache.get_entry("u")
+        assert entry["text"] == "# Article 1\nÜberblick"
+        assert entry["etag"] == '"abc"'
+        assert entry["last_modified"] == "Tue, 01 Oct 2024 00:00:00 GMT"
+
+    def test_miss_returns_none(self, tmp_path):
+        assert ReaderCache(tmp_path).get("missing") is None
+
+    def test_stored_compressed(self, tmp_path):
+        cache = ReaderCache(tmp_path)
+        cache.put("u", "A" * 100_000)
+        sizes = [p.stat().st_size for p in tmp_path.glob("*.md.gz")]
+        assert sizes and sizes[0] < 10_000
+
+    def test_lru_eviction(self, tmp_path):
+        cache = ReaderCache(tmp_path, max_bytes=10**9)
+        for i, url in enumerate(["a", "b", "c"]):
+            cache.put(url, os.urandom(2000).hex())
+            data = next(p for p in tmp_path.glob("*.md.gz") if p.name.startswith(cache_key(url)))
+            os.utime(data, (1000 + i, 1000 + i))
+
+        cache.touch("a")  # "a" is now the most recently used
+        size = sum(p.stat().st_size for p in tmp_path.glob("*.md.gz"))
+        cache.max_bytes = size - 1
+        assert cache.evict() == 1
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+
+    def test_env_directory(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("JINA_READER_CACHE_DIR", str(tmp_path / "envcache"))
+        cache = ReaderCache()
+        assert cache.directory == tmp_path / "envcache"
+        assert cache.directory.is_dir()
+
+    def test_clear(self, tmp_path):
+        cache = ReaderCache(tmp_path)
+        cache.put("u", "text")
+        cache.clear()
+        assert cache.get("u") is None
+        assert list(tmp_path.iterdir()) == []
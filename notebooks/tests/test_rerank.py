@@ -0,0 +1,119 @@
+"""Unit tests for notebooks/utils/rerank.py."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from utils.rerank import (
+    CandidateCache,
+    default_retriever,
+    fetch_candidates,
+    rerank_candidates,
+    two_stage_search,
+)
+
+
+def _hits(n):
+    return [
+        {"_id": f"en_art_{i}", "_score": float(n - i),
+         "_source": {"article_number": str(i), "title": f"A{i}", "text": "x" * i}}
+        for i in range(1, n + 1)
+    ]
+
+
+def _rerank(inference_id, body):
+    # Longer passages score higher, returned best-first like EIS.
+    ranked = sorted(enumerate(body["input"]), key=lambda p: len(p[1]), reverse=True)
+    return {"rerank": [{"index": i, "relevance_score": float(len(t))} for i, t in ranked]}
+
+
+@pytest.fixture
+def es():
+    client = MagicMock()
+    client.search.side_effect = lambda index, retriever, size: {"hits": {"hits": _hits(size)}}
+    client.inference.inference.side_effect = _rerank
+    return client
+
+
+class TestFetchCandidates:
+    def test_default_retriever(self, es):
+        fetch_candidates(es, "idx", "q", size=5)
+        es.search.assert_called_once_with(
+            index="idx", retriever=default_retriever("q"), size=5
+        )
+
+    def test_cache_serves_smaller_sizes(self, es):
+        cache = CandidateCache()
+        fetch_candidates(es, "idx", "q", size=50, cache=cache)
+        assert len(fetch_candidates(es, "idx", "q", size=10, cache=cache)) == 10
+        es.search.assert_called_once()
+        fetch_candidates(es, "idx", "q", size=100, cache=cache)
+        assert es.search.call_count == 2
+
+    def test_exhausted_result_set_is_complete(self):
+        client = MagicMock()
+        client.search.return_value = {"hits": {"hits": _hits(3)}}
+        cache = CandidateCache()
+        fetch_candidates(client, "idx", "q", size=10, cache=cache)
+        assert len(fetch_candidates(client, "idx", "q", size=50, cache=cache)) == 3
+        client.search.assert_called_once()
+
+    def test_lru_bound(self, es):
+        cache = CandidateCache(max_queries=1)
+        fetch_candidates(es, "idx", "q1", size=5, cache=cache)
+        fetch_candidates(es, "idx", "q2", size=5, cache=cache)
+        fetch_candidates(es, "idx", "q1", size=5, cache=cache)
+        assert es.search.call_count == 3
+
+
+class TestRerankCandidates:
+    def test_reorders_window_only(self, es):
+        reranked = rerank_candidates(es, "q", _hits(10), "rr", window=4)
+        assert [h["_id"] for h in reranked] == [f"en_art_{i}" for i in (4, 3, 2, 1)]
+        assert reranked[0]["_first_stage_rank"] == 4
+        assert reranked[0]["_rerank_score"] == 4.0
+        body = es.inference.inference.call_args.kwargs["body"]
+        assert body == {"query": "q", "input": ["x", "xx", "xxx", "xxxx"]}
+
+    def test_size_truncates(self, es):
+        assert len(rerank_candidates(es, "q", _hits(10), "rr", window=8, size=3)) == 3
+
+    def test_empty(self, es):
+        assert rerank_candidates(es, "q", [], "rr") == []
+        es.inference.inference.assert_not_called()
+
+    def test_scores_memoized(self, es):
+        cache = CandidateCache()
+        rerank_candidates(es, "q", _hits(10), "rr", window=5, cache=cache)
+        rerank_candidates(es, "q", _hits(10), "rr", window=8, cache=cache)
+        inputs = [c.kwargs["body"]["input"] for c in es.inference.inference.call_args_list]
+        assert [len(i) for i in inputs] == [5, 3]
+
+    def test_score_memo_is_bounded(self, es):
+        cache = CandidateCache(max_queries=2)
+        for query in ("q1", "q2", "q3"):
+            rerank_candidates(es, query, _hits(5), "rr", window=5, cache=cache)
+        assert len(cache._scores) == 2
+        assert cache.get_scores("rr", "q1", ["en_art_1"]) == {}
+        assert cache.get_scores("rr", "q3", ["en_art_1"]) == {"en_art_1": 1.0}
+
+        cache.clear()
+        assert cache.get_scores("rr", "q3", ["en_art_1"]) == {}
+
+
+class TestTwoStageSearch:
+    def test_one_fetch_for_all_windows(self, es):
+        results = two_stage_search(es, "idx", "q", "rr", windows=(5, 20, 10), size=3)
+        assert sorted(results) == [5, 10, 20]
+        assert [h["_id"] for h in results[20]] == ["en_art_20", "en_art_19", "en_art_18"]
+        es.search.assert_called_once()
+        assert es.search.call_args.kwargs["size"] == 20
+        total = sum(len(c.kwargs["body"]["input"]) for c in es.inference.inference.call_args_list)
+        assert total == 20
+
+    def test_repeat_experiment_skips_first_stage(self, es):
+        cache = CandidateCache()
+        two_stage_search(es, "idx", "q", "rr", windows=(50,), cache=cache)
+        two_stage_search(es, "idx", "q", "other-rr", windows=(25,), cache=cache)
+        es.search.assert_called_once()
+        assert es.inference.inference.call_count == 2
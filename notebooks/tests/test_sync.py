@@ -0,0 +1,143 @@
+"""Unit tests for notebooks/utils/sync.py."""
+
+from unittest.mock import MagicMock, patch
+
+from utils.parsing import parse_articles
+from utils.sync import (
+    CONTENT_HASH_FIELD,
+    content_hash,
+    load_manifest,
+    plan_sync,
+    sync_articles,
+)
+
+
+def _article(num: str, text: str, language: str = "en") -> dict:
+    return {
+        "id": f"{language}_art_{num}",
+        "article_number": num,
+        "title": f"Title {num}",
+        "text": text,
+        "language": language,
+        "url": f"https://example.test/{language}#Art{num}",
+    }
+
+
+class TestContentHash:
+    def test_stable(self):
+        assert content_hash(_article("1", "Body")) == content_hash(_article("1", "Body"))
+
+    def test_whitespace_insensitive(self):
+        assert content_hash(_article("1", "Body  text\n\nmore")) == \
+            content_hash(_article("1", "Body text more"))
+
+    def test_text_change_detected(self):
+        assert content_hash(_article("1", "Body")) != content_hash(_article("1", "Body!"))
+
+    def test_title_change_detected(self):
+        changed = {**_article("1", "Body"), "title": "Other"}
+        assert content_hash(_article("1", "Body")) != content_hash(changed)
+
+
+class TestPlanSync:
+    def test_first_run_creates_everything(self, sample_markdown):
+        articles = parse_articles(sample_markdown)
+        plan = plan_sync(articles, {})
+        assert len(plan["create"]) == 8
+        assert plan["update"] == plan["delete"] == []
+
+    def test_unchanged_run_is_empty(self, sample_markdown):
+        articles = parse_articles(sample_markdown)
+        previous = plan_sync(articles, {})["hashes"]
+        plan = plan_sync(articles, previous)
+        assert plan["create"] == plan["update"] == plan["delete"] == []
+        assert plan["unchanged"] == 8
+
+    def test_create_update_delete(self):
+        previous = plan_sync([_article("1", "a"), _article("2", "b")], {})["hashes"]
+        plan = plan_sync([_article("1", "a"), _article("2", "B"), _article("3", "c")], previous)
+        assert [a["id"] for a in plan["create"]] == ["en_art_3"]
+        assert [a["id"] for a in plan["update"]] == ["en_art_2"]
+        assert plan["delete"] == []
+
+        plan = plan_sync([_article("1", "a")], previous)
+        assert plan["delete"] == ["en_art_2"]
+        assert "en_art_2" not in plan["hashes"]
+
+    def test_deletes_scoped_to_synced_languages(self):
+        previous = plan_sync([_article("1", "a"), _article("1", "x", "de")], {})["hashes"]
+        plan = plan_sync([_article("1", "a")], previous)
+        assert plan["delete"] == []
+        assert "de_art_1" in plan["hashes"]
+
+
+def _sent_actions(es) -> list[dict]:
+    """Flatten the action lines of every bulk call made on *es*."""
+    ops = []
+    for call in es.bulk.call_args_list:
+        ops.extend(op for op in call[1]["operations"] if len(op) == 1 and
+                   next(iter(op)) in ("index", "delete"))
+    return ops
+
+
+class TestSyncArticles:
+    def test_manifest_mode_only_sends_changes(self, fake_bulk_client, tmp_path):
+        manifest = tmp_path / "manifest.json"
+        es = fake_bulk_client
+
+        sync_articles(es, "idx", [_article("1", "a"), _article("2", "b")], manifest_path=manifest)
+        ops = es.bulk.call_args[1]["operations"]
+        assert len(_sent_actions(es)) == 2
+        assert ops[1][CONTENT_HASH_FIELD] == content_hash(_article("1", "a"))
+        assert set(load_manifest(manifest)) == {"en_art_1", "en_art_2"}
+
+        es.bulk.reset_mock()
+        summary = sync_articles(es, "idx", [_article("1", "a")], manifest_path=manifest)
+        assert _sent_actions(es) == [{"delete": {"_id": "en_art_2", "_index": "idx"}}]
+        assert summary["deleted"] == 1 and summary["unchanged"] == 1
+
+        es.bulk.reset_mock()
+        sync_articles(es, "idx", [_article("1", "a")], manifest_path=manifest)
+        es.bulk.assert_not_called()
+
+    @patch("elasticsearch.helpers.scan")
+    def test_index_mode_reads_stored_hashes(self, mock_scan, fake_bulk_client):
+        es = fake_bulk_client
+        es.indices.exists.return_value = True
+        mock_scan.return_value = [
+            {"_id": "en_art_1", "_source": {CONTENT_HASH_FIELD: content_hash(_article("1", "a"))}},
+            {"_id": "en_art_2", "_source": {CONTENT_HASH_FIELD: "stale"}},
+        ]
+        summary = sync_articles(es, "idx", [_article("1", "a"), _article("2", "b")])
+
+        assert summary["updated"] == 1 and summary["unchanged"] == 1
+        assert mock_scan.call_args[1]["_source"] == [CONTENT_HASH_FIELD]
+        es.indices.put_mapping.assert_called_once()
+        assert [op["index"]["_id"] for op in _sent_actions(es)] == ["en_art_2"]
+
+    def test_dry_run_sends_nothing(self, fake_bulk_client, tmp_path):
+        manifest = tmp_path / "manifest.json"
+        summary = sync_articles(fake_bulk_client, "idx", [_article("1", "a")],
+                                manifest_path=manifest, dry_run=True)
+        assert summary["created"] == 1
+        fake_bulk_client.bulk.assert_not_called()
+        assert not manifest.exists()
+
+    def test_missing_delete_target_is_not_an_error(self, fake_bulk_client, tmp_path):
+        manifest = tmp_path / "manifest.json"
+        es = fake_bulk_client
+        sync_articles(es, "idx", [_article("1", "a"), _article("2", "b")], manifest_path=manifest)
+        es.bulk.side_effect = lambda operations, **kw: {"items": [
+            {"delete": {"_id": "en_art_2", "status": 404}}
+        ]}
+        summary = sync_articles(es, "idx", [_article("1", "a")], manifest_path=manifest)
+        assert summary["errors"] == []
+        assert set(load_manifest(manifest)) == {"en_art_1"}
+
+    def test_manifest_not_saved_on_errors(self, tmp_path):
+        manifest = tmp_path / "manifest.json"
+        es = MagicMock()
+        es.bulk.return_value = {"items": [{"index": {"_id": "en_art_1", "status": 500}}]}
+        summary = sync_articles(es, "idx", [_article("1", "a")], manifest_path=manifest)
+        assert len(summary["errors"]) == 1
+        assert not manifest.exists()
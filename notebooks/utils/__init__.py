@@ -1 +1,101 @@
 # Innocenti Risk Management - Notebook Utilities
+"""
+Notebook utilities for the Innocenti risk-management demos.
+
+The public API is re-exported here lazily: ``from utils import
+parse_articles`` imports only :mod:`utils.parsing`, so callers never pay
+for pandas, NumPy, ``requests`` or ``elasticsearch`` unless they use a
+helper that needs them.
+"""
+
+import importlib
+
+# Public name -> submodule that defines it.
+_EXPORTS = {
+    # parsing
+    "SECTION_KINDS": "parsing",
+    "iter_sections": "parsing",
+    "iter_articles": "parsing",
+    "iter_articles_from_file": "parsing",
+    "iter_articles_from_blocks": "parsing",
+    "parse_articles": "parsing",
+    "parse_articles_file": "parsing",
+    # article store (needs pyarrow)
+    "write_articles": "article_store",
+    "read_articles": "article_store",
+    "iter_record_batches": "article_store",
+    "articles_frame": "article_store",
+    # chunking
+    "chunk_text": "chunking",
+    "chunk_article": "chunking",
+    "iter_passages": "chunking",
+    # reader
+    "create_reader_session": "reader",
+    "fetch_with_jina_reader": "reader",
+    "fetch_many": "reader",
+    "stream_articles_with_jina_reader": "reader",
+    "ReaderCache": "reader_cache",
+    # ingest
+    "iter_language_articles": "ingest",
+    "ingest_languages": "ingest",
+    "run_pipeline": "pipeline",
+    # indexing
+    "bulk_index": "indexing",
+    "iter_index_readiness": "indexing",
+    "wait_for_index_ready": "indexing",
+    # sync
+    "content_hash": "sync",
+    "load_manifest": "sync",
+    "save_manifest": "sync",
+    "fetch_index_hashes": "sync",
+    "plan_sync": "sync",
+    "sync_articles": "sync",
+    # credentials
+    "ResolvedConfig": "credentials",
+    "resolve_config": "credentials",
+    "get_credentials": "credentials",
+    "get_index_name": "credentials",
+    "get_inference_id": "credentials",
+    "get_elasticsearch_client": "credentials",
+    "create_elasticsearch_client": "credentials",
+    "setup_notebook": "credentials",
+    # inference
+    "EndpointRegistry": "inference",
+    "endpoint_registry": "inference",
+    "verify_embedding_endpoint": "inference",
+    "create_embedding_inference": "inference",
+    "create_reranker_inference": "inference",
+    "normalize_text": "inference",
+    "EmbeddingCache": "inference",
+    "embed_texts": "inference",
+    "InferenceCoalescer": "inference",
+    # search
+    "CandidateCache": "rerank",
+    "fetch_candidates": "rerank",
+    "rerank_candidates": "rerank",
+    "two_stage_search": "rerank",
+    "rrf_fuse": "hybrid",
+    "hybrid_search": "hybrid",
+    "QueryCache": "query_cache",
+    # analysis
+    "build_comparison": "comparison",
+    "build_comparison_batch": "comparison",
+    "rank_metrics": "comparison",
+    "evaluate": "evaluation",
+    "write_report": "evaluation",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -0,0 +1,293 @@
+"""
+Columnar article store (Arrow IPC / Parquet) for parsed output.
+
+Holding every language edition (or its chunked passages) as a list of
+dicts repeats each key and each ``language``/``url`` string per record.
+This module writes :func:`utils.parsing.parse_articles` and
+:func:`utils.chunking.iter_passages` output as Arrow record batches with
+dictionary-encoded ``language`` and ``url`` columns:
+
+- ``.arrow`` files (Arrow IPC, uncompressed) load zero-copy through a
+  memory map, so several worker processes can share one copy of the
+  corpus through the page cache.
+- ``.parquet`` files are compressed for storage and transfer.
+
+Downstream code reads record batches (:func:`iter_record_batches`) and
+converts one batch at a time, e.g. :func:`iter_actions` for
+:func:`utils.indexing.bulk_index` or :func:`articles_frame` for the
+pandas-based comparison and evaluation helpers.
+
+Requires ``pyarrow`` (optional dependency: ``pip install pyarrow``).
+"""
+
+import itertools
+import os
+import tempfile
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional, Sequence, Union
+
+if TYPE_CHECKING:
+    import pandas as pd
+    import pyarrow as pa
+
+DEFAULT_BATCH_SIZE = 4096
+DICTIONARY_COLUMNS = ("language", "url")
+
+ARTICLE_FIELDS = (
+    ("id", "string"),
+    ("article_number", "string"),
+    ("title", "string"),
+    ("text", "string"),
+    ("language", "dictionary"),
+    ("url", "dictionary"),
+)
+# Extra fields added by utils.chunking.chunk_article.
+PASSAGE_FIELDS = ARTICLE_FIELDS + (
+    ("parent_id", "string"),
+    ("chunk_index", "int32"),
+    ("chunk_count", "int32"),
+    ("chunk_start", "int64"),
+    ("chunk_end", "int64"),
+)
+
+Source = Union[str, os.PathLike, "pa.Table", "pa.RecordBatch", Iterable["pa.RecordBatch"]]
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise ImportError(
+            "utils.article_store needs pyarrow (pip install pyarrow)"
+        ) from e
+    return pyarrow
+
+
+def article_schema(passages: bool = False) -> "pa.Schema":
+    """Arrow schema for articles (or chunked passages when *passages*)."""
+    pa = _pyarrow()
+    types = {
+        "string": pa.string(),
+        "int32": pa.int32(),
+        "int64": pa.int64(),
+        "dictionary": pa.dictionary(pa.int32(), pa.string()),
+    }
+    fields = PASSAGE_FIELDS if passages else ARTICLE_FIELDS
+    return pa.schema([(name, types[kind]) for name, kind in fields])
+
+
+class _DictionaryEncoder:
+    """Running dictionary for one column.
+
+    Every batch's dictionary extends the previous one, which is what the
+    Arrow IPC file format needs to write it as a delta.
+    """
+
+    def __init__(self):
+        self.codes: dict[str, int] = {}
+
+    def encode(self, values: list) -> "pa.DictionaryArray":
+        pa = _pyarrow()
+        codes = self.codes
+        indices = [None if v is None else codes.setdefault(v, len(codes)) for v in values]
+        return pa.DictionaryArray.from_arrays(
+            pa.array(indices, type=pa.int32()), pa.array(list(codes), type=pa.string())
+        )
+
+
+def _iter_encoded_batches(
+    records: Iterable[dict], batch_size: int
+) -> Iterator["pa.RecordBatch"]:
+    """Encode *records* into batches that share (and grow) one dictionary."""
+    pa = _pyarrow()
+    schema = None
+    encoders = {name: _DictionaryEncoder() for name in DICTIONARY_COLUMNS}
+    chunk: list[dict] = []
+
+    def flush():
+        columns = []
+        for field in schema:
+            values = [record.get(field.name) for record in chunk]
+            if field.name in encoders:
+                columns.append(encoders[field.name].encode(values))
+            else:
+                columns.append(pa.array(values, type=field.type))
+        return pa.RecordBatch.from_arrays(columns, schema=schema)
+
+    for record in records:
+        if schema is None:
+            schema = article_schema(passages="parent_id" in record)
+        chunk.append(record)
+        if len(chunk) >= batch_size:
+            yield flush()
+            chunk = []
+    if chunk:
+        yield flush()
+
+
+def articles_to_table(records: Iterable[dict], batch_size: int = DEFAULT_BATCH_SIZE) -> "pa.Table":
+    """In-memory Arrow table of article or passage dicts.
+
+    Keys outside :data:`ARTICLE_FIELDS` / :data:`PASSAGE_FIELDS` are
+    dropped; the passage schema is used when the first record has a
+    ``parent_id``.
+    """
+    pa = _pyarrow()
+    batches = list(_iter_encoded_batches(records, batch_size))
+    if not batches:
+        return article_schema().empty_table()
+    return pa.Table.from_batches(batches).unify_dictionaries()
+
+
+def write_articles(
+    path: Union[str, os.PathLike],
+    records: Iterable[dict],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    compression: str = "zstd",
+) -> int:
+    """Stream article or passage dicts to ``.arrow`` or ``.parquet``.
+
+    The file is written atomically.  ``.arrow`` (also ``.feather``) files
+    are left uncompressed so :func:`read_articles` can memory-map them
+    without copying; *compression* applies to Parquet only.
+
+    Args:
+        path: Output file; the suffix picks the format
+        records: Dicts from ``parse_articles`` / ``iter_articles`` /
+            ``iter_passages``
+        batch_size: Rows per record batch (Parquet row group)
+        compression: Parquet codec (``"zstd"``, ``"snappy"``, ``None``, ...)
+
+    Returns:
+        Number of rows written
+    """
+    pa = _pyarrow()
+    path = Path(path)
+    if path.suffix not in (".arrow", ".feather", ".parquet"):
+        raise ValueError(f"Unsupported article store format: {path.suffix!r}")
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    batches = _iter_encoded_batches(records, batch_size)
+    first = next(batches, None)
+    schema = first.schema if first is not None else article_schema()
+
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    os.close(fd)
+    rows = 0
+    try:
+        if path.suffix == ".parquet":
+            import pyarrow.parquet as pq
+
+            writer = pq.ParquetWriter(tmp, schema, compression=compression)
+        else:
+            options = pa.ipc.IpcWriteOptions(emit_dictionary_deltas=True)
+            writer = pa.ipc.new_file(tmp, schema, options=options)
+        with writer:
+            for batch in itertools.chain([first] if first is not None else [], batches):
+                writer.write_batch(batch)
+                rows += batch.num_rows
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    print(f"✓ Wrote {rows} rows to {path}")
+    return rows
+
+
+def read_articles(
+    path: Union[str, os.PathLike],
+    columns: Optional[Sequence[str]] = None,
+    memory_map: bool = True,
+) -> "pa.Table":
+    """Load an article store written by :func:`write_articles`.
+
+    ``.arrow`` files are memory-mapped by default: column buffers point
+    into the page cache rather than the Python heap.  Parquet has to be
+    decoded, so *memory_map* only avoids an extra read copy there.
+    """
+    pa = _pyarrow()
+    path = Path(path)
+    if path.suffix == ".parquet":
+        import pyarrow.parquet as pq
+
+        return pq.read_table(path, columns=columns, memory_map=memory_map)
+
+    source = pa.memory_map(str(path)) if memory_map else pa.OSFile(str(path))
+    table = pa.ipc.open_file(source).read_all()
+    return table.select(list(columns)) if columns is not None else table
+
+
+def iter_record_batches(
+    source: Source,
+    batch_size: Optional[int] = None,
+    columns: Optional[Sequence[str]] = None,
+) -> Iterator["pa.RecordBatch"]:
+    """Record batches from a store file, an Arrow table or batches.
+
+    Parquet files are decoded one row group (or *batch_size* rows) at a
+    time, so the whole corpus is never materialized; ``.arrow`` files are
+    memory-mapped and sliced without copying.
+    """
+    pa = _pyarrow()
+    if isinstance(source, (str, os.PathLike)):
+        path = Path(source)
+        if path.suffix == ".parquet":
+            import pyarrow.parquet as pq
+
+            parquet = pq.ParquetFile(path, memory_map=True)
+            yield from parquet.iter_batches(
+                batch_size=batch_size or DEFAULT_BATCH_SIZE, columns=columns
+            )
+            return
+        source = read_articles(path, columns)
+        columns = None
+
+    if isinstance(source, pa.RecordBatch):
+        source = [source]
+    if isinstance(source, pa.Table):
+        source = source.to_batches(max_chunksize=batch_size)
+    for batch in source:
+        if columns is not None:
+            batch = batch.select(list(columns))
+        if batch_size is None or batch.num_rows <= batch_size:
+            yield batch
+            continue
+        for offset in range(0, batch.num_rows, batch_size):
+            yield batch.slice(offset, batch_size)
+
+
+def iter_articles_from_store(source: Source, batch_size: Optional[int] = None) -> Iterator[dict]:
+    """Article dicts, materialized one record batch at a time."""
+    for batch in iter_record_batches(source, batch_size):
+        yield from batch.to_pylist()
+
+
+def iter_actions(
+    source: Source,
+    index_name: str,
+    id_field: str = "id",
+    batch_size: Optional[int] = None,
+) -> Iterator[dict]:
+    """Bulk actions for :func:`utils.indexing.bulk_index`, straight from batches.
+
+    Only the batch being indexed is converted to Python objects, so
+    indexing a memory-mapped store keeps the heap flat.
+    """
+    for batch in iter_record_batches(source, batch_size):
+        for doc in batch.to_pylist():
+            yield {"_index": index_name, "_id": doc[id_field], "_source": doc}
+
+
+def articles_frame(source: Source, columns: Optional[Sequence[str]] = None) -> "pd.DataFrame":
+    """pandas view of a store, with ``language``/``url`` as categoricals.
+
+    Feeds the pandas-based helpers in :mod:`utils.comparison` and
+    :mod:`utils.evaluation` (e.g. joining hit ids to titles) without
+    going through a list of dicts.
+    """
+    pa = _pyarrow()
+    batches = list(iter_record_batches(source, columns=columns))
+    if not batches:
+        table = article_schema().empty_table()
+        return table.select(list(columns)).to_pandas() if columns else table.to_pandas()
+    return pa.Table.from_batches(batches).to_pandas()
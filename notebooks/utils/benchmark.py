@@ -0,0 +1,330 @@
+"""
+Parsing benchmarks on synthetic EUR-Lex-shaped corpora.
+
+The unit tests only parse a 4 KB fixture; this module generates markdown
+shaped like a Jina Reader dump of the AI Act (preamble with recitals,
+chapters, articles with numbered points, annexes) at any size and reports
+throughput (MB/s, articles/s) and peak Python heap for each parser, so
+regressions in the ingestion hot path show up before production.
+
+Run from ``notebooks/``::
+
+    python -m utils.benchmark --sizes 1 10 100 500
+    python -m utils.benchmark --output bench.json
+    python -m utils.benchmark --baseline bench.json   # exit 1 on regression
+"""
+
+import argparse
+import gc
+import json
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+from .parsing import (
+    iter_articles,
+    iter_articles_from_blocks,
+    iter_articles_from_file,
+    iter_sections,
+    parse_articles,
+    parse_articles_file,
+)
+
+MB = 1024 * 1024
+DEFAULT_SIZES_MB = (1, 10, 100)
+DEFAULT_TOLERANCE = 0.2
+
+_WORDS = (
+    "artificial intelligence system provider deployer market surveillance "
+    "authority conformity assessment high-risk requirements obligations "
+    "Union Member States Commission notified body fundamental rights "
+    "transparency data governance documentation human oversight accuracy "
+    "robustness cybersecurity placing on the market putting into service "
+    "general-purpose model systemic risk sandbox penalties"
+).split()
+_ROMAN = (
+    (1000, "M"), (900, "CM"), (500, "D"), (400, "CD"), (100, "C"), (90, "XC"),
+    (50, "L"), (40, "XL"), (10, "X"), (9, "IX"), (5, "V"), (4, "IV"), (1, "I"),
+)
+
+# name -> (input kind, parser).  "text" parsers get the decoded corpus
+# (loaded before timing starts), "path" parsers the file path and "file"
+# parsers an open text file, so their timings include reading.  Each
+# parser returns an iterable of articles.  Register new parsers here.
+PARSERS: dict[str, tuple[str, Callable]] = {
+    "parse_articles": ("text", parse_articles),
+    "iter_articles": ("text", iter_articles),
+    "iter_articles[file]": ("file", iter_articles),
+    "iter_articles_from_blocks": (
+        "text",
+        lambda text: iter_articles_from_blocks(
+            text[i:i + 64 * 1024] for i in range(0, len(text), 64 * 1024)
+        ),
+    ),
+    "parse_articles_file": ("path", parse_articles_file),
+    "iter_articles_from_file": ("path", iter_articles_from_file),
+    "iter_sections": ("text", iter_sections),
+}
+
+
+def _roman(n: int) -> str:
+    out = []
+    for value, numeral in _ROMAN:
+        count, n = divmod(n, value)
+        out.append(numeral * count)
+    return "".join(out)
+
+
+def _sentence(rng: random.Random, min_words: int = 8, max_words: int = 40) -> str:
+    words = rng.choices(_WORDS, k=rng.randint(min_words, max_words))
+    return " ".join(words).capitalize() + "."
+
+
+def _article(rng: random.Random, number: int) -> str:
+    lines = [f"## Article {number}", _sentence(rng, 2, 6).rstrip("."), ""]
+    for point in range(1, rng.randint(1, 8) + 1):
+        lines.append(f"{point}. {_sentence(rng)}")
+        for letter in "abcdefgh"[:rng.randint(0, 5)]:
+            lines.append(f"({letter}) {_sentence(rng)}")
+        lines.append("")
+    return "\n".join(lines) + "\n"
+
+
+def iter_corpus(target_bytes: int, seed: int = 0) -> Iterable[str]:
+    """Yield pieces of a synthetic AI Act dump totalling about *target_bytes*.
+
+    The layout repeats "preamble, chapters of articles, annexes" with
+    article numbers that keep increasing, so every article id is unique.
+    Output is deterministic for a given *seed*.
+    """
+    rng = random.Random(seed)
+    written = 0
+    article = 0
+    chapter = 0
+    annex = 0
+
+    def emit(piece):
+        nonlocal written
+        written += len(piece.encode("utf-8"))
+        return piece
+
+    yield emit("# REGULATION (EU) 2024/1689 OF THE EUROPEAN PARLIAMENT\n\n")
+    for recital in range(1, 21):
+        yield emit(f"({recital}) {_sentence(rng, 30, 80)}\n\n")
+
+    while written < target_bytes:
+        chapter += 1
+        yield emit(f"CHAPTER {_roman(chapter)}\n{_sentence(rng, 2, 5).upper()}\n\n")
+        for _ in range(rng.randint(3, 12)):
+            article += 1
+            yield emit(_article(rng, article))
+            if written >= target_bytes:
+                break
+        if chapter % 13 == 0:
+            annex += 1
+            yield emit(f"ANNEX {_roman(annex)}\n{_sentence(rng, 2, 6)}\n\n"
+                       f"{_sentence(rng, 40, 120)}\n\n")
+
+
+def write_corpus(path, size_mb: float, seed: int = 0) -> Path:
+    """Write a synthetic corpus of about *size_mb* MiB to *path*."""
+    path = Path(path)
+    with open(path, "w", encoding="utf-8") as f:
+        for piece in iter_corpus(int(size_mb * MB), seed):
+            f.write(piece)
+    return path
+
+
+def _consume(articles) -> int:
+    count = 0
+    for _ in articles:
+        count += 1
+    return count
+
+
+def _run_once(kind: str, parser: Callable, path: Path, text: Optional[str]) -> int:
+    if kind == "text":
+        return _consume(parser(text))
+    if kind == "path":
+        return _consume(parser(path))
+    with open(path, encoding="utf-8") as f:
+        return _consume(parser(f))
+
+
+def benchmark_parser(
+    name: str,
+    path,
+    repeat: int = 3,
+    memory: bool = True,
+    text: Optional[str] = None,
+) -> dict:
+    """Time one registered parser on a corpus file.
+
+    Throughput uses the fastest of *repeat* runs.  Peak memory comes from a
+    separate ``tracemalloc`` run (which is much slower) and counts only
+    allocations made by the parser, not the already-loaded corpus.
+
+    Args:
+        name: Key of :data:`PARSERS`
+        path: Corpus file written by :func:`write_corpus`
+        repeat: Timed runs
+        memory: Also measure peak memory
+        text: Pre-decoded corpus, to avoid re-reading it per parser
+
+    Returns:
+        dict with keys: parser, size_mb, articles, seconds, mb_per_sec,
+        articles_per_sec, peak_mb (``None`` when *memory* is off)
+    """
+    kind, parser = PARSERS[name]
+    path = Path(path)
+    size_mb = path.stat().st_size / MB
+    if kind == "text" and text is None:
+        text = path.read_text(encoding="utf-8")
+
+    best = float("inf")
+    articles = 0
+    for _ in range(max(repeat, 1)):
+        gc.collect()
+        start = time.perf_counter()
+        articles = _run_once(kind, parser, path, text)
+        best = min(best, time.perf_counter() - start)
+
+    peak_mb = None
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            _run_once(kind, parser, path, text)
+            peak_mb = tracemalloc.get_traced_memory()[1] / MB
+        finally:
+            tracemalloc.stop()
+
+    return {
+        "parser": name,
+        "size_mb": round(size_mb, 2),
+        "articles": articles,
+        "seconds": best,
+        "mb_per_sec": size_mb / best if best else 0.0,
+        "articles_per_sec": articles / best if best else 0.0,
+        "peak_mb": peak_mb,
+    }
+
+
+def run_benchmarks(
+    sizes_mb: Iterable[float] = DEFAULT_SIZES_MB,
+    parsers: Optional[Iterable[str]] = None,
+    repeat: int = 3,
+    memory: bool = True,
+    workdir=None,
+    seed: int = 0,
+    verbose: bool = True,
+) -> list[dict]:
+    """Benchmark every parser on a synthetic corpus of each size.
+
+    Args:
+        sizes_mb: Corpus sizes in MiB
+        parsers: Names from :data:`PARSERS` (default: all)
+        repeat: Timed runs per parser and size
+        memory: Also measure peak memory
+        workdir: Directory for corpus files (default: a temp dir)
+        seed: Corpus generator seed
+        verbose: Print one line per result
+
+    Returns:
+        List of result dicts from :func:`benchmark_parser`
+    """
+    parsers = list(parsers) if parsers is not None else list(PARSERS)
+    unknown = [name for name in parsers if name not in PARSERS]
+    if unknown:
+        raise ValueError(f"Unknown parser(s): {', '.join(unknown)}")
+
+    results = []
+    with tempfile.TemporaryDirectory(dir=workdir) as tmp:
+        for size in sizes_mb:
+            path = write_corpus(Path(tmp) / f"corpus_{size}mb.md", size, seed)
+            text = None
+            if any(PARSERS[name][0] == "text" for name in parsers):
+                text = path.read_text(encoding="utf-8")
+            for name in parsers:
+                result = benchmark_parser(name, path, repeat, memory, text)
+                results.append(result)
+                if verbose:
+                    peak = f"{result['peak_mb']:8.1f} MiB peak" if memory else ""
+                    print(f"  {name:<28} {result['size_mb']:>8.1f} MiB  "
+                          f"{result['mb_per_sec']:8.1f} MB/s  "
+                          f"{result['articles_per_sec']:>10,.0f} articles/s  {peak}")
+            del text
+            path.unlink()
+    return results
+
+
+def compare_results(
+    current: list[dict], baseline: list[dict], tolerance: float = DEFAULT_TOLERANCE
+) -> list[str]:
+    """List regressions of *current* against *baseline* results.
+
+    A regression is throughput lower, or peak memory higher, than the
+    baseline by more than *tolerance* (a fraction) for the same parser and
+    corpus size.  Pairs missing from either side are ignored.
+    """
+    previous = {(r["parser"], r["size_mb"]): r for r in baseline}
+    regressions = []
+    for result in current:
+        old = previous.get((result["parser"], result["size_mb"]))
+        if old is None:
+            continue
+        label = f"{result['parser']} @ {result['size_mb']} MiB"
+        if result["mb_per_sec"] < old["mb_per_sec"] * (1 - tolerance):
+            regressions.append(
+                f"{label}: {result['mb_per_sec']:.1f} MB/s "
+                f"(baseline {old['mb_per_sec']:.1f} MB/s)"
+            )
+        if (result.get("peak_mb") is not None and old.get("peak_mb") is not None
+                and result["peak_mb"] > old["peak_mb"] * (1 + tolerance)):
+            regressions.append(
+                f"{label}: {result['peak_mb']:.1f} MiB peak "
+                f"(baseline {old['peak_mb']:.1f} MiB)"
+            )
+    return regressions
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=float, nargs="+", default=list(DEFAULT_SIZES_MB),
+                        help="corpus sizes in MiB (default: 1 10 100)")
+    parser.add_argument("--parsers", nargs="+", choices=list(PARSERS),
+                        help="parsers to run (default: all)")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case")
+    parser.add_argument("--no-memory", action="store_true", help="skip peak-memory runs")
+    parser.add_argument("--workdir", help="directory for generated corpora")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write results as JSON")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed regression as a fraction (default: 0.2)")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(
+        args.sizes, args.parsers, args.repeat, not args.no_memory, args.workdir, args.seed
+    )
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+        print(f"✓ Wrote {len(results)} results to {args.output}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        regressions = compare_results(results, baseline, args.tolerance)
+        for line in regressions:
+            print(f"✗ Regression: {line}")
+        if regressions:
+            return 1
+        print("✓ No regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+"""
+Passage chunking for long articles.
+
+Some EU AI Act articles (Article 5, the annexes) are far longer than is
+useful for one embedding or one rerank passage.  This module splits article
+bodies into overlapping passages, preferring paragraph and numbered-point
+boundaries, while keeping the article number and character offsets so hits
+can be traced back to their source.
+"""
+
+import re
+from typing import Iterable, Iterator, Optional
+
+DEFAULT_MAX_TOKENS = 256
+DEFAULT_OVERLAP_TOKENS = 32
+
+# Tokens are approximated by whitespace-delimited words.
+_WORD_RE = re.compile(r"\S+")
+# Preferred break points: a blank line, or a line opening a numbered point
+# such as "1.", "(a)" or "(12)".
+_BREAK_RE = re.compile(r"\n[^\S\n]*\n\s*|\n(?=[^\S\n]*(?:\d+\.|\(\w{1,4}\))\s)")
+
+
+def _break_word_indices(text: str, words: list[tuple[int, int]]) -> set[int]:
+    """Indices of words that start a paragraph or numbered point."""
+    starts = {start: i for i, (start, _) in enumerate(words)}
+    breaks = set()
+    for match in _BREAK_RE.finditer(text):
+        pos = match.end()
+        # Skip leading whitespace to land on the first word of the unit.
+        while pos < len(text) and text[pos].isspace():
+            pos += 1
+        if pos in starts:
+            breaks.add(starts[pos])
+    return breaks
+
+
+def chunk_text(
+    text: str,
+    max_tokens: int = DEFAULT_MAX_TOKENS,
+    overlap_tokens: int = DEFAULT_OVERLAP_TOKENS,
+    min_tokens: Optional[int] = None,
+) -> list[tuple[int, int]]:
+    """Split *text* into ``(start, end)`` character spans of bounded size.
+
+    Each span holds at most *max_tokens* words.  A span ends at the last
+    paragraph/numbered-point boundary that keeps it at least *min_tokens*
+    long (default: half of *max_tokens*), falling back to a hard cut.  The
+    next span starts *overlap_tokens* words before the previous end.
+
+    Raises:
+        ValueError: If *overlap_tokens* is not smaller than *max_tokens*
+    """
+    if max_tokens <= 0:
+        raise ValueError("max_tokens must be positive")
+    if not 0 <= overlap_tokens < max_tokens:
+        raise ValueError("overlap_tokens must be >= 0 and smaller than max_tokens")
+    if min_tokens is None:
+        min_tokens = max_tokens // 2
+
+    words = [m.span() for m in _WORD_RE.finditer(text)]
+    if not words:
+        return []
+    if len(words) <= max_tokens:
+        return [(words[0][0], words[-1][1])]
+
+    breaks = _break_word_indices(text, words)
+    spans = []
+    start = 0
+    while start < len(words):
+        end = min(start + max_tokens, len(words))
+        if end < len(words):
+            for candidate in range(end, start + max(min_tokens, 1), -1):
+                if candidate in breaks:
+                    end = candidate
+                    break
+        spans.append((words[start][0], words[end - 1][1]))
+        if end == len(words):
+            break
+        start = max(end - overlap_tokens, start + 1)
+    return spans
+
+
+def chunk_article(
+    article: dict,
+    max_tokens: int = DEFAULT_MAX_TOKENS,
+    overlap_tokens: int = DEFAULT_OVERLAP_TOKENS,
+    min_tokens: Optional[int] = None,
+) -> list[dict]:
+    """Split one parsed article into passage dicts.
+
+    Each passage keeps the article's fields and adds ``parent_id``,
+    ``chunk_index``, ``chunk_count``, ``chunk_start`` and ``chunk_end``
+    (character offsets into the article ``text``).  Passage ids are
+    ``<article id>_chunk_<n>``.
+
+    Args:
+        article: Article dict from :func:`utils.parsing.parse_articles`
+        max_tokens: Approximate token (word) budget per passage
+        overlap_tokens: Words repeated at the start of the next passage
+        min_tokens: Shortest passage allowed when snapping to a boundary
+
+    Returns:
+        List of passage dicts (a single passage for short articles)
+    """
+    text = article["text"]
+    spans = chunk_text(text, max_tokens, overlap_tokens, min_tokens)
+    passages = []
+    for i, (start, end) in enumerate(spans):
+        passages.append({
+            **article,
+            "id": f"{article['id']}_chunk_{i}",
+            "parent_id": article["id"],
+            "text": text[start:end],
+            "chunk_index": i,
+            "chunk_count": len(spans),
+            "chunk_start": start,
+            "chunk_end": end,
+        })
+    return passages
+
+
+def iter_passages(
+    articles: Iterable[dict],
+    max_tokens: int = DEFAULT_MAX_TOKENS,
+    overlap_tokens: int = DEFAULT_OVERLAP_TOKENS,
+    min_tokens: Optional[int] = None,
+) -> Iterator[dict]:
+    """Lazily chunk a stream of articles (e.g. from ``iter_articles``)."""
+    for article in articles:
+        yield from chunk_article(article, max_tokens, overlap_tokens, min_tokens)
@@ -1,13 +1,18 @@
 """
 Ranking comparison utilities for the rerank notebook.
 
-Extracted from Notebook 03 for testability and reuse.
+Extracted from Notebook 03 for testability and reuse.  The ``*_batch``
+and metric helpers compare rankings across a whole query log with
+vectorized pandas/NumPy operations.
 """
 
-import pandas as pd
+from typing import TYPE_CHECKING, Optional
 
+if TYPE_CHECKING:
+    import pandas as pd
 
-def build_comparison(naive_hits: list, reranked_hits: list) -> pd.DataFrame:
+
+def build_comparison(naive_hits: list, reranked_hits: list) -> "pd.DataFrame":
     """
     Build a side-by-side comparison of naive vs reranked search results.
 
@@ -21,6 +26,8 @@ def build_comparison(naive_hits: list, reranked_hits: list) -> pd.DataFrame:
     Raises:
         ValueError: If reranked_hits is empty (nothing to compare)
     """
+    import pandas as pd
+
     if not reranked_hits:
         raise ValueError("reranked_hits must not be empty")
 
@@ -60,3 +67,135 @@ def build_comparison(naive_hits: list, reranked_hits: list) -> pd.DataFrame:
         })
 
     return pd.DataFrame(comparison)
+
+
+def _hits_frame(hits_by_query: dict, rank_column: str, key: str) -> "pd.DataFrame":
+    import pandas as pd
+
+    rows = [
+        (query, rank, hit["_source"][key], hit["_source"].get("title", ""))
+        for query, hits in hits_by_query.items()
+        for rank, hit in enumerate(hits, 1)
+    ]
+    frame = pd.DataFrame(rows, columns=["query", rank_column, "article", "title"])
+    # Passages of one article share its key; keep the article's best rank so
+    # the merge below stays one-to-one.
+    return frame.drop_duplicates(["query", "article"], keep="first")
+
+
+def build_comparison_batch(
+    naive_by_query: dict,
+    reranked_by_query: dict,
+    key: str = "article_number",
+) -> "pd.DataFrame":
+    """
+    Tidy naive-vs-reranked comparison for many queries at once.
+
+    One row per (query, article) found by either ranking.  All derived
+    columns are computed with vectorized pandas operations, so this scales
+    to a whole query log; use :func:`rank_metrics` for per-query scores.
+
+    Args:
+        naive_by_query: ``{query: [ES hit, ...]}`` from naive search
+        reranked_by_query: ``{query: [ES hit, ...]}`` from reranked search
+        key: ``_source`` field identifying a document; hits sharing a key
+            (e.g. passages of one article) count once, at their best rank
+
+    Returns:
+        DataFrame with columns: query, article, title, naive_rank,
+        reranked_rank (nullable ``Int64``), movement (positive = moved up),
+        is_new (only in the reranked list), dropped (only in the naive list)
+    """
+    naive = _hits_frame(naive_by_query, "naive_rank", key)
+    reranked = _hits_frame(reranked_by_query, "reranked_rank", key)
+
+    df = reranked.merge(
+        naive, on=["query", "article"], how="outer", suffixes=("", "_naive")
+    )
+    df["title"] = df["title"].fillna(df.pop("title_naive"))
+    df["naive_rank"] = df["naive_rank"].astype("Int64")
+    df["reranked_rank"] = df["reranked_rank"].astype("Int64")
+    df["movement"] = df["naive_rank"] - df["reranked_rank"]
+    df["is_new"] = df["naive_rank"].isna() & df["reranked_rank"].notna()
+    df["dropped"] = df["reranked_rank"].isna()
+
+    df = df.sort_values(
+        ["query", "reranked_rank", "naive_rank"], na_position="last", kind="stable"
+    ).reset_index(drop=True)
+    return df[["query", "article", "title", "naive_rank", "reranked_rank",
+               "movement", "is_new", "dropped"]]
+
+
+def _dcg(frame: "pd.DataFrame", rank_column: str, k: int) -> "pd.Series":
+    import numpy as np
+
+    ranked = frame[frame[rank_column].notna() & (frame[rank_column] <= k)]
+    discount = np.log2(ranked[rank_column].astype(float) + 1)
+    return (ranked["gain"] / discount).groupby(ranked["query"]).sum()
+
+
+def rank_metrics(
+    comparison: "pd.DataFrame",
+    qrels: Optional[dict] = None,
+    k: int = 10,
+) -> "pd.DataFrame":
+    """
+    Per-query rank-correlation and NDCG metrics for a batch comparison.
+
+    Kendall tau (tau-a) is computed over articles present in both
+    rankings, via a vectorized pairwise self-join.  NDCG@k needs graded
+    judgments; without *qrels* the NDCG columns are ``NaN``.
+
+    Args:
+        comparison: Output of :func:`build_comparison_batch`
+        qrels: Optional ``{query: {article: grade}}`` relevance judgments
+        k: Cutoff for NDCG
+
+    Returns:
+        DataFrame indexed by query with columns: shared, new_entries,
+        kendall_tau, ndcg_naive, ndcg_reranked, ndcg_delta
+    """
+    import numpy as np
+    import pandas as pd
+
+    queries = pd.Index(comparison["query"].unique(), name="query")
+    result = pd.DataFrame(index=queries)
+    result["shared"] = (
+        comparison["naive_rank"].notna() & comparison["reranked_rank"].notna()
+    ).groupby(comparison["query"]).sum()
+    result["new_entries"] = comparison.groupby("query")["is_new"].sum()
+
+    shared = comparison.loc[
+        comparison["naive_rank"].notna() & comparison["reranked_rank"].notna(),
+        ["query", "naive_rank", "reranked_rank"],
+    ].astype({"naive_rank": "int64", "reranked_rank": "int64"})
+    pairs = shared.merge(shared, on="query", suffixes=("_a", "_b"))
+    pairs = pairs[pairs["reranked_rank_a"] < pairs["reranked_rank_b"]]
+    concordance = np.sign(pairs["naive_rank_b"] - pairs["naive_rank_a"])
+    result["kendall_tau"] = concordance.groupby(pairs["query"]).mean()
+
+    if qrels:
+        judged = pd.DataFrame(
+            [(q, str(a), float(g)) for q, grades in qrels.items() for a, g in grades.items()],
+            columns=["query", "article", "gain"],
+        )
+        scored = comparison.assign(article=comparison["article"].astype(str)).merge(
+            judged, on=["query", "article"], how="left"
+        )
+        scored["gain"] = scored["gain"].fillna(0.0)
+
+        ideal = judged[judged["gain"] > 0].sort_values(["query", "gain"], ascending=[True, False])
+        ideal = ideal.assign(ideal_rank=ideal.groupby("query").cumcount() + 1)
+        idcg = _dcg(ideal, "ideal_rank", k)
+
+        result["ndcg_naive"] = (_dcg(scored, "naive_rank", k) / idcg).reindex(queries)
+        result["ndcg_reranked"] = (_dcg(scored, "reranked_rank", k) / idcg).reindex(queries)
+        has_judgments = queries.isin(idcg.index)
+        result.loc[has_judgments, ["ndcg_naive", "ndcg_reranked"]] = (
+            result.loc[has_judgments, ["ndcg_naive", "ndcg_reranked"]].fillna(0.0)
+        )
+    else:
+        result["ndcg_naive"] = np.nan
+        result["ndcg_reranked"] = np.nan
+    result["ndcg_delta"] = result["ndcg_reranked"] - result["ndcg_naive"]
+    return result
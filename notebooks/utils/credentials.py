@@ -11,14 +11,21 @@ Credential resolution order:
 
 Also generates a unique USER_SUFFIX for index naming to avoid collisions
 when multiple users run against the same Elastic cluster.
+
+Env files are parsed once per process and only re-read when their mtimes
+change; ``dotenv`` and ``elasticsearch`` are imported lazily so worker
+processes that only need names or cached config start quickly.
 """
 
 import os
 import getpass
 import random
 import string
+import threading
+import weakref
+from functools import lru_cache
 from pathlib import Path
-from dotenv import load_dotenv
+from typing import NamedTuple, Optional
 
 _PROJECT_ROOT = Path(__file__).parent.parent.parent
 
@@ -57,6 +64,138 @@ def _get_user_suffix() -> str:
     return _generate_suffix()
 
 
+@lru_cache(maxsize=1)
+def _default_user_suffix() -> str:
+    """USER_SUFFIX fallback, computed once so every name in a process agrees."""
+    return _get_user_suffix()
+
+
+# (path, mtime) of the env files as last loaded into os.environ, and the
+# values that load put there (undone before a reload).
+_env_signature_loaded = None
+_env_applied: dict[str, str] = {}
+_env_lock = threading.Lock()
+
+
+def _env_signature() -> tuple:
+    signature = []
+    for path in (UI_ENV_FILE, ENV_FILE):
+        try:
+            signature.append((str(path), os.stat(path).st_mtime_ns))
+        except OSError:
+            signature.append((str(path), None))
+    return tuple(signature)
+
+
+def _load_env_files() -> tuple:
+    """Load ui/.env.local and .env into os.environ unless already loaded.
+
+    Files are only re-parsed when a path or mtime changed since the last
+    load.  A reload first removes the values the previous load set (unless
+    something else changed them since), so edited or deleted entries do
+    not linger in os.environ.  Returns the current env-file signature.
+    """
+    global _env_signature_loaded, _env_applied
+    signature = _env_signature()
+    with _env_lock:
+        if signature == _env_signature_loaded:
+            return signature
+
+        from dotenv import dotenv_values
+
+        for key, value in _env_applied.items():
+            if os.environ.get(key) == value:
+                del os.environ[key]
+        applied = {}
+
+        # ui/.env.local is primary, .env is override
+        if UI_ENV_FILE.exists():
+            for key, value in dotenv_values(UI_ENV_FILE).items():
+                if value is not None and key not in os.environ:
+                    os.environ[key] = applied[key] = value
+            print(f"✓ Loaded credentials from ui/.env.local (primary)")
+
+        if ENV_FILE.exists():
+            for key, value in dotenv_values(ENV_FILE).items():
+                if value is not None:
+                    os.environ[key] = applied[key] = value
+            print(f"✓ Applied overrides from {ENV_FILE.name}")
+
+        _env_applied = applied
+        _env_signature_loaded = signature
+    return signature
+
+
+class ResolvedConfig(NamedTuple):
+    """Non-interactive snapshot of the credentials and naming settings."""
+
+    elastic_url: Optional[str]
+    elastic_cloud_id: Optional[str]
+    elastic_api_key: Optional[str]
+    jina_api_key: Optional[str]
+    user_suffix: str
+    env_signature: tuple
+
+    def credentials(self) -> dict:
+        """Same keys as get_credentials() (only those that are set)."""
+        values = {
+            "ELASTIC_URL": self.elastic_url,
+            "ELASTIC_CLOUD_ID": self.elastic_cloud_id,
+            "ELASTIC_API_KEY": self.elastic_api_key,
+            "JINA_API_KEY": self.jina_api_key,
+            "USER_SUFFIX": self.user_suffix,
+        }
+        return {key: value for key, value in values.items() if value}
+
+
+_resolved: Optional[ResolvedConfig] = None
+
+
+def resolve_config() -> ResolvedConfig:
+    """
+    Resolve credentials once per process, without prompting.
+
+    The result is cached and only recomputed when an env file's mtime
+    changes (or after clear_config_cache()), so hot paths in worker
+    processes never re-parse env files.  Missing values are ``None``;
+    use get_credentials() for the interactive flow.
+
+    Returns:
+        ResolvedConfig
+    """
+    global _resolved
+    signature = _env_signature()
+    resolved = _resolved
+    if resolved is not None and resolved.env_signature == signature:
+        return resolved
+
+    _load_env_files()
+    elastic_url = os.getenv("ELASTIC_URL")
+    cloud_id = os.getenv("ELASTIC_CLOUD_ID")
+    if not elastic_url and not cloud_id:
+        elastic_url = os.getenv("ELASTICSEARCH_URL")
+
+    resolved = ResolvedConfig(
+        elastic_url=elastic_url,
+        elastic_cloud_id=cloud_id,
+        elastic_api_key=os.getenv("ELASTIC_API_KEY"),
+        jina_api_key=os.getenv("JINA_API_KEY"),
+        user_suffix=os.getenv("USER_SUFFIX") or _default_user_suffix(),
+        env_signature=signature,
+    )
+    _resolved = resolved
+    return resolved
+
+
+def clear_config_cache() -> None:
+    """Force the next resolve_config()/get_credentials() to re-read env files."""
+    global _resolved, _env_signature_loaded
+    with _env_lock:
+        _resolved = None
+        _env_signature_loaded = None
+    _default_user_suffix.cache_clear()
+
+
 def get_credentials(
     require_elastic: bool = True,
     require_jina: bool = True,
@@ -82,13 +221,7 @@ def get_credentials(
         dict with keys: ELASTIC_URL or ELASTIC_CLOUD_ID, ELASTIC_API_KEY, JINA_API_KEY, USER_SUFFIX
     """
     # --- Load credentials (ui/.env.local is primary, .env is override) ---
-    if UI_ENV_FILE.exists():
-        load_dotenv(UI_ENV_FILE, override=False)
-        print(f"✓ Loaded credentials from ui/.env.local (primary)")
-
-    if ENV_FILE.exists():
-        load_dotenv(ENV_FILE, override=True)
-        print(f"✓ Applied overrides from {ENV_FILE.name}")
+    _load_env_files()
 
     # Bridge key-name difference: UI uses ELASTICSEARCH_URL, notebooks use ELASTIC_URL
     if not os.getenv("ELASTIC_URL") and not os.getenv("ELASTIC_CLOUD_ID"):
@@ -143,7 +276,7 @@ def get_credentials(
     # --- User Suffix for unique index names ---
     user_suffix = os.getenv("USER_SUFFIX")
     if not user_suffix:
-        user_suffix = _get_user_suffix()
+        user_suffix = _default_user_suffix()
         needs_save = True
     credentials["USER_SUFFIX"] = user_suffix
     
@@ -203,7 +336,7 @@ def get_index_name(base_name: str = "search-eu-ai-act") -> str:
     Returns:
         Index name with user suffix appended
     """
-    suffix = os.getenv("USER_SUFFIX") or _get_user_suffix()
+    suffix = os.getenv("USER_SUFFIX") or _default_user_suffix()
     return f"{base_name}-{suffix}"
 
 
@@ -219,7 +352,7 @@ def get_inference_id(model_type: str) -> str:
     
     Example: "embeddings" -> ".jina-embeddings-v5-text-small"
     """
-    suffix = os.getenv("USER_SUFFIX") or _get_user_suffix()
+    suffix = os.getenv("USER_SUFFIX") or _default_user_suffix()
     
     if model_type == "embeddings":
         return ".jina-embeddings-v5-text-small"
@@ -232,6 +365,9 @@ def get_inference_id(model_type: str) -> str:
 def get_elasticsearch_client(credentials: dict):
     """
     Create an Elasticsearch client from credentials.
+
+    Uses default transport settings; see create_elasticsearch_client() for
+    a tuned, shared (or async) client.
     
     Handles both:
     - Elastic Cloud (uses cloud_id parameter)
@@ -263,6 +399,115 @@ def get_elasticsearch_client(credentials: dict):
         raise ValueError("No ELASTIC_URL or ELASTIC_CLOUD_ID found in credentials")
 
 
+DEFAULT_RETRY_ON_STATUS = (429, 502, 503, 504)
+
+# One client (and so one connection pool) per credentials + options.  Async
+# clients live per event loop and disappear with it; one created outside a
+# running loop would bind to whichever loop uses it first, so it is never
+# shared.
+_clients: dict = {}
+_async_clients: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_clients_lock = threading.Lock()
+
+
+def _client_cache(async_client: bool) -> Optional[dict]:
+    if not async_client:
+        return _clients
+    import asyncio
+
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+    return _async_clients.setdefault(loop, {})
+
+
+def create_elasticsearch_client(
+    credentials: dict,
+    async_client: bool = False,
+    connections_per_node: int = 10,
+    keep_alive: bool = True,
+    http_compress: bool = True,
+    request_timeout: float = 30.0,
+    max_retries: int = 3,
+    retry_on_status: tuple = DEFAULT_RETRY_ON_STATUS,
+    retry_on_timeout: bool = True,
+    shared: bool = True,
+):
+    """
+    Create (or reuse) a tuned ``Elasticsearch`` / ``AsyncElasticsearch`` client.
+
+    With *shared* (the default) one client is cached per credentials and
+    options, so every helper in the process reuses the same connection
+    pool instead of paying TCP/TLS setup per client.  Async clients are
+    additionally cached per running event loop, since their HTTP session
+    is bound to the loop that first uses it; an async client created with
+    no running loop is never shared.
+
+    Args:
+        credentials: Dict from get_credentials() containing ELASTIC_URL or ELASTIC_CLOUD_ID
+        async_client: Return an ``AsyncElasticsearch`` (needs ``aiohttp``,
+            e.g. ``pip install elasticsearch[async]``)
+        connections_per_node: Connection pool size per node
+        keep_alive: Reuse connections between requests (``False`` sends
+            ``Connection: close``)
+        http_compress: gzip request bodies (large bulk and search payloads)
+        request_timeout: Per-request timeout in seconds
+        max_retries: Retries for connection errors and *retry_on_status*
+        retry_on_status: HTTP statuses that are retried
+        retry_on_timeout: Also retry requests that timed out
+        shared: Reuse a cached client for identical arguments
+
+    Returns:
+        Elasticsearch or AsyncElasticsearch client instance
+    """
+    if "ELASTIC_URL" in credentials:
+        endpoint = {"hosts": [credentials["ELASTIC_URL"]]}
+    elif "ELASTIC_CLOUD_ID" in credentials:
+        endpoint = {"cloud_id": credentials["ELASTIC_CLOUD_ID"]}
+    else:
+        raise ValueError("No ELASTIC_URL or ELASTIC_CLOUD_ID found in credentials")
+
+    options = {
+        "api_key": credentials.get("ELASTIC_API_KEY"),
+        "connections_per_node": connections_per_node,
+        "http_compress": http_compress,
+        "request_timeout": request_timeout,
+        "max_retries": max_retries,
+        "retry_on_status": tuple(retry_on_status),
+        "retry_on_timeout": retry_on_timeout,
+    }
+    if not keep_alive:
+        options["headers"] = {"connection": "close"}
+
+    key = (async_client, repr(sorted(endpoint.items())), repr(sorted(options.items())))
+    cache = None
+    if shared:
+        with _clients_lock:
+            cache = _client_cache(async_client)
+            client = cache.get(key) if cache is not None else None
+        if client is not None:
+            return client
+
+    if async_client:
+        from elasticsearch import AsyncElasticsearch as client_class
+    else:
+        from elasticsearch import Elasticsearch as client_class
+    client = client_class(**endpoint, **options)
+
+    if cache is not None:
+        with _clients_lock:
+            client = cache.setdefault(key, client)
+    return client
+
+
+def clear_client_cache() -> None:
+    """Forget cached clients (callers own closing them)."""
+    with _clients_lock:
+        _clients.clear()
+        _async_clients.clear()
+
+
 # Convenience function for quick setup
 def setup_notebook(require_elastic: bool = True, require_jina: bool = True) -> dict:
     """
@@ -0,0 +1,248 @@
+"""
+Offline relevance evaluation against judged queries (qrels).
+
+Runs several retrieval systems (e.g. the naive semantic ``match`` and
+reranked search at different ``rank_window_size`` values) over a judged
+query set with bounded concurrency, then reports recall@k, MRR and NDCG@k
+alongside per-query latency percentiles, so rerank depth and chunking
+settings can be chosen from data rather than one demo query.
+"""
+
+import json
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterable, Union
+
+from .rerank import default_retriever
+
+DEFAULT_K_VALUES = (5, 10)
+LATENCY_PERCENTILES = (50, 90, 99)
+
+SearchFn = Callable[[str], list]
+
+
+def load_qrels(path: Union[str, Path]) -> dict[str, dict[str, float]]:
+    """Load judgments as ``{query_id: {doc_id: grade}}``.
+
+    Accepts TREC qrels (``query_id iteration doc_id grade`` per line) or a
+    JSON object of the same nested shape.
+    """
+    path = Path(path)
+    if path.suffix == ".json":
+        with open(path) as f:
+            return {
+                str(q): {str(d): float(g) for d, g in docs.items()}
+                for q, docs in json.load(f).items()
+            }
+
+    qrels: dict[str, dict[str, float]] = {}
+    with open(path) as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip() or line.startswith("#"):
+                continue
+            parts = line.split()
+            if len(parts) != 4:
+                raise ValueError(f"{path}:{line_no}: expected 4 columns, got {len(parts)}")
+            query_id, _, doc_id, grade = parts
+            qrels.setdefault(query_id, {})[doc_id] = float(grade)
+    return qrels
+
+
+def load_queries(path: Union[str, Path]) -> dict[str, str]:
+    """Load ``{query_id: text}`` from a TSV (``id<TAB>text``) or JSONL file.
+
+    JSONL lines need ``id`` (or ``query_id``) and ``text`` (or ``query``).
+    """
+    path = Path(path)
+    queries = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            if path.suffix == ".jsonl":
+                record = json.loads(line)
+                query_id = record.get("id", record.get("query_id"))
+                queries[str(query_id)] = record.get("text", record.get("query"))
+            else:
+                query_id, text = line.rstrip("\n").split("\t", 1)
+                queries[query_id] = text
+    return queries
+
+
+def recall_at_k(ranked: list, relevant: dict, k: int) -> float:
+    """Fraction of relevant (grade > 0) documents in the top *k*."""
+    positives = {doc for doc, grade in relevant.items() if grade > 0}
+    if not positives:
+        return math.nan
+    return len(positives.intersection(ranked[:k])) / len(positives)
+
+
+def reciprocal_rank(ranked: list, relevant: dict) -> float:
+    """1 / rank of the first relevant document (0 if none is retrieved).
+
+    NaN when the query has no relevant (grade > 0) judgments, like
+    :func:`recall_at_k` and :func:`ndcg_at_k`, so such queries drop out of
+    the mean instead of counting as misses.
+    """
+    if not any(grade > 0 for grade in relevant.values()):
+        return math.nan
+    for rank, doc in enumerate(ranked, 1):
+        if relevant.get(doc, 0) > 0:
+            return 1.0 / rank
+    return 0.0
+
+
+def ndcg_at_k(ranked: list, relevant: dict, k: int) -> float:
+    """NDCG@k with linear gains and a ``log2(rank + 1)`` discount."""
+    import numpy as np
+
+    ideal = sorted((g for g in relevant.values() if g > 0), reverse=True)[:k]
+    if not ideal:
+        return math.nan
+    discounts = np.log2(np.arange(2, k + 2))
+    gains = np.array([relevant.get(doc, 0.0) for doc in ranked[:k]], dtype=float)
+    dcg = float((gains / discounts[:len(gains)]).sum())
+    idcg = float((np.array(ideal) / discounts[:len(ideal)]).sum())
+    return dcg / idcg
+
+
+def naive_search(
+    es_client, index_name: str, size: int = 10, field: str = "text"
+) -> SearchFn:
+    """First-stage search as in the notebook: a ``match`` on *field*.
+
+    The default ``text`` field is ``semantic_text``, so this baseline is a
+    semantic query rather than BM25.
+    """
+    def search(query: str) -> list:
+        resp = es_client.search(
+            index=index_name, query={"match": {field: query}}, size=size, _source=False
+        )
+        return [hit["_id"] for hit in resp["hits"]["hits"]]
+    return search
+
+
+def reranked_search(
+    es_client,
+    index_name: str,
+    inference_id: str,
+    rank_window_size: int = 50,
+    size: int = 10,
+    field: str = "text",
+) -> SearchFn:
+    """``text_similarity_reranker`` over the naive first stage."""
+    def search(query: str) -> list:
+        resp = es_client.search(
+            index=index_name,
+            retriever={
+                "text_similarity_reranker": {
+                    "retriever": default_retriever(query, field),
+                    "inference_id": inference_id,
+                    "inference_text": query,
+                    "field": field,
+                    "rank_window_size": rank_window_size,
+                }
+            },
+            size=size,
+            _source=False,
+        )
+        return [hit["_id"] for hit in resp["hits"]["hits"]]
+    return search
+
+
+def _run_query(system: str, search: SearchFn, query_id: str, text: str) -> dict:
+    start = time.perf_counter()
+    try:
+        ranked, error = list(search(text)), None
+    except Exception as e:
+        ranked, error = [], f"{type(e).__name__}: {e}"
+    return {
+        "system": system,
+        "query_id": query_id,
+        "ranked": ranked,
+        "latency_ms": (time.perf_counter() - start) * 1000,
+        "error": error,
+    }
+
+
+def evaluate(
+    systems: dict[str, SearchFn],
+    queries: dict[str, str],
+    qrels: dict[str, dict[str, float]],
+    k_values: Iterable[int] = DEFAULT_K_VALUES,
+    max_workers: int = 4,
+    verbose: bool = True,
+) -> dict:
+    """Run every system on every judged query and score the results.
+
+    Queries without judgments are skipped.  All (system, query) requests
+    share one thread pool, so *max_workers* bounds the load on the cluster.
+    A failing request is recorded in the ``error`` column and scored as an
+    empty ranking.
+
+    Args:
+        systems: ``{name: search(query_text) -> ranked doc ids}``, e.g. from
+            :func:`naive_search` and :func:`reranked_search`
+        queries: ``{query_id: text}``
+        qrels: ``{query_id: {doc_id: grade}}``
+        k_values: Cutoffs for recall@k and NDCG@k
+        max_workers: Concurrent search requests
+        verbose: Print the summary table
+
+    Returns:
+        dict with keys: per_query (one row per system and query) and
+        summary (one row per system: mean metrics, latency percentiles,
+        error count)
+    """
+    import pandas as pd
+
+    k_values = sorted(set(k_values))
+    judged = [q for q in queries if q in qrels]
+    jobs = [(name, fn, q, queries[q]) for name, fn in systems.items() for q in judged]
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        runs = list(pool.map(lambda job: _run_query(*job), jobs))
+
+    rows = []
+    for run in runs:
+        relevant = qrels[run["query_id"]]
+        row = {k: v for k, v in run.items() if k != "ranked"}
+        row["mrr"] = reciprocal_rank(run["ranked"], relevant)
+        for k in k_values:
+            row[f"recall@{k}"] = recall_at_k(run["ranked"], relevant, k)
+            row[f"ndcg@{k}"] = ndcg_at_k(run["ranked"], relevant, k)
+        rows.append(row)
+
+    metric_columns = ["mrr"] + [f"{m}@{k}" for k in k_values for m in ("recall", "ndcg")]
+    per_query = pd.DataFrame(
+        rows, columns=["system", "query_id", "latency_ms", "error"] + metric_columns
+    )
+
+    grouped = per_query.groupby("system", sort=False)
+    summary = grouped[metric_columns].mean()
+    for p in LATENCY_PERCENTILES:
+        summary[f"latency_p{p}_ms"] = grouped["latency_ms"].quantile(p / 100)
+    summary["queries"] = grouped.size()
+    summary["errors"] = grouped["error"].count()
+
+    if verbose:
+        print(f"✓ Evaluated {len(systems)} systems on {len(judged)} judged queries")
+        print(summary.round(3).to_string())
+    return {"per_query": per_query, "summary": summary}
+
+
+def write_report(report: dict, directory: Union[str, Path]) -> Path:
+    """Write ``summary.csv``, ``per_query.csv`` and ``summary.json``."""
+    import numpy as np
+
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    report["summary"].to_csv(directory / "summary.csv")
+    report["per_query"].to_csv(directory / "per_query.csv", index=False)
+    summary = report["summary"].astype(float).replace({np.nan: None})
+    with open(directory / "summary.json", "w") as f:
+        json.dump(summary.to_dict(orient="index"), f, indent=2)
+    print(f"✓ Wrote evaluation report to {directory}")
+    return directory
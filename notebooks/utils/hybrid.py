@@ -0,0 +1,218 @@
+"""
+Hybrid lexical + semantic retrieval with reciprocal rank fusion (RRF).
+
+Runs BM25 and ``semantic_text`` retrieval side by side and fuses them with
+RRF: server-side through the ``rrf`` retriever when the cluster supports it
+(licence and version permitting), otherwise with a client-side merge of two
+concurrent searches.  An optional rerank step only scores the fused top-k,
+so recall improves without widening the expensive rerank window.
+"""
+
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, Optional, Sequence
+
+from .rerank import rerank_candidates
+
+DEFAULT_RANK_CONSTANT = 60
+DEFAULT_RANK_WINDOW = 50
+# ``text`` is mapped as ``semantic_text`` in the notebooks, where ``match``
+# runs a semantic query; only plain ``text`` fields give BM25 scores.
+DEFAULT_LEXICAL_FIELDS = ("title",)
+
+# Statuses meaning "this cluster cannot run the rrf retriever" (unknown
+# retriever on older versions, non-compliant licence); the error reason
+# tells these apart from ordinary query errors.
+_RRF_UNSUPPORTED_STATUSES = {400, 403}
+_server_rrf_unsupported: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+
+
+def _error_reasons(body) -> Iterator[str]:
+    """``type: reason`` of an ES error body and all its root/caused-by errors."""
+    error = body.get("error") if isinstance(body, dict) else None
+    stack = [error] if error else []
+    while stack:
+        error = stack.pop()
+        if isinstance(error, str):
+            yield error
+            continue
+        yield f"{error.get('type', '')}: {error.get('reason', '')}"
+        stack.extend(error.get("root_cause") or [])
+        if error.get("caused_by"):
+            stack.append(error["caused_by"])
+
+
+def _rrf_unsupported(error) -> bool:
+    """Whether an ``ApiError`` rejects the ``rrf`` retriever itself."""
+    if error.meta.status not in _RRF_UNSUPPORTED_STATUSES:
+        return False
+    for reason in _error_reasons(error.body):
+        reason = reason.lower()
+        if "non-compliant" in reason and (
+            "rrf" in reason or "reciprocal rank fusion" in reason
+        ):
+            return True
+        if "unknown" in reason and ("[rrf]" in reason or "[retriever]" in reason):
+            return True
+    return False
+
+
+def lexical_retriever(query: str, fields: Sequence[str] = DEFAULT_LEXICAL_FIELDS) -> dict:
+    """BM25 ``multi_match`` over plain text *fields*."""
+    return {"standard": {"query": {"multi_match": {"query": query, "fields": list(fields)}}}}
+
+
+def semantic_retriever(query: str, field: str = "text") -> dict:
+    """``semantic`` query on a ``semantic_text`` field."""
+    return {"standard": {"query": {"semantic": {"field": field, "query": query}}}}
+
+
+def _with_filter(retriever: dict, filter_query: Optional[dict]) -> dict:
+    if filter_query is None:
+        return retriever
+    return {"standard": {**retriever["standard"], "filter": filter_query}}
+
+
+def rrf_fuse(
+    rankings: Iterable[list[dict]],
+    rank_constant: int = DEFAULT_RANK_CONSTANT,
+    size: Optional[int] = None,
+) -> list[dict]:
+    """Reciprocal rank fusion of several ranked hit lists.
+
+    Each document scores ``sum(1 / (rank_constant + rank))`` over the lists
+    it appears in (keyed by ``_id``).  Returned hits are copies of the first
+    occurrence with ``_rrf_score`` added, best first; ties keep first-seen
+    order.
+    """
+    scores: dict[str, float] = {}
+    first_hit: dict[str, dict] = {}
+    for ranking in rankings:
+        for rank, hit in enumerate(ranking, 1):
+            doc_id = hit["_id"]
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (rank_constant + rank)
+            first_hit.setdefault(doc_id, hit)
+
+    order = sorted(scores, key=scores.__getitem__, reverse=True)
+    if size is not None:
+        order = order[:size]
+    return [{**first_hit[doc_id], "_rrf_score": scores[doc_id]} for doc_id in order]
+
+
+def _server_search(
+    es_client, index_name, retrievers, size, rank_window_size, rank_constant,
+    rerank_id, rerank_window, semantic_field, query, source,
+) -> list[dict]:
+    retriever = {
+        "rrf": {
+            "retrievers": retrievers,
+            "rank_window_size": rank_window_size,
+            "rank_constant": rank_constant,
+        }
+    }
+    if rerank_id:
+        retriever = {
+            "text_similarity_reranker": {
+                "retriever": retriever,
+                "inference_id": rerank_id,
+                "inference_text": query,
+                "field": semantic_field,
+                "rank_window_size": rerank_window,
+            }
+        }
+    resp = es_client.search(index=index_name, retriever=retriever, size=size, _source=source)
+    return list(resp["hits"]["hits"])
+
+
+def _client_search(
+    es_client, index_name, retrievers, size, rank_window_size, rank_constant,
+    rerank_id, rerank_window, semantic_field, query, source,
+) -> list[dict]:
+    def run(retriever):
+        resp = es_client.search(
+            index=index_name, retriever=retriever, size=rank_window_size, _source=source
+        )
+        return list(resp["hits"]["hits"])
+
+    with ThreadPoolExecutor(max_workers=len(retrievers)) as pool:
+        rankings = list(pool.map(run, retrievers))
+
+    if not rerank_id:
+        return rrf_fuse(rankings, rank_constant, size)
+    fused = rrf_fuse(rankings, rank_constant, rerank_window)
+    return rerank_candidates(
+        es_client, query, fused, rerank_id, window=rerank_window, size=size,
+        field=semantic_field,
+    )
+
+
+def hybrid_search(
+    es_client,
+    index_name: str,
+    query: str,
+    size: int = 10,
+    lexical_fields: Sequence[str] = DEFAULT_LEXICAL_FIELDS,
+    semantic_field: str = "text",
+    rank_window_size: int = DEFAULT_RANK_WINDOW,
+    rank_constant: int = DEFAULT_RANK_CONSTANT,
+    filter_query: Optional[dict] = None,
+    rerank_id: Optional[str] = None,
+    rerank_window: int = 20,
+    mode: str = "auto",
+) -> list[dict]:
+    """BM25 + semantic retrieval fused with RRF, optionally reranked.
+
+    Args:
+        es_client: Elasticsearch client
+        index_name: Index to search
+        query: Query text
+        size: Number of hits to return
+        lexical_fields: Plain ``text`` fields for BM25
+        semantic_field: ``semantic_text`` field (also the rerank passage)
+        rank_window_size: Hits taken from each retriever before fusion
+        rank_constant: RRF ``k``; larger values flatten rank differences
+        filter_query: Optional filter applied to both retrievers (e.g.
+            ``{"term": {"language": "en"}}``)
+        rerank_id: Rerank endpoint; when set only the fused top
+            *rerank_window* hits are reranked
+        rerank_window: Fused hits sent to the reranker
+        mode: ``"server"`` (``rrf`` retriever), ``"client"`` (two
+            concurrent searches merged locally) or ``"auto"`` (server,
+            falling back to client if the cluster does not support
+            ``rrf`` (unknown retriever or licence); the fallback is
+            remembered per client, other errors are raised)
+
+    Returns:
+        List of ES hit dicts, best first.  Client-side results carry
+        ``_rrf_score`` (and ``_rerank_score`` when reranked).
+    """
+    if mode not in ("auto", "server", "client"):
+        raise ValueError(f"mode must be 'auto', 'server' or 'client', got {mode!r}")
+    from elasticsearch import ApiError
+
+    retrievers = [
+        _with_filter(lexical_retriever(query, lexical_fields), filter_query),
+        _with_filter(semantic_retriever(query, semantic_field), filter_query),
+    ]
+    args = (
+        es_client, index_name, retrievers, size, rank_window_size, rank_constant,
+        rerank_id, rerank_window, semantic_field, query, True,
+    )
+
+    with _lock:
+        server_unsupported = _server_rrf_unsupported.get(es_client, False)
+    if mode == "client" or (mode == "auto" and server_unsupported):
+        return _client_search(*args)
+
+    try:
+        return _server_search(*args)
+    except ApiError as e:
+        if mode == "server" or not _rrf_unsupported(e):
+            raise
+        with _lock:
+            _server_rrf_unsupported[es_client] = True
+        print(f"✗ Server-side rrf unavailable ({e.meta.status}); "
+              f"using client-side fusion")
+        return _client_search(*args)
@@ -0,0 +1,339 @@
+"""
+Bulk indexing utilities for the EU AI Act ingestion pipeline.
+
+Extracted from Notebook 01 (the inline ``helpers.bulk`` call) and extended
+with byte-bounded batching, worker threads, 429 retries and adaptive batch
+sizing.  ``semantic_text`` ingestion is bound by inference latency inside
+Elasticsearch, so batch size is the main throughput lever.
+"""
+
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Collection, Iterable, Iterator, Optional
+
+DEFAULT_CHUNK_SIZE = 500
+DEFAULT_MAX_CHUNK_BYTES = 10 * 1024 * 1024
+
+
+class _BatchSizer:
+    """Decides how many documents go into the next bulk request.
+
+    With a *target_seconds* it tracks observed bulk latency and steers the
+    batch size towards requests that take about that long (halfway per
+    observation, clamped to ``[min_size, max_size]``).  Without one the
+    size stays fixed.
+    """
+
+    def __init__(
+        self,
+        initial: int,
+        min_size: int = 10,
+        max_size: int = 5000,
+        target_seconds: Optional[float] = None,
+    ):
+        self._lock = threading.Lock()
+        self._size = initial
+        self.min_size = min_size
+        self.max_size = max_size
+        self.target_seconds = target_seconds
+
+    @property
+    def size(self) -> int:
+        with self._lock:
+            return self._size
+
+    def observe(self, docs: int, seconds: float) -> None:
+        if self.target_seconds is None or docs <= 0 or seconds <= 0:
+            return
+        ideal = docs * self.target_seconds / seconds
+        with self._lock:
+            damped = (self._size + ideal) / 2
+            self._size = int(min(self.max_size, max(self.min_size, damped)))
+
+
+def _iter_batches(
+    actions: Iterable, sizer: _BatchSizer, max_chunk_bytes: int
+) -> Iterator[list[tuple]]:
+    """Group actions into batches bounded by document count and bytes.
+
+    Each entry is ``(action_line, source_or_None, nbytes)``.
+    """
+    from elasticsearch.helpers import expand_action
+
+    batch, batch_bytes = [], 0
+    for action in actions:
+        meta, data = expand_action(action)
+        nbytes = len(json.dumps(meta, ensure_ascii=False).encode("utf-8")) + 1
+        if data is not None:
+            nbytes += len(json.dumps(data, ensure_ascii=False).encode("utf-8")) + 1
+
+        if batch and (len(batch) >= sizer.size or batch_bytes + nbytes > max_chunk_bytes):
+            yield batch
+            batch, batch_bytes = [], 0
+        batch.append((meta, data, nbytes))
+        batch_bytes += nbytes
+    if batch:
+        yield batch
+
+
+def _operations(batch: list[tuple]) -> list[dict]:
+    ops = []
+    for meta, data, _ in batch:
+        ops.append(meta)
+        if data is not None:
+            ops.append(data)
+    return ops
+
+
+def _backoff(attempt: int, initial_backoff: float, max_backoff: float) -> float:
+    return random.uniform(0, min(max_backoff, initial_backoff * 2 ** attempt))
+
+
+def _send_batch(
+    es_client,
+    batch: list[tuple],
+    max_retries: int,
+    initial_backoff: float,
+    max_backoff: float,
+    ignore_status: Collection[int],
+) -> dict:
+    """Send one batch, retrying 429-rejected items (or requests) with backoff."""
+    from elasticsearch import ApiError
+
+    pending = batch
+    indexed, errors, retried = 0, [], 0
+    elapsed = 0.0
+
+    for attempt in range(max_retries + 1):
+        last_attempt = attempt == max_retries
+        start = time.perf_counter()
+        try:
+            resp = es_client.bulk(operations=_operations(pending))
+        except ApiError as e:
+            elapsed += time.perf_counter() - start
+            if e.meta.status != 429 or last_attempt:
+                raise
+            retried += len(pending)
+            time.sleep(_backoff(attempt, initial_backoff, max_backoff))
+            continue
+        elapsed += time.perf_counter() - start
+
+        rejected = []
+        for entry, item in zip(pending, resp["items"]):
+            result = next(iter(item.values()))
+            status = result.get("status", 500)
+            if 200 <= status < 300 or status in ignore_status:
+                indexed += 1
+            elif status == 429 and not last_attempt:
+                rejected.append(entry)
+            else:
+                errors.append(item)
+
+        if not rejected:
+            break
+        retried += len(rejected)
+        pending = rejected
+        time.sleep(_backoff(attempt, initial_backoff, max_backoff))
+
+    return {
+        "docs": len(batch),
+        "bytes": sum(entry[2] for entry in batch),
+        "indexed": indexed,
+        "errors": errors,
+        "retried": retried,
+        "seconds": elapsed,
+    }
+
+
+def bulk_index(
+    es_client,
+    actions: Iterable,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_chunk_bytes: int = DEFAULT_MAX_CHUNK_BYTES,
+    thread_count: int = 1,
+    max_retries: int = 3,
+    initial_backoff: float = 2.0,
+    max_backoff: float = 60.0,
+    target_batch_seconds: Optional[float] = None,
+    min_chunk_size: int = 10,
+    max_chunk_size: int = 5000,
+    ignore_status: Collection[int] = (),
+    on_batch: Optional[Callable[[dict], None]] = None,
+    verbose: bool = True,
+) -> dict:
+    """Bulk-index *actions* with tunable batching, threads and 429 retries.
+
+    Accepts the same action dicts as ``elasticsearch.helpers.bulk``.
+    ``thread_count=1`` behaves like ``streaming_bulk``; higher values send
+    batches concurrently like ``parallel_bulk`` (with at most two batches
+    queued per thread).
+
+    Args:
+        es_client: Elasticsearch client
+        actions: Iterable of bulk action dicts
+        chunk_size: Documents per bulk request (initial size when adaptive)
+        max_chunk_bytes: Upper bound on serialized bytes per request
+        thread_count: Number of concurrent bulk requests
+        max_retries: Retries for 429-rejected items or requests
+        initial_backoff: First backoff ceiling in seconds (doubles per retry)
+        max_backoff: Upper bound for any single backoff, in seconds
+        target_batch_seconds: Enable adaptive sizing, steering each bulk
+            request (and so each EIS embedding round) towards this latency
+        min_chunk_size: Lower bound for adaptive sizing
+        max_chunk_size: Upper bound for adaptive sizing
+        ignore_status: Item statuses to count as success (e.g. ``(404,)``
+            for deletes of documents that are already gone)
+        on_batch: Callback receiving each batch's stats dict
+        verbose: Print per-batch throughput
+
+    Returns:
+        dict with keys: indexed, errors, retried, batches, seconds, docs_per_sec
+    """
+    sizer = _BatchSizer(chunk_size, min_chunk_size, max_chunk_size, target_batch_seconds)
+    summary = {"indexed": 0, "errors": [], "retried": 0, "batches": 0}
+    lock = threading.Lock()
+    started = time.perf_counter()
+
+    def _run(batch):
+        stats = _send_batch(
+            es_client, batch, max_retries, initial_backoff, max_backoff, ignore_status
+        )
+        sizer.observe(stats["docs"], stats["seconds"])
+        stats["docs_per_sec"] = stats["docs"] / stats["seconds"] if stats["seconds"] else 0.0
+        stats["next_chunk_size"] = sizer.size
+        with lock:
+            summary["batches"] += 1
+            summary["indexed"] += stats["indexed"]
+            summary["errors"].extend(stats["errors"])
+            summary["retried"] += stats["retried"]
+            stats["batch"] = summary["batches"]
+        if verbose:
+            print(
+                f"  batch {stats['batch']}: {stats['docs']} docs, "
+                f"{stats['bytes'] / 1024:,.0f} KiB in {stats['seconds']:.2f}s "
+                f"({stats['docs_per_sec']:,.0f} docs/s)"
+            )
+        if on_batch:
+            on_batch(stats)
+
+    batches = _iter_batches(actions, sizer, max_chunk_bytes)
+    if thread_count <= 1:
+        for batch in batches:
+            _run(batch)
+    else:
+        slots = threading.Semaphore(thread_count * 2)
+        with ThreadPoolExecutor(max_workers=thread_count) as pool:
+            futures = []
+            for batch in batches:
+                slots.acquire()
+                future = pool.submit(_run, batch)
+                future.add_done_callback(lambda _: slots.release())
+                futures.append(future)
+            for future in futures:
+                future.result()
+
+    summary["seconds"] = time.perf_counter() - started
+    summary["docs_per_sec"] = (
+        summary["indexed"] / summary["seconds"] if summary["seconds"] else 0.0
+    )
+    if verbose:
+        print(
+            f"✓ Indexed {summary['indexed']} documents in {summary['batches']} batches "
+            f"({len(summary['errors'])} errors, {summary['docs_per_sec']:,.0f} docs/s)"
+        )
+    return summary
+
+
+def iter_index_readiness(
+    es_client,
+    index_name: str,
+    expected_count: int,
+    semantic_field: str = "text",
+    timeout: float = 120.0,
+    initial_delay: float = 0.25,
+    max_delay: float = 10.0,
+) -> Iterator[dict]:
+    """Poll until *expected_count* documents are searchable with embeddings.
+
+    Each round refreshes the index, then counts all documents and those
+    whose *semantic_field* has inference results (``exists`` query).  The
+    wait between rounds starts at *initial_delay* and doubles up to
+    *max_delay*, so small corpora return almost immediately and large ones
+    are not hammered.
+
+    Args:
+        es_client: Elasticsearch client
+        index_name: Index to watch
+        expected_count: Number of documents that should be searchable
+        semantic_field: ``semantic_text`` field that must be populated
+        timeout: Seconds before giving up
+        initial_delay: First wait between rounds, in seconds
+        max_delay: Upper bound for the wait between rounds, in seconds
+
+    Yields:
+        Progress dicts with keys: attempt, count, embedded, expected,
+        elapsed, ready (the last one yielded has ``ready=True``)
+
+    Raises:
+        TimeoutError: If the index is not ready within *timeout* seconds
+    """
+    started = time.monotonic()
+    delay = initial_delay
+    attempt = 0
+
+    while True:
+        attempt += 1
+        es_client.indices.refresh(index=index_name)
+        count = es_client.count(index=index_name)["count"]
+        embedded = es_client.count(
+            index=index_name, query={"exists": {"field": semantic_field}}
+        )["count"]
+        elapsed = time.monotonic() - started
+        ready = count >= expected_count and embedded >= expected_count
+
+        yield {
+            "attempt": attempt,
+            "count": count,
+            "embedded": embedded,
+            "expected": expected_count,
+            "elapsed": elapsed,
+            "ready": ready,
+        }
+        if ready:
+            return
+
+        if elapsed + delay > timeout:
+            raise TimeoutError(
+                f"Index '{index_name}' not ready after {elapsed:.1f}s: "
+                f"{embedded}/{expected_count} documents embedded"
+            )
+        time.sleep(delay)
+        delay = min(delay * 2, max_delay)
+
+
+def wait_for_index_ready(
+    es_client,
+    index_name: str,
+    expected_count: int,
+    verbose: bool = True,
+    **options,
+) -> dict:
+    """Block until the index is ready; replaces a fixed ``time.sleep``.
+
+    Thin wrapper around :func:`iter_index_readiness` (which takes the same
+    keyword *options*).
+
+    Returns:
+        The final progress dict
+    """
+    progress = {}
+    for progress in iter_index_readiness(es_client, index_name, expected_count, **options):
+        if verbose and not progress["ready"]:
+            print(f"  waiting: {progress['embedded']}/{expected_count} embedded "
+                  f"({progress['elapsed']:.1f}s)")
+    if verbose:
+        print(f"✓ {progress['count']} documents searchable in {progress['elapsed']:.1f}s")
+    return progress
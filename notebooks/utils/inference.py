@@ -1,25 +1,135 @@
 """
 Inference endpoint management for Elastic Inference Service (EIS).
 
-Provides idempotent creation of Jina embedding and reranker endpoints.
+Provides idempotent creation of Jina embedding and reranker endpoints, a
+batching, memoizing wrapper around ``es.inference.inference`` for text
+embeddings, and an asyncio coalescer that merges concurrent embedding or
+rerank calls into batched requests.  Endpoint lookups go through a
+TTL-cached registry of ``inference.get(inference_id="_all")``.
 """
 
-from elasticsearch import BadRequestError
+import asyncio
+import hashlib
+import inspect
+import os
+import re
+import tempfile
+import threading
+import time
+import unicodedata
+import weakref
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Optional, Union
 
+if TYPE_CHECKING:
+    import numpy as np
+    from elasticsearch import BadRequestError
 
-def verify_embedding_endpoint(es_client, inference_id: str) -> bool:
+DEFAULT_EMBEDDING_ID = ".jina-embeddings-v5-text-small"
+DEFAULT_EMBEDDING_CACHE_DIR = Path.home() / ".cache" / "innocenti-risk" / "embeddings"
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+class EndpointRegistry:
+    """Cached view of every inference endpoint on the cluster.
+
+    Loads ``inference.get(inference_id="_all")`` once, indexes it by id and
+    task type, and reloads after *ttl* seconds, so helpers that need to
+    know whether an endpoint exists share a single round trip.
+
+    Args:
+        es_client: Elasticsearch client
+        ttl: Seconds before the listing is reloaded
+    """
+
+    def __init__(self, es_client, ttl: float = 300.0):
+        self.es_client = es_client
+        self.ttl = ttl
+        self._by_id: dict[str, dict] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def refresh(self) -> None:
+        """Reload the endpoint listing now (raises on API errors)."""
+        resp = self.es_client.inference.get(inference_id="_all")
+        by_id = {ep["inference_id"]: dict(ep) for ep in resp["endpoints"]}
+        with self._lock:
+            self._by_id = by_id
+            self._loaded_at = time.monotonic()
+
+    def _ensure_fresh(self) -> None:
+        with self._lock:
+            fresh = (self._loaded_at is not None
+                     and time.monotonic() - self._loaded_at < self.ttl)
+        if not fresh:
+            self.refresh()
+
+    def get(self, inference_id: str) -> Optional[dict]:
+        """Endpoint config for *inference_id*, or ``None`` if it does not exist."""
+        self._ensure_fresh()
+        with self._lock:
+            return self._by_id.get(inference_id)
+
+    def by_task_type(self, task_type: str) -> list[dict]:
+        """Every endpoint of *task_type* (e.g. ``"rerank"``), sorted by id."""
+        self._ensure_fresh()
+        with self._lock:
+            return sorted(
+                (ep for ep in self._by_id.values() if ep.get("task_type") == task_type),
+                key=lambda ep: ep["inference_id"],
+            )
+
+    def add(self, endpoint: dict) -> None:
+        """Record an endpoint created by this process without reloading."""
+        with self._lock:
+            self._by_id[endpoint["inference_id"]] = dict(endpoint)
+
+    def invalidate(self) -> None:
+        """Force a reload on next access."""
+        with self._lock:
+            self._loaded_at = None
+
+
+_registries: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_registries_lock = threading.Lock()
+
+
+def endpoint_registry(es_client, ttl: float = 300.0) -> EndpointRegistry:
+    """Shared :class:`EndpointRegistry` for *es_client* (one per client)."""
+    with _registries_lock:
+        registry = _registries.get(es_client)
+        if registry is None:
+            registry = _registries[es_client] = EndpointRegistry(es_client, ttl)
+        return registry
+
+
+def verify_embedding_endpoint(
+    es_client, inference_id: str, registry: Optional[EndpointRegistry] = None
+) -> bool:
     """Verify the built-in Jina Embeddings v5 endpoint exists on Serverless.
 
     ``.jina-embeddings-v5-text-small`` is pre-configured — no creation needed.
+    Consults the shared endpoint registry first; falls back to a direct
+    lookup if the ``_all`` listing cannot be loaded.
     Returns ``True`` if available, ``False`` otherwise.
     """
+    registry = registry or endpoint_registry(es_client)
     try:
-        es_client.inference.get(inference_id=inference_id)
-        print(f"\u2713 Built-in embedding endpoint available: {inference_id}")
-        return True
+        found = registry.get(inference_id) is not None
     except Exception:
+        try:
+            es_client.inference.get(inference_id=inference_id)
+            found = True
+        except Exception:
+            found = False
+
+    if found:
+        print(f"\u2713 Built-in embedding endpoint available: {inference_id}")
+    else:
         print(f"\u2717 Built-in embedding endpoint not found: {inference_id}")
-        return False
+    return found
 
 
 def create_embedding_inference(es_client, inference_id: str) -> bool:
@@ -27,34 +137,395 @@ def create_embedding_inference(es_client, inference_id: str) -> bool:
     return verify_embedding_endpoint(es_client, inference_id)
 
 
-def create_reranker_inference(es_client, inference_id: str) -> bool:
+def create_reranker_inference(
+    es_client, inference_id: str, registry: Optional[EndpointRegistry] = None
+) -> bool:
     """Create a Jina Reranker v2 inference endpoint.
 
-    Returns ``True`` if created, ``False`` if it already existed.
+    Returns ``True`` if created, ``False`` if it already existed (known
+    from the shared endpoint registry, without a ``put``).
     Re-raises ``BadRequestError`` for any reason other than
     *resource_already_exists*.
     """
+    registry = registry or endpoint_registry(es_client)
+    try:
+        existing = registry.get(inference_id)
+    except Exception:
+        existing = None
+    if existing is not None:
+        print(f"\u2713 Reranker endpoint already exists: {inference_id}")
+        return False
+
+    inference_config = {
+        "service": "jinaai",
+        "service_settings": {
+            "model_id": "jina-reranker-v2-base-multilingual"
+        },
+    }
+    from elasticsearch import BadRequestError
+
     try:
         es_client.inference.put(
             inference_id=inference_id,
             task_type="rerank",
-            inference_config={
-                "service": "jinaai",
-                "service_settings": {
-                    "model_id": "jina-reranker-v2-base-multilingual"
-                },
-            },
+            inference_config=inference_config,
         )
+        registry.add({"inference_id": inference_id, "task_type": "rerank", **inference_config})
         print(f"\u2713 Created reranker endpoint: {inference_id}")
         return True
 
     except BadRequestError as e:
         if _is_already_exists(e):
+            # Created by another process since the registry was loaded.
+            registry.invalidate()
             print(f"\u2713 Reranker endpoint already exists: {inference_id}")
             return False
         raise
 
 
-def _is_already_exists(err: BadRequestError) -> bool:
+def _is_already_exists(err: "BadRequestError") -> bool:
     msg = str(err).lower()
     return "resource_already_exists_exception" in msg or "already exists" in msg
+
+
+def normalize_text(text: str) -> str:
+    """Cache-key form of an input: NFC-normalized, whitespace collapsed."""
+    return _WHITESPACE_RE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+class EmbeddingCache:
+    """In-process LRU of embeddings with an optional on-disk store.
+
+    Entries are keyed by ``(inference_id, normalize_text(text))``.  Vectors
+    are held as NumPy arrays of *dtype* (``float16`` halves memory and disk
+    at a small precision cost); on disk each one is a ``<sha256>.npy``
+    file, written atomically, so several processes can share a directory.
+
+    Args:
+        max_entries: LRU capacity (in-process)
+        directory: On-disk store; ``None`` keeps the cache in memory only.
+            ``True`` uses ``$EIS_EMBEDDING_CACHE_DIR`` or
+            ``~/.cache/innocenti-risk/embeddings``
+        dtype: ``"float32"`` or ``"float16"``
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        directory: Union[str, os.PathLike, bool, None] = None,
+        dtype: str = "float32",
+    ):
+        import numpy as np
+
+        if np.dtype(dtype) not in (np.float16, np.float32):
+            raise ValueError("dtype must be float16 or float32")
+        if directory is True:
+            directory = os.environ.get("EIS_EMBEDDING_CACHE_DIR", DEFAULT_EMBEDDING_CACHE_DIR)
+        self.directory = Path(directory) if directory else None
+        if self.directory:
+            self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.dtype = np.dtype(dtype)
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, "np.ndarray"] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(inference_id: str, text: str) -> str:
+        digest = hashlib.sha256(inference_id.encode("utf-8"))
+        digest.update(b"\x1f")
+        digest.update(normalize_text(text).encode("utf-8"))
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.npy"
+
+    def _remember(self, key: str, vector: "np.ndarray") -> None:
+        with self._lock:
+            self._entries[key] = vector
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, inference_id: str, text: str) -> Optional["np.ndarray"]:
+        """Return the cached vector, or ``None`` on a miss."""
+        key = self.key(inference_id, text)
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return vector
+        if self.directory:
+            import numpy as np
+
+            try:
+                vector = np.load(self._path(key), allow_pickle=False)
+            except (OSError, ValueError):
+                vector = None
+            if vector is not None:
+                self._remember(key, vector)
+                with self._lock:
+                    self.hits += 1
+                return vector
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, inference_id: str, text: str, vector) -> "np.ndarray":
+        """Store *vector* (any float sequence); returns the stored array."""
+        import numpy as np
+
+        key = self.key(inference_id, text)
+        vector = np.asarray(vector, dtype=self.dtype)
+        self._remember(key, vector)
+        if self.directory:
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    np.save(f, vector, allow_pickle=False)
+                os.replace(tmp, self._path(key))
+            except BaseException:
+                os.unlink(tmp)
+                raise
+        return vector
+
+    def clear(self) -> None:
+        """Drop every entry, in memory and on disk."""
+        with self._lock:
+            self._entries.clear()
+        if self.directory:
+            for path in self.directory.glob("*.npy"):
+                path.unlink(missing_ok=True)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def embed_texts(
+    es_client,
+    texts: Iterable[str],
+    inference_id: str = DEFAULT_EMBEDDING_ID,
+    cache: Optional[EmbeddingCache] = None,
+    batch_size: int = 32,
+) -> "np.ndarray":
+    """Embed *texts* with a ``text_embedding`` endpoint, batching and memoizing.
+
+    Cache hits skip the request entirely.  Misses are de-duplicated (by
+    normalized text) and sent as ``input`` lists of up to *batch_size*.
+
+    Args:
+        es_client: Elasticsearch client
+        texts: Strings to embed
+        inference_id: Dense embedding endpoint
+        cache: Optional :class:`EmbeddingCache`
+        batch_size: Inputs per inference request
+
+    Returns:
+        ``float32`` array of shape ``(len(texts), dims)``, in input order
+
+    Raises:
+        ValueError: If the endpoint does not return dense embeddings
+    """
+    import numpy as np
+
+    texts = list(texts)
+    if not texts:
+        return np.empty((0, 0), dtype=np.float32)
+
+    vectors: list[Optional["np.ndarray"]] = [None] * len(texts)
+    pending: dict[str, list[int]] = {}
+    for i, text in enumerate(texts):
+        cached = cache.get(inference_id, text) if cache is not None else None
+        if cached is not None:
+            vectors[i] = cached
+        else:
+            pending.setdefault(normalize_text(text), []).append(i)
+
+    misses = list(pending)
+    for start in range(0, len(misses), batch_size):
+        batch = misses[start:start + batch_size]
+        result = es_client.inference.inference(
+            inference_id=inference_id,
+            body={"input": batch},
+        )
+        if "text_embedding" not in result:
+            raise ValueError(f"{inference_id} did not return dense text embeddings")
+        for text, item in zip(batch, result["text_embedding"]):
+            vector = np.asarray(item["embedding"], dtype=np.float32)
+            if cache is not None:
+                vector = cache.put(inference_id, text, vector)
+            for i in pending[text]:
+                vectors[i] = vector
+
+    return np.vstack(vectors).astype(np.float32, copy=False)
+
+
+def _is_async_client(es_client) -> bool:
+    from elasticsearch import AsyncElasticsearch
+
+    return isinstance(es_client, AsyncElasticsearch)
+
+
+def _batch_size(batch: list) -> int:
+    return sum(len(inputs) for inputs, _ in batch)
+
+
+class InferenceCoalescer:
+    """Merge concurrent embedding/rerank calls into batched EIS requests.
+
+    Callers ``await embed(text)`` or ``await rerank(query, documents)``
+    one at a time; requests arriving within *max_wait_ms* of the first
+    pending one are sent as a single ``input`` list and the results are
+    fanned back out.  A batch is sent early once it holds *max_batch_size*
+    inputs, and no request to EIS carries more than that: a pending batch
+    is sent before a request that would overflow it joins, and a single
+    oversized request is split.  Rerank requests are only merged when they share a query, since
+    one rerank call scores documents against one query.
+
+    Works with both ``Elasticsearch`` (calls run in a worker thread) and
+    ``AsyncElasticsearch`` clients.
+
+    Args:
+        es_client: Elasticsearch or AsyncElasticsearch client
+        inference_id: Endpoint used by :meth:`embed`
+        rerank_id: Endpoint used by :meth:`rerank`
+        max_batch_size: Most inputs sent in one request
+        max_wait_ms: Longest a request waits for others to join its batch
+        max_in_flight: Concurrent requests to EIS
+        cache: Optional :class:`EmbeddingCache` consulted by :meth:`embed`
+    """
+
+    def __init__(
+        self,
+        es_client,
+        inference_id: str = DEFAULT_EMBEDDING_ID,
+        rerank_id: Optional[str] = None,
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+        max_in_flight: int = 4,
+        cache: Optional[EmbeddingCache] = None,
+    ):
+        self.es_client = es_client
+        self.inference_id = inference_id
+        self.rerank_id = rerank_id
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.cache = cache
+        self.requests = 0
+        self.batches = 0
+        self._in_flight = asyncio.Semaphore(max_in_flight)
+        self._pending: dict[tuple, list] = {}
+        self._timers: dict[tuple, asyncio.TimerHandle] = {}
+        self._tasks: set = set()
+
+    async def embed(self, text: str) -> "np.ndarray":
+        """Dense embedding of *text* (``float32`` unless served from cache)."""
+        if self.cache is not None:
+            cached = self.cache.get(self.inference_id, text)
+            if cached is not None:
+                return cached
+        (vector,) = await self._submit(("text_embedding", None), [normalize_text(text)])
+        if self.cache is not None:
+            vector = self.cache.put(self.inference_id, text, vector)
+        return vector
+
+    async def embed_many(self, texts: Iterable[str]) -> list["np.ndarray"]:
+        return list(await asyncio.gather(*(self.embed(t) for t in texts)))
+
+    async def rerank(self, query: str, documents: list[str]) -> list[float]:
+        """Relevance scores for *documents* against *query*, in input order."""
+        if self.rerank_id is None:
+            raise ValueError("InferenceCoalescer was created without a rerank_id")
+        if not documents:
+            return []
+        return await self._submit(("rerank", query), list(documents))
+
+    async def flush(self) -> None:
+        """Send every pending batch now and wait for all requests to finish."""
+        for group in list(self._pending):
+            self._flush_group(group)
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _submit(self, group: tuple, inputs: list) -> list:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        pending = self._pending.get(group)
+        if pending and _batch_size(pending) + len(inputs) > self.max_batch_size:
+            self._flush_group(group)
+        batch = self._pending.setdefault(group, [])
+        batch.append((inputs, future))
+        self.requests += 1
+
+        if _batch_size(batch) >= self.max_batch_size:
+            self._flush_group(group)
+        elif group not in self._timers:
+            self._timers[group] = loop.call_later(self.max_wait, self._flush_group, group)
+        return await future
+
+    def _flush_group(self, group: tuple) -> None:
+        timer = self._timers.pop(group, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._pending.pop(group, None)
+        if batch:
+            task = asyncio.ensure_future(self._send(group, batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, group: tuple, batch: list) -> None:
+        inputs = [item for entry in batch for item in entry[0]]
+        size = self.max_batch_size
+        try:
+            chunks = await asyncio.gather(*(
+                self._send_chunk(group, inputs[start:start + size])
+                for start in range(0, len(inputs), size)
+            ))
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        results = [result for chunk in chunks for result in chunk]
+        offset = 0
+        for items, future in batch:
+            if not future.done():
+                future.set_result(results[offset:offset + len(items)])
+            offset += len(items)
+
+    async def _send_chunk(self, group: tuple, inputs: list) -> list:
+        async with self._in_flight:
+            self.batches += 1
+            return await self._call(group, inputs)
+
+    async def _call(self, group: tuple, inputs: list) -> list:
+        task_type, query = group
+        if task_type == "rerank":
+            inference_id, body = self.rerank_id, {"query": query, "input": inputs}
+        else:
+            inference_id, body = self.inference_id, {"input": inputs}
+
+        method = self.es_client.inference.inference
+        # The client's API methods are plain functions returning a coroutine
+        # (``_rewrite_parameters``), so check the client class, not the method.
+        if inspect.iscoroutinefunction(method) or _is_async_client(self.es_client):
+            result = method(inference_id=inference_id, body=body)
+        else:
+            result = await asyncio.to_thread(method, inference_id=inference_id, body=body)
+        if inspect.isawaitable(result):
+            result = await result
+
+        if task_type == "rerank":
+            scores = [0.0] * len(inputs)
+            for item in result["rerank"]:
+                scores[item["index"]] = item["relevance_score"]
+            return scores
+        if "text_embedding" not in result:
+            raise ValueError(f"{inference_id} did not return dense text embeddings")
+        import numpy as np
+
+        return [np.asarray(item["embedding"], dtype=np.float32)
+                for item in result["text_embedding"]]
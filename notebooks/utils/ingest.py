@@ -0,0 +1,175 @@
+"""
+Multi-language ingestion driver for the EU AI Act corpus.
+
+Fetches and parses every language edition in its own worker process and
+streams the parsed articles into one shared bulk indexer, so wall-clock
+time tracks the slowest language instead of the sum of all of them.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Iterable, Iterator, Optional
+
+from .indexing import bulk_index
+from .parsing import _EUR_LEX_URLS, parse_articles, parse_articles_file
+from .reader import fetch_with_jina_reader
+
+JINA_READER_PREFIX = "https://r.jina.ai/"
+
+
+def resolve_sources(
+    languages: Optional[Iterable[str]] = None,
+    overrides: Optional[dict[str, str]] = None,
+) -> dict[str, str]:
+    """Language -> EUR-Lex URL (or local markdown path) for this run.
+
+    *overrides* replace or add sources; when *languages* is ``None`` the
+    run covers the overrides, or every EUR-Lex language if there are none.
+    """
+    overrides = dict(overrides or {})
+    if languages is None:
+        languages = list(overrides) or list(_EUR_LEX_URLS)
+    languages = list(dict.fromkeys(languages))
+    unknown = [lang for lang in languages if lang not in overrides and lang not in _EUR_LEX_URLS]
+    if unknown:
+        raise ValueError(f"No EUR-Lex source for language(s): {', '.join(unknown)}")
+    return {lang: overrides.get(lang, _EUR_LEX_URLS.get(lang)) for lang in languages}
+
+
+def fetch_language(source: str, api_key: Optional[str] = None) -> str:
+    """Markdown of one language edition.
+
+    *source* is either a local markdown dump or a URL to fetch through
+    Jina Reader.
+    """
+    if os.path.exists(source):
+        with open(source, encoding="utf-8") as f:
+            return f.read()
+
+    if not api_key:
+        raise ValueError(f"JINA_API_KEY is required to fetch {source}")
+    if not source.startswith(JINA_READER_PREFIX):
+        source = JINA_READER_PREFIX + source
+    return fetch_with_jina_reader(source, api_key)
+
+
+def _load_language(language: str, source: str, api_key: Optional[str]) -> list[dict]:
+    """Worker: fetch (or read) one language edition and parse it.
+
+    Runs in a child process, so it must stay module-level.  Local dumps go
+    through the mmap-backed file parser rather than a decoded string.
+    """
+    if os.path.exists(source):
+        return parse_articles_file(source, language=language)
+    return parse_language(language, fetch_language(source, api_key))
+
+
+def parse_language(language: str, markdown_text: str) -> list[dict]:
+    """Worker: parse one already-fetched language edition."""
+    return parse_articles(markdown_text, language=language)
+
+
+def map_languages(
+    worker: Callable[..., list[dict]],
+    jobs: dict[str, tuple],
+    max_workers: Optional[int] = None,
+) -> Iterator[tuple[str, list[dict]]]:
+    """Run ``worker(language, *args)`` per language in a process pool.
+
+    Yields ``(language, articles)`` in completion order and re-raises the
+    first worker failure.  *worker* must be a module-level function.
+    """
+    if not jobs:
+        return
+    workers = max_workers or len(jobs)
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+        futures = {
+            pool.submit(worker, language, *args): language
+            for language, args in jobs.items()
+        }
+        for future in as_completed(futures):
+            articles = future.result()
+            print(f"✓ Parsed {len(articles)} articles [{futures[future]}]")
+            yield futures[future], articles
+
+
+def iter_language_articles(
+    sources: dict[str, str],
+    api_key: Optional[str] = None,
+    max_workers: Optional[int] = None,
+) -> Iterator[dict]:
+    """Parse several language editions in parallel, yielding articles.
+
+    One worker process handles each language document.  Articles are
+    yielded language by language in completion order, so consumers can
+    start indexing as soon as the fastest language finishes.
+
+    Args:
+        sources: Mapping of language code to a EUR-Lex URL or local
+            markdown path
+        api_key: Jina API key (only needed for URL sources)
+        max_workers: Process pool size (default: one per language)
+
+    Yields:
+        Article dicts as produced by :func:`utils.parsing.parse_articles`
+
+    Raises:
+        Exception: Re-raises the first worker failure
+    """
+    jobs = {language: (source, api_key) for language, source in sources.items()}
+    for _, articles in map_languages(_load_language, jobs, max_workers):
+        yield from articles
+
+
+def ingest_languages(
+    es_client,
+    index_name: str,
+    api_key: Optional[str] = None,
+    languages: Optional[Iterable[str]] = None,
+    sources: Optional[dict[str, str]] = None,
+    max_workers: Optional[int] = None,
+    **bulk_options,
+) -> dict:
+    """Fetch, parse and bulk-index several language editions at once.
+
+    Parsing fans out across a process pool (see
+    :func:`iter_language_articles`); every worker feeds the same
+    :func:`utils.indexing.bulk_index` indexer in the parent process.
+
+    Args:
+        es_client: Elasticsearch client
+        index_name: Target index
+        api_key: Jina API key (only needed for URL sources)
+        languages: Language codes to ingest (default: every key of
+            ``_EUR_LEX_URLS``).  Ignored when *sources* is given.
+        sources: Explicit language -> URL/path mapping
+        max_workers: Process pool size (default: one per language)
+        **bulk_options: Passed to :func:`utils.indexing.bulk_index`
+            (``chunk_size``, ``thread_count``, ``target_batch_seconds``, ...)
+
+    Returns:
+        dict with keys: indexed, errors, per_language
+    """
+    if sources is None:
+        sources = resolve_sources(languages)
+
+    per_language: dict[str, int] = {}
+
+    def actions():
+        for doc in iter_language_articles(sources, api_key, max_workers):
+            per_language[doc["language"]] = per_language.get(doc["language"], 0) + 1
+            yield {"_index": index_name, "_id": doc["id"], "_source": doc}
+
+    result = bulk_index(es_client, actions(), **bulk_options)
+
+    for item in result["errors"]:
+        language = next(iter(item.values()))["_id"].split("_", 1)[0]
+        per_language[language] -= 1
+
+    print(f"✓ Indexed {result['indexed']} articles across {len(per_language)} languages "
+          f"({len(result['errors'])} errors)")
+    return {
+        "indexed": result["indexed"],
+        "errors": result["errors"],
+        "per_language": per_language,
+    }
@@ -4,21 +4,466 @@ Article parsing utilities for the EU AI Act ingestion pipeline.
 Extracted from Notebook 01 for testability and reuse.
 """
 
+import mmap
+import os
 import re
+from typing import Iterable, Iterator, NamedTuple, Optional, TextIO, Union
 
+_CELEX = "32024R1689"
 
 _EUR_LEX_URLS = {
-    "en": "https://eur-lex.europa.eu/legal-content/EN/TXT/?uri=CELEX:32024R1689",
-    "de": "https://eur-lex.europa.eu/legal-content/DE/TXT/?uri=CELEX:32024R1689",
+    lang: f"https://eur-lex.europa.eu/legal-content/{lang.upper()}/TXT/?uri=CELEX:{_CELEX}"
+    for lang in (
+        "en", "de", "bg", "cs", "da", "el", "es", "et", "fi", "fr", "ga", "hr",
+        "hu", "it", "lt", "lv", "mt", "nl", "pl", "pt", "ro", "sk", "sl", "sv",
+    )
 }
 
+# Heading templates per official EU language, as they appear in the EUR-Lex
+# editions: ``{n}`` is an arabic number, ``{r}`` a roman numeral.  Some
+# languages put the number first (Finnish "1 artikla", Hungarian "1. cikk").
+_HEADINGS = {
+    "bg": {"article": "Член {n}", "chapter": "ГЛАВА {r}", "annex": "ПРИЛОЖЕНИЕ {r}"},
+    "cs": {"article": "Článek {n}", "chapter": "KAPITOLA {r}", "annex": "PŘÍLOHA {r}"},
+    "da": {"article": "Artikel {n}", "chapter": "KAPITEL {r}", "annex": "BILAG {r}"},
+    "de": {"article": "Artikel {n}", "chapter": "KAPITEL {r}", "annex": "ANHANG {r}"},
+    "el": {"article": "Άρθρο {n}", "chapter": "ΚΕΦΑΛΑΙΟ {r}", "annex": "ΠΑΡΑΡΤΗΜΑ {r}"},
+    "en": {"article": "Article {n}", "chapter": "CHAPTER {r}", "annex": "ANNEX {r}"},
+    "es": {"article": "Artículo {n}", "chapter": "CAPÍTULO {r}", "annex": "ANEXO {r}"},
+    "et": {"article": "Artikkel {n}", "chapter": "{r} PEATÜKK", "annex": "{r} LISA"},
+    "fi": {"article": "{n} artikla", "chapter": "{r} LUKU", "annex": "LIITE {r}"},
+    "fr": {"article": "Article {n}", "chapter": "CHAPITRE {r}", "annex": "ANNEXE {r}"},
+    "ga": {"article": "Airteagal {n}", "chapter": "CAIBIDIL {r}", "annex": "IARSCRÍBHINN {r}"},
+    "hr": {"article": "Članak {n}", "chapter": "POGLAVLJE {r}", "annex": "PRILOG {r}"},
+    "hu": {"article": "{n}. cikk", "chapter": "{r}. FEJEZET", "annex": "{r}. MELLÉKLET"},
+    "it": {"article": "Articolo {n}", "chapter": "CAPO {r}", "annex": "ALLEGATO {r}"},
+    "lt": {"article": "{n} straipsnis", "chapter": "{r} SKYRIUS", "annex": "{r} PRIEDAS"},
+    "lv": {"article": "{n}. pants", "chapter": "{r} NODAĻA", "annex": "{r} PIELIKUMS"},
+    "mt": {"article": "Artikolu {n}", "chapter": "KAPITOLU {r}", "annex": "ANNESS {r}"},
+    "nl": {"article": "Artikel {n}", "chapter": "HOOFDSTUK {r}", "annex": "BIJLAGE {r}"},
+    "pl": {"article": "Artykuł {n}", "chapter": "ROZDZIAŁ {r}", "annex": "ZAŁĄCZNIK {r}"},
+    "pt": {"article": "Artigo {n}", "chapter": "CAPÍTULO {r}", "annex": "ANEXO {r}"},
+    "ro": {"article": "Articolul {n}", "chapter": "CAPITOLUL {r}", "annex": "ANEXA {r}"},
+    "sk": {"article": "Článok {n}", "chapter": "KAPITOLA {r}", "annex": "PRÍLOHA {r}"},
+    "sl": {"article": "Člen {n}", "chapter": "POGLAVJE {r}", "annex": "PRILOGA {r}"},
+    "sv": {"article": "Artikel {n}", "chapter": "KAPITEL {r}", "annex": "BILAGA {r}"},
+}
+
+# Section kinds emitted by ``iter_sections`` by default.  Chapters only
+# delimit articles; their "body" is the chapter title.
+SECTION_KINDS = ("article", "annex", "recital")
+
+_URL_ANCHORS = {"article": "Art{}", "annex": "anx_{}", "recital": "rct_{}", "chapter": "cpt_{}"}
+
+_NUMBER_PATTERNS = {"{n}": r"\d+", "{r}": r"[IVXLC]+"}
+
+_BLANK_RUN_RE = re.compile(r'\n{3,}')
+# Any heading is "hashes, then at most two tokens"; a verification window
+# that still looks like that may be cut short and needs more bytes.
+_PARTIAL_HEADING_RE = re.compile(r'(?:#+ )?\S*\s*\S*\Z')
+
+_DEFAULT_BLOCK_SIZE = 1 << 20
+# Preamble kept between blocks so a heading split across two reads is
+# still recognised before the first article has been seen.
+_HEADER_LOOKBACK = 256
+_VERIFY_WINDOW = 64
+
+
+class _Grammar(NamedTuple):
+    """Compiled heading grammar for one language."""
+
+    boundary: re.Pattern
+    headers: dict
+    candidates: re.Pattern
+    article_template: str
+
+
+def _heading_regex(template: str, num_group: bool) -> str:
+    """Regex for a heading template.
+
+    The result must stay *prefix-stable* (a match on a prefix of the text is
+    still a match on the whole text) so incremental scanners can trust a
+    match before the rest of the document has arrived.  Headings ending in
+    a word or roman numeral therefore require a following whitespace.
+    """
+    placeholder = "{n}" if "{n}" in template else "{r}"
+    before, after = template.split(placeholder)
+    number = _NUMBER_PATTERNS[placeholder]
+    if num_group:
+        number = f"(?P<num>{number})"
+    regex = (re.escape(before.strip()) + r"\s+" if before else "") + number
+    if after:
+        if after.startswith("."):
+            regex += r"\."
+        regex += r"\s+" + re.escape(after.strip(". ")) + r"(?=\s)"
+    elif placeholder == "{r}":
+        regex += r"(?=\s)"
+    return regex
+
+
+def _compile_grammar(language: str) -> _Grammar:
+    spec = _HEADINGS[language]
+    # Every edition also accepts the English article heading, which Jina
+    # Reader keeps for some documents; the native form is tried first.
+    templates = {
+        "article": list(dict.fromkeys([spec["article"], _HEADINGS["en"]["article"]])),
+        "chapter": [spec["chapter"]],
+        "annex": [spec["annex"]],
+    }
+
+    alternatives = [
+        f"(?P<{kind}>" + "|".join(_heading_regex(t, False) for t in group) + ")"
+        for kind, group in templates.items()
+    ]
+    alternatives.append(r"(?P<recital>\(\d+\)\s)")
+    boundary = re.compile(r"(?=^(?:#+ )?(?:" + "|".join(alternatives) + "))", re.MULTILINE)
+
+    headers = {
+        kind: [
+            re.compile(r"^(?:#+ )?" + _heading_regex(t, True) + r"\s*\n+([^\n]+)?", re.MULTILINE)
+            for t in group
+        ]
+        for kind, group in templates.items()
+    }
+    headers["recital"] = [re.compile(r"^(?:#+ )?\((?P<num>\d+)\)()", re.MULTILINE)]
+
+    starts = {rb"\(\d"}
+    for group in templates.values():
+        for template in group:
+            if template.startswith("{n}"):
+                starts.add(rb"\d")
+            elif template.startswith("{r}"):
+                starts.add(rb"[IVXLC]")
+            else:
+                starts.add(re.escape(template.split()[0].encode("utf-8")))
+    candidates = re.compile(rb"^(?:#+ )?(?:" + b"|".join(sorted(starts)) + rb")", re.MULTILINE)
+
+    return _Grammar(boundary, headers, candidates, spec["article"])
+
+
+# Compiled on first use of each language (compiling all 24 up front would
+# dominate import time), then reused by every later parse.
+_GRAMMARS: dict[str, _Grammar] = {}
+
+
+def _grammar_for(language: str) -> _Grammar:
+    if language not in _HEADINGS:
+        language = "en"
+    grammar = _GRAMMARS.get(language)
+    if grammar is None:
+        grammar = _GRAMMARS.setdefault(language, _compile_grammar(language))
+    return grammar
+
+
+def _build_section(
+    grammar: _Grammar, text: str, start: int, end: int, language: str, base_url: str
+) -> Optional[tuple[str, dict]]:
+    """Turn ``text[start:end]`` (one boundary-to-boundary chunk) into a section.
+
+    Returns ``(kind, doc)``, or ``None`` for chunks without a recognisable
+    heading or body.  Article docs keep the original article schema.
+    """
+    boundary = grammar.boundary.match(text, start, end)
+    if not boundary:
+        return None
+    kind = boundary.lastgroup
+
+    for header in grammar.headers[kind]:
+        match = header.match(text, start, end)
+        if match:
+            break
+    else:
+        return None
+
+    num = match.group("num")
+    title_candidate = match.group(2) if match.group(2) else ""
+    if kind == "article":
+        default_title = grammar.article_template.replace("{n}", num)
+    else:
+        default_title = f"{kind.capitalize()} {num}"
+    title = title_candidate.strip() if title_candidate else default_title
+
+    body = text[match.end():end].strip()
+    body = _BLANK_RUN_RE.sub('\n\n', body).strip()
+    if kind == "chapter" and not body:
+        body = title
+    if not body:
+        return None
+
+    url = f"{base_url}#{_URL_ANCHORS[kind].format(num)}"
+    if kind == "article":
+        return kind, {
+            "id": f"{language}_art_{num}",
+            "article_number": num,
+            "title": title,
+            "text": body,
+            "language": language,
+            "url": url
+        }
+    return kind, {
+        "id": f"{language}_{kind}_{num}",
+        "section_type": kind,
+        "section_number": num,
+        "title": title,
+        "text": body,
+        "language": language,
+        "url": url,
+    }
+
+
+class _BoundaryFilter:
+    """Recitals are only boundaries in the preamble, before any other heading.
+
+    Inside articles "(1)" opens a numbered point, not a recital.
+    """
+
+    def __init__(self):
+        self.in_preamble = True
+
+    def accept(self, kind: str) -> bool:
+        if kind == "recital":
+            return self.in_preamble
+        self.in_preamble = False
+        return True
+
+
+def _iter_text_spans(text: str, grammar: _Grammar) -> Iterator[tuple[int, int]]:
+    """Yield ``(start, end)`` offsets of every section chunk in *text*."""
+    accepted = _BoundaryFilter()
+    start = None
+    for match in grammar.boundary.finditer(text):
+        if not accepted.accept(match.lastgroup):
+            continue
+        if start is not None:
+            yield start, match.start()
+        start = match.start()
+    if start is not None:
+        yield start, len(text)
+
+
+def _iter_block_chunks(blocks: Iterable[str], grammar: _Grammar) -> Iterator[str]:
+    """Yield section chunks from an iterable of arbitrary text blocks.
+
+    Only the current (unfinished) chunk plus one block is buffered.  A
+    boundary is accepted once its heading is fully inside the buffer, so
+    headings split across blocks are still found.
+    """
+    accepted = _BoundaryFilter()
+    buf = ""
+    in_section = False
+    for block in blocks:
+        if not block:
+            continue
+        buf += block
+        cut = 0
+        for match in grammar.boundary.finditer(buf, 1 if in_section else 0):
+            if not accepted.accept(match.lastgroup):
+                continue
+            if in_section:
+                yield buf[cut:match.start()]
+            cut = match.start()
+            in_section = True
+        if not in_section:
+            # Restart on a line boundary so ``^`` cannot match mid-line.
+            cut = buf.rfind("\n", 0, max(len(buf) - _HEADER_LOOKBACK, 0)) + 1
+        buf = buf[cut:]
+    if in_section:
+        yield buf
+
+
+def _boundary_kind(buf, pos: int, end: int, grammar: _Grammar) -> Optional[str]:
+    """Return the section kind opening at ``buf[pos]``, or ``None``.
+
+    Byte-level candidates are confirmed against the str grammar on a small
+    decoded window so Unicode whitespace/digits behave identically.
+    """
+    size = _VERIFY_WINDOW
+    while True:
+        stop = min(pos + size, end)
+        window = bytes(buf[pos:stop]).decode("utf-8", errors="ignore")
+        match = grammar.boundary.match(window)
+        if match:
+            return match.lastgroup
+        if stop == end or not _PARTIAL_HEADING_RE.match(window):
+            return None
+        size *= 2
+
+
+def _iter_buffer_spans(buf, grammar: _Grammar) -> Iterator[tuple[int, int]]:
+    """Yield ``(start, end)`` byte offsets of every section chunk in *buf*."""
+    accepted = _BoundaryFilter()
+    end = len(buf)
+    start = None
+    for match in grammar.candidates.finditer(buf):
+        pos = match.start()
+        kind = _boundary_kind(buf, pos, end, grammar)
+        if kind is None or not accepted.accept(kind):
+            continue
+        if start is not None:
+            yield start, pos
+        start = pos
+    if start is not None:
+        yield start, end
+
+
+def _iter_buffer_chunks(buf, grammar: _Grammar) -> Iterator[str]:
+    for start, end in _iter_buffer_spans(buf, grammar):
+        yield bytes(buf[start:end]).decode("utf-8")
+
+
+def _iter_path_chunks(path, grammar: _Grammar) -> Iterator[str]:
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            yield from _iter_buffer_chunks(buf, grammar)
+
+
+def _iter_sections(
+    source, language: str, kinds, block_size: int, path_str: bool = False
+) -> Iterator[tuple[str, dict]]:
+    """Dispatch on the source type and yield ``(kind, doc)`` pairs.
+
+    A plain ``str`` is markdown text unless *path_str* says it is a path.
+    """
+    grammar = _grammar_for(language)
+    base_url = _EUR_LEX_URLS.get(language, _EUR_LEX_URLS["en"])
+
+    if isinstance(source, str) and not path_str:
+        pieces = (
+            (source, start, end) for start, end in _iter_text_spans(source, grammar)
+        )
+    else:
+        if isinstance(source, (str, os.PathLike)):
+            chunks = _iter_path_chunks(source, grammar)
+        elif isinstance(source, (bytes, bytearray, memoryview, mmap.mmap)):
+            chunks = _iter_buffer_chunks(source, grammar)
+        elif hasattr(source, "read"):
+            blocks = iter(lambda: source.read(block_size), "")
+            chunks = _iter_block_chunks(blocks, grammar)
+        else:
+            chunks = _iter_block_chunks(source, grammar)
+        pieces = ((chunk, 0, len(chunk)) for chunk in chunks)
+
+    for text, start, end in pieces:
+        section = _build_section(grammar, text, start, end, language, base_url)
+        if section and section[0] in kinds:
+            yield section
+
+
+def iter_sections(
+    source: Union[str, TextIO, os.PathLike, bytes, bytearray, memoryview, mmap.mmap],
+    language: str = "en",
+    kinds: Iterable[str] = SECTION_KINDS,
+    block_size: int = _DEFAULT_BLOCK_SIZE,
+) -> Iterator[dict]:
+    """
+    Parse EU AI Act markdown into articles, annexes and recitals.
+
+    One pass with the language's precompiled heading grammar recognises
+    article, chapter, annex and recital headings; each one ends the
+    previous section.  Recitals are only recognised in the preamble, before
+    the first chapter or article.
+
+    Args:
+        source: Markdown string, text-mode file object, ``Path`` or
+            bytes-like buffer (see :func:`iter_articles`)
+        language: ISO 639-1 language code (default "en")
+        kinds: Section kinds to yield, from "article", "annex", "recital"
+            and "chapter"
+        block_size: Characters per read when *source* is a file object
+
+    Yields:
+        Section dicts, all carrying ``section_type``.  Articles otherwise
+        keep the :func:`parse_articles` schema; other sections have keys
+        id, section_type, section_number, title, text, language, url.
+    """
+    kinds = frozenset(kinds)
+    for kind, doc in _iter_sections(source, language, kinds, block_size):
+        yield {**doc, "section_type": kind} if kind == "article" else doc
+
+
+def iter_articles_from_file(
+    source: Union[str, os.PathLike, bytes, bytearray, memoryview, mmap.mmap],
+    language: str = "en",
+) -> Iterator[dict]:
+    """
+    Parse UTF-8 markdown straight from disk or a bytes-like buffer.
+
+    Paths are memory-mapped.  Article boundaries are located on the raw
+    bytes and only the slice for each emitted article is decoded, so peak
+    memory tracks the largest article rather than the whole document.
+    Output is identical to :func:`iter_articles` on the decoded text.
+
+    Args:
+        source: Path to a markdown file, or a ``bytes``/``bytearray``/
+            ``memoryview``/``mmap`` buffer holding UTF-8 markdown
+        language: ISO 639-1 language code (default "en")
+
+    Yields:
+        Article dicts with keys: id, article_number, title, text, language, url
+    """
+    for _, doc in _iter_sections(
+        source, language, {"article"}, _DEFAULT_BLOCK_SIZE, path_str=True
+    ):
+        yield doc
+
+
+def iter_articles(
+    source: Union[str, TextIO],
+    language: str = "en",
+    block_size: int = _DEFAULT_BLOCK_SIZE,
+) -> Iterator[dict]:
+    """
+    Lazily parse EU AI Act markdown into article dicts.
+
+    Scans the input once with the language's precompiled heading grammar
+    and yields each article as soon as its end boundary (the next article,
+    chapter or annex heading) is seen; the document is never split into an
+    intermediate list.
+
+    Args:
+        source: Raw markdown string, or a text-mode file object which is
+            read incrementally in *block_size* characters.  Bytes-like
+            buffers and ``Path`` objects are handed to
+            :func:`iter_articles_from_file`
+        language: ISO 639-1 language code (default "en")
+        block_size: Characters per read when *source* is a file object
+
+    Yields:
+        Article dicts with keys: id, article_number, title, text, language, url
+    """
+    for _, doc in _iter_sections(source, language, {"article"}, block_size):
+        yield doc
+
+
+def iter_articles_from_blocks(blocks: Iterable[str], language: str = "en") -> Iterator[dict]:
+    """
+    Incrementally parse markdown that arrives as arbitrary text blocks.
+
+    Each article is yielded as soon as the heading of the next section has
+    been received, so a consumer can index early articles while the rest
+    of the document is still downloading.  Blocks may split headings,
+    lines or words anywhere.
+
+    Args:
+        blocks: Iterable of ``str`` pieces (e.g. decoded HTTP chunks)
+        language: ISO 639-1 language code (default "en")
+
+    Yields:
+        Article dicts with keys: id, article_number, title, text, language, url
+    """
+    for _, doc in _iter_sections(iter(blocks), language, {"article"}, _DEFAULT_BLOCK_SIZE):
+        yield doc
+
 
 def parse_articles(markdown_text: str, language: str = "en") -> list[dict]:
     """
     Parse EU AI Act markdown into structured article chunks.
 
-    Splits on "Article N" boundaries, capturing article number, title,
-    and body text while preserving legal context.
+    Splits on "Article N" boundaries (in the heading form of *language*),
+    capturing article number, title, and body text while preserving legal
+    context.  Thin wrapper around :func:`iter_articles`.
 
     Args:
         markdown_text: Raw markdown from Jina Reader
@@ -27,37 +472,24 @@ def parse_articles(markdown_text: str, language: str = "en") -> list[dict]:
     Returns:
         List of article dicts with keys: id, article_number, title, text, language, url
     """
-    articles = []
-    base_url = _EUR_LEX_URLS.get(language, _EUR_LEX_URLS["en"])
+    return list(iter_articles(markdown_text, language))
 
-    article_pattern = r'^(?:#+ )?Article\s+(\d+)\s*\n+([^\n]+)?'
 
-    splits = re.split(r'(?=^(?:#+ )?Article\s+\d+)', markdown_text, flags=re.MULTILINE)
+def parse_articles_file(
+    source: Union[str, os.PathLike, bytes, bytearray, memoryview, mmap.mmap],
+    language: str = "en",
+) -> list[dict]:
+    """
+    Parse a markdown file (or bytes-like buffer) into article chunks.
 
-    for chunk in splits:
-        if not chunk.strip():
-            continue
+    List-returning counterpart of :func:`iter_articles_from_file`; use the
+    generator when articles can be consumed one at a time.
 
-        match = re.match(article_pattern, chunk, re.MULTILINE)
-        if match:
-            article_num = match.group(1)
-            title_candidate = match.group(2) if match.group(2) else ""
-            title = title_candidate.strip() if title_candidate else f"Article {article_num}"
-
-            body_start = match.end()
-            body = chunk[body_start:].strip()
-
-            body = re.sub(r'\n{3,}', '\n\n', body)
-            body = body.strip()
-
-            if body:
-                articles.append({
-                    "id": f"{language}_art_{article_num}",
-                    "article_number": article_num,
-                    "title": title,
-                    "text": body,
-                    "language": language,
-                    "url": f"{base_url}#Art{article_num}"
-                })
-
-    return articles
+    Args:
+        source: Path to a UTF-8 markdown file, or a bytes-like buffer
+        language: ISO 639-1 language code (default "en")
+
+    Returns:
+        List of article dicts with keys: id, article_number, title, text, language, url
+    """
+    return list(iter_articles_from_file(source, language))
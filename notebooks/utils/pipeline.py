@@ -0,0 +1,348 @@
+"""
+Headless ingestion pipeline: fetch → parse → index.
+
+Runs the notebook ingestion flow from the command line, with each stage
+checkpointed to disk as gzip-compressed JSONL.  A failed run restarts
+from the first stage that did not complete: a flaky index step never
+re-fetches the EUR-Lex documents, and a parser fix only needs
+``--from-stage parse``.
+
+Run from ``notebooks/``::
+
+    python -m utils.pipeline --languages en de fr --workers 4
+    python -m utils.pipeline --dry-run
+    python -m utils.pipeline --from-stage parse
+    python -m utils.pipeline --source en=dumps/en.md --index my-index
+"""
+
+import argparse
+import copy
+import gzip
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Union
+
+from .ingest import fetch_language, map_languages, parse_language, resolve_sources
+
+STAGES = ("fetch", "parse", "index")
+DEFAULT_WORKDIR = Path.home() / ".cache" / "innocenti-risk" / "pipeline"
+DEFAULT_WORKERS = 4
+MANIFEST_NAME = "manifest.json"
+
+# Mirrors the index created in 01_full_chain.ipynb.
+INDEX_MAPPINGS = {
+    "properties": {
+        "text": {"type": "semantic_text"},
+        "title": {"type": "text"},
+        "article_number": {"type": "integer"},
+        "language": {"type": "keyword"},
+        "url": {"type": "keyword"},
+    }
+}
+
+
+def write_jsonl_gz(path: Union[str, os.PathLike], records: Iterable[dict]) -> int:
+    """Atomically write *records* as gzip JSONL; returns the record count."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    count = 0
+    try:
+        with os.fdopen(fd, "wb") as raw, gzip.open(raw, "wt", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False))
+                f.write("\n")
+                count += 1
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return count
+
+
+def read_jsonl_gz(path: Union[str, os.PathLike]) -> Iterator[dict]:
+    """Stream records back from a :func:`write_jsonl_gz` file."""
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+class Checkpoints:
+    """Stage outputs and the manifest recording which stages completed.
+
+    A checkpoint only counts for the sources it was produced from (and,
+    for the index stage, the same index); a run with different sources
+    starts from scratch.  Re-running a stage invalidates every later one.
+    """
+
+    def __init__(self, workdir: Union[str, os.PathLike], sources: dict[str, str]):
+        self.workdir = Path(workdir)
+        self.sources = sources
+        self.manifest = {"sources": sources, "stages": {}}
+        path = self.workdir / MANIFEST_NAME
+        if path.exists():
+            manifest = json.loads(path.read_text())
+            if manifest.get("sources") == sources:
+                self.manifest = manifest
+
+    def path(self, stage: str) -> Path:
+        return self.workdir / f"{stage}.jsonl.gz"
+
+    def completed(self, stage: str, **params) -> Optional[dict]:
+        """Recorded summary of *stage*, if it completed with these params."""
+        entry = self.manifest["stages"].get(stage)
+        if entry is None or not self.path(stage).exists():
+            return None
+        if any(entry.get(key) != value for key, value in params.items()):
+            return None
+        return entry
+
+    def invalidate(self, stage: str) -> None:
+        """Forget *stage* and every stage after it."""
+        for later in STAGES[STAGES.index(stage):]:
+            self.manifest["stages"].pop(later, None)
+
+    def record(self, stage: str, summary: dict) -> None:
+        self.invalidate(stage)
+        self.manifest["stages"][stage] = summary
+        self.workdir.mkdir(parents=True, exist_ok=True)
+        path = self.workdir / MANIFEST_NAME
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.manifest, indent=2))
+        os.replace(tmp, path)
+
+
+def _fetch_one(language: str, source: str, api_key: Optional[str]) -> dict:
+    markdown_text = fetch_language(source, api_key)
+    print(f"✓ Fetched {len(markdown_text):,} characters [{language}]")
+    return {"language": language, "source": source, "markdown": markdown_text}
+
+
+def fetch_stage(
+    sources: dict[str, str], path: Path, api_key: Optional[str], workers: int
+) -> dict:
+    """Fetch every language edition (threads; the work is network-bound)."""
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(sources)))) as pool:
+        records = list(pool.map(_fetch_one, sources, sources.values(),
+                                [api_key] * len(sources)))
+    return {"records": write_jsonl_gz(path, records)}
+
+
+def parse_stage(fetch_path: Path, path: Path, workers: int) -> dict:
+    """Parse fetched markdown with the :mod:`utils.ingest` process pool."""
+    jobs = {record["language"]: (record["markdown"],) for record in read_jsonl_gz(fetch_path)}
+    parsed = dict(map_languages(parse_language, jobs, max(1, workers)))
+    # Checkpoint in source order, not completion order.
+    articles = (article for language in jobs for article in parsed[language])
+    return {
+        "records": write_jsonl_gz(path, articles),
+        "per_language": {language: len(parsed[language]) for language in jobs},
+    }
+
+
+def index_stage(
+    es_client,
+    parse_path: Path,
+    path: Path,
+    index_name: str,
+    inference_id: Optional[str],
+    workers: int,
+    **bulk_options,
+) -> dict:
+    """Create the index if needed and bulk-index every parsed article.
+
+    The index stage output lists the per-document errors, so a partially
+    failed run can be inspected without re-reading the bulk responses.
+    """
+    from .indexing import bulk_index
+    from .inference import verify_embedding_endpoint
+
+    if inference_id and not verify_embedding_endpoint(es_client, inference_id):
+        raise RuntimeError(f"Embedding endpoint {inference_id} is not available")
+
+    if not es_client.indices.exists(index=index_name):
+        mappings = copy.deepcopy(INDEX_MAPPINGS)
+        if inference_id:
+            mappings["properties"]["text"]["inference_id"] = inference_id
+        es_client.indices.create(index=index_name, mappings=mappings)
+        print(f"✓ Created index {index_name}")
+
+    actions = (
+        {"_index": index_name, "_id": doc["id"], "_source": doc}
+        for doc in read_jsonl_gz(parse_path)
+    )
+    bulk_options.setdefault("thread_count", workers)
+    result = bulk_index(es_client, actions, **bulk_options)
+    write_jsonl_gz(path, result["errors"])
+    return {
+        "index": index_name,
+        "indexed": result["indexed"],
+        "errors": len(result["errors"]),
+    }
+
+
+def run_pipeline(
+    sources: dict[str, str],
+    workdir: Union[str, os.PathLike] = DEFAULT_WORKDIR,
+    es_client=None,
+    index_name: Optional[str] = None,
+    inference_id: Optional[str] = None,
+    api_key: Optional[str] = None,
+    workers: int = DEFAULT_WORKERS,
+    from_stage: Optional[str] = None,
+    stop_after: str = "index",
+    dry_run: bool = False,
+    **bulk_options,
+) -> dict:
+    """Run fetch → parse → index, skipping stages with a valid checkpoint.
+
+    Args:
+        sources: Language -> EUR-Lex URL or local markdown path (see
+            :func:`utils.ingest.resolve_sources`)
+        workdir: Directory for ``<stage>.jsonl.gz`` checkpoints and the
+            manifest
+        es_client: Elasticsearch client; only needed when the index stage
+            runs (and not on a dry run)
+        index_name: Target index (default: ``get_index_name()``)
+        inference_id: Embedding endpoint for the ``semantic_text`` field;
+            verified before indexing (``None`` keeps the cluster default
+            and skips the check)
+        api_key: Jina API key (only needed for URL sources)
+        workers: Fetch threads, parse processes and bulk threads
+        from_stage: Re-run this stage and everything after it even if
+            checkpointed
+        stop_after: Last stage to run
+        dry_run: Report which stages would run; no network, no writes
+        **bulk_options: Passed to :func:`utils.indexing.bulk_index`
+
+    Returns:
+        dict with keys: stages (stage -> ``"skipped"``, ``"ran"`` or
+        ``"pending"`` on a dry run) and summaries (stage -> summary dict)
+    """
+    if from_stage is not None and from_stage not in STAGES:
+        raise ValueError(f"from_stage must be one of {STAGES}, got {from_stage!r}")
+    if stop_after not in STAGES:
+        raise ValueError(f"stop_after must be one of {STAGES}, got {stop_after!r}")
+    if index_name is None:
+        from .credentials import get_index_name
+
+        index_name = get_index_name()
+
+    checkpoints = Checkpoints(workdir, sources)
+    if from_stage is not None:
+        checkpoints.invalidate(from_stage)
+
+    stages, summaries = {}, {}
+    rerun = False
+    for stage in STAGES[:STAGES.index(stop_after) + 1]:
+        params = {"index": index_name} if stage == "index" else {}
+        done = None if rerun else checkpoints.completed(stage, **params)
+        if done is not None:
+            stages[stage], summaries[stage] = "skipped", done
+            print(f"✓ {stage}: checkpoint found, skipping")
+            continue
+        rerun = True  # every later stage depends on this one's output
+
+        if dry_run:
+            stages[stage] = "pending"
+            print(f"• {stage}: would run")
+            continue
+
+        start = time.perf_counter()
+        if stage == "fetch":
+            summary = fetch_stage(sources, checkpoints.path("fetch"), api_key, workers)
+        elif stage == "parse":
+            summary = parse_stage(checkpoints.path("fetch"), checkpoints.path("parse"), workers)
+        else:
+            if es_client is None:
+                raise ValueError("es_client is required for the index stage")
+            summary = index_stage(
+                es_client, checkpoints.path("parse"), checkpoints.path("index"),
+                index_name, inference_id, workers, **bulk_options,
+            )
+        summary["seconds"] = round(time.perf_counter() - start, 3)
+        checkpoints.record(stage, summary)
+        stages[stage], summaries[stage] = "ran", summary
+        print(f"✓ {stage}: done in {summary['seconds']:.1f}s")
+
+    return {"stages": stages, "summaries": summaries}
+
+
+def _parse_source(value: str) -> tuple[str, str]:
+    language, sep, source = value.partition("=")
+    if not sep or not language or not source:
+        raise argparse.ArgumentTypeError(f"expected LANG=URL_OR_PATH, got {value!r}")
+    return language, source
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--languages", nargs="+",
+                        help="language codes (default: every EUR-Lex language)")
+    parser.add_argument("--source", type=_parse_source, action="append", default=[],
+                        metavar="LANG=URL_OR_PATH",
+                        help="override the source of one language (repeatable)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"fetch/parse/bulk parallelism (default: {DEFAULT_WORKERS})")
+    parser.add_argument("--workdir", default=str(DEFAULT_WORKDIR),
+                        help="checkpoint directory")
+    parser.add_argument("--index", help="target index (default: per-user index name)")
+    parser.add_argument("--inference-id",
+                        help="embedding endpoint (default: get_inference_id('embeddings'))")
+    parser.add_argument("--from-stage", choices=STAGES,
+                        help="re-run from this stage, ignoring its checkpoint")
+    parser.add_argument("--stop-after", choices=STAGES, default="index",
+                        help="last stage to run")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="show which stages would run, without fetching or indexing")
+    args = parser.parse_args(argv)
+
+    from .credentials import get_inference_id, resolve_config
+
+    config = resolve_config()
+    try:
+        sources = resolve_sources(args.languages, dict(args.source))
+    except ValueError as e:
+        print(f"✗ {e}")
+        return 2
+    print(f"Pipeline: {len(sources)} language(s) -> {args.workdir}")
+
+    es_client = None
+    needs_cluster = not args.dry_run and STAGES.index(args.stop_after) >= STAGES.index("index")
+    if needs_cluster:
+        from .credentials import create_elasticsearch_client
+
+        credentials = config.credentials()
+        if "ELASTIC_URL" not in credentials and "ELASTIC_CLOUD_ID" not in credentials:
+            print("✗ ELASTIC_URL (or ELASTIC_CLOUD_ID) and ELASTIC_API_KEY must be set")
+            return 2
+        es_client = create_elasticsearch_client(credentials)
+
+    try:
+        run_pipeline(
+            sources,
+            workdir=args.workdir,
+            es_client=es_client,
+            index_name=args.index,
+            inference_id=args.inference_id or get_inference_id("embeddings"),
+            api_key=config.jina_api_key,
+            workers=args.workers,
+            from_stage=args.from_stage,
+            stop_after=args.stop_after,
+            dry_run=args.dry_run,
+        )
+    except Exception as e:
+        print(f"✗ Pipeline failed: {type(e).__name__}: {e}")
+        print("  Re-run the same command to resume from the last completed stage.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
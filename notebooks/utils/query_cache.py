@@ -0,0 +1,229 @@
+"""
+Result cache for repeated search and rerank queries.
+
+Compliance questions repeat constantly, and each one costs a semantic
+search plus a rerank inference call.  ``QueryCache`` memoizes results by
+normalized query, language, index and retriever config, with LRU and TTL
+eviction, and drops an index's entries as soon as its *generation* changes:
+the ``ingest_version`` stored in the index ``_meta`` (see
+:func:`set_ingest_version`) together with every primary shard's
+``max_seq_no`` and document counts (or, where shard stats are not
+exposed, the document count and largest ``_seq_no``), so writes to the
+index invalidate cached results.
+"""
+
+import json
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+from .inference import normalize_text
+
+INGEST_VERSION_KEY = "ingest_version"
+
+_shard_stats_unavailable: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+
+
+def _shard_token(es_client, index_name: str) -> str:
+    stats = es_client.indices.stats(index=index_name, metric="docs", level="shards")
+    shards = []
+    for name, index_stats in stats["indices"].items():
+        for shard_id, copies in index_stats.get("shards", {}).items():
+            for copy in copies:
+                if not copy.get("routing", {}).get("primary", True):
+                    continue
+                docs = copy.get("docs", {})
+                shards.append(
+                    f"{name}/{shard_id}:{copy.get('seq_no', {}).get('max_seq_no', -1)}"
+                    f":{docs.get('count', 0)}:{docs.get('deleted', 0)}"
+                )
+    return ",".join(sorted(shards))
+
+
+def _search_token(es_client, index_name: str) -> str:
+    resp = es_client.search(
+        index=index_name,
+        size=0,
+        track_total_hits=True,
+        aggs={"max_seq_no": {"max": {"field": "_seq_no"}}},
+    )
+    max_seq_no = resp["aggregations"]["max_seq_no"]["value"]
+    count = resp["hits"]["total"]["value"]
+    return f"{index_name}:{-1 if max_seq_no is None else int(max_seq_no)}:{count}"
+
+
+def index_generation(es_client, index_name: str) -> str:
+    """Opaque token that changes whenever *index_name* is written to.
+
+    Built from shard-level index stats: for every primary shard, its
+    ``max_seq_no`` (bumped by every index, update and delete on that
+    shard) and its document and deleted-document counts (which move when
+    a refresh makes those writes searchable), plus the
+    ``_meta.ingest_version`` if set.  Shard relocations and merges can
+    also change the token; that only costs a cache miss.
+
+    Clusters that do not expose shard-level stats (Elastic Cloud
+    Serverless) fall back to the searchable document count and the
+    largest ``_seq_no``, read with one ``size=0`` search.  That misses an
+    update on a shard whose ``_seq_no`` is behind another's, so set an
+    ingest version after re-ingesting there.  The fallback is remembered
+    per client.
+    """
+    from elasticsearch import ApiError
+
+    mappings = es_client.indices.get_mapping(index=index_name)
+    versions = ",".join(sorted(
+        str(body.get("mappings", {}).get("_meta", {}).get(INGEST_VERSION_KEY, ""))
+        for body in mappings.values()
+    ))
+    with _lock:
+        shard_stats = es_client not in _shard_stats_unavailable
+    if shard_stats:
+        try:
+            return f"{versions}|{_shard_token(es_client, index_name)}"
+        except ApiError as e:
+            # Only remember the fallback once it works, so an error about
+            # the index itself is not mistaken for missing shard stats.
+            token = _search_token(es_client, index_name)
+            with _lock:
+                _shard_stats_unavailable[es_client] = True
+            print(f"✗ Shard-level index stats unavailable ({e.meta.status}); "
+                  f"using document count and max _seq_no")
+            return f"{versions}|{token}"
+    return f"{versions}|{_search_token(es_client, index_name)}"
+
+
+def set_ingest_version(es_client, index_name: str, version: str) -> None:
+    """Record an ingest version in the index ``_meta`` (invalidates caches).
+
+    Replaces the whole ``_meta`` object, as ``put_mapping`` always does.
+    """
+    es_client.indices.put_mapping(index=index_name, meta={INGEST_VERSION_KEY: version})
+
+
+class QueryCache:
+    """LRU + TTL cache of query results, invalidated by index generation.
+
+    The generation of each index is re-read at most every
+    *generation_check_interval* seconds, so hot queries are served from
+    memory without any round trip in between.
+
+    Args:
+        max_entries: LRU capacity
+        ttl: Seconds a result stays valid regardless of generation
+        generation_check_interval: Seconds between generation checks per
+            index (``0`` checks on every lookup)
+
+    Example::
+
+        cache = QueryCache()
+        hits = cache.lookup(
+            es, INDEX, query,
+            lambda: hybrid_search(es, INDEX, query, rerank_id="jina-rr"),
+            language="en", config={"rerank_id": "jina-rr"},
+        )
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: float = 300.0,
+        generation_check_interval: float = 5.0,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.generation_check_interval = generation_check_interval
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple] = OrderedDict()
+        self._generations: dict[str, tuple[str, float]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(
+        index_name: str,
+        query: str,
+        language: Optional[str] = None,
+        config: Optional[dict] = None,
+    ) -> str:
+        return json.dumps(
+            [index_name, normalize_text(query).casefold(), language, config or {}],
+            sort_keys=True,
+            default=str,
+        )
+
+    def generation(self, es_client, index_name: str) -> str:
+        """Current generation of *index_name*, re-read when the check is due."""
+        now = time.monotonic()
+        with self._lock:
+            known = self._generations.get(index_name)
+        if known and now - known[1] < self.generation_check_interval:
+            return known[0]
+
+        generation = index_generation(es_client, index_name)
+        with self._lock:
+            if known and known[0] != generation:
+                stale = [k for k, entry in self._entries.items() if entry[1] == index_name]
+                for k in stale:
+                    del self._entries[k]
+            self._generations[index_name] = (generation, now)
+        return generation
+
+    def lookup(
+        self,
+        es_client,
+        index_name: str,
+        query: str,
+        compute: Callable[[], Any],
+        language: Optional[str] = None,
+        config: Optional[dict] = None,
+    ) -> Any:
+        """Return the cached result for this query, or ``compute()`` it.
+
+        Args:
+            es_client: Elasticsearch client (for generation checks)
+            index_name: Index the result was computed from
+            query: Query text (normalized and case-folded for the key)
+            compute: Zero-argument callable producing the result
+            language: Language filter the result depends on
+            config: Retriever/rerank settings the result depends on
+        """
+        key = self.key(index_name, query, language, config)
+        generation = self.generation(es_client, index_name)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                result, _, entry_generation, expires = entry
+                if entry_generation == generation and now < expires:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return result
+                del self._entries[key]
+            self.misses += 1
+
+        result = compute()
+        with self._lock:
+            self._entries[key] = (result, index_name, generation, now + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return result
+
+    def invalidate(self, index_name: Optional[str] = None) -> None:
+        """Drop cached results for *index_name* (or everything)."""
+        with self._lock:
+            if index_name is None:
+                self._entries.clear()
+                self._generations.clear()
+                return
+            for k in [k for k, entry in self._entries.items() if entry[1] == index_name]:
+                del self._entries[k]
+            self._generations.pop(index_name, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
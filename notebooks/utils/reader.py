@@ -2,9 +2,54 @@
 Jina Reader API helper for fetching and converting URLs to markdown.
 """
 
+import codecs
+import email.utils
+import random
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional
 
-import requests
+from .parsing import iter_articles_from_blocks
+
+if TYPE_CHECKING:
+    import requests
+
+    from .reader_cache import ReaderCache
+
+# Statuses that mean "slow down / try again", not "your request is wrong".
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+
+
+def _reader_headers(api_key: str) -> dict:
+    return {
+        "Authorization": f"Bearer {api_key}",
+        "x-respond-with": "markdown",
+        "Accept": "text/plain",
+    }
+
+
+def _conditional_headers(headers: dict, cached: Optional[dict]) -> dict:
+    """*headers* plus ``If-None-Match`` / ``If-Modified-Since`` from a cache entry."""
+    request_headers = dict(headers)
+    if cached:
+        if cached.get("etag"):
+            request_headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            request_headers["If-Modified-Since"] = cached["last_modified"]
+    return request_headers
+
+
+def create_reader_session(pool_size: int = 10) -> "requests.Session":
+    """Create a ``requests.Session`` whose connection pool fits *pool_size* workers."""
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
 
 
 def fetch_with_jina_reader(
@@ -12,17 +57,27 @@ def fetch_with_jina_reader(
     api_key: str,
     max_retries: int = 3,
     min_content_length: int = 100,
+    session: Optional["requests.Session"] = None,
+    cache: Optional["ReaderCache"] = None,
+    revalidate: bool = False,
 ) -> str:
     """Fetch a URL via Jina Reader and return clean markdown.
 
     Retries when the response body is shorter than *min_content_length*
     (empty / partial responses are transient failures for large PDFs).
 
+    With a *cache*, a stored copy is returned without touching the network.
+    Set *revalidate* to send a conditional request instead (``If-None-Match``
+    / ``If-Modified-Since``) and reuse the cached copy on ``304``.
+
     Args:
         url: The Jina Reader URL (``https://r.jina.ai/<target_url>``)
         api_key: Jina API key
         max_retries: Number of attempts before giving up
         min_content_length: Minimum acceptable response length
+        session: Optional pooled session to reuse connections across calls
+        cache: Optional :class:`~utils.reader_cache.ReaderCache`
+        revalidate: Revalidate cached entries instead of trusting them
 
     Returns:
         Raw markdown text from Jina Reader
@@ -31,23 +86,38 @@ def fetch_with_jina_reader(
         requests.HTTPError: On non-2xx HTTP status
         ValueError: If all retries are exhausted with empty content
     """
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "x-respond-with": "markdown",
-        "Accept": "text/plain",
-    }
+    import requests
+
+    headers = _reader_headers(api_key)
+    get = session.get if session is not None else requests.get
+
+    cached = cache.get_entry(url, headers) if cache is not None else None
+    if cached and not revalidate:
+        print(f"\u2713 Loaded {len(cached['text']):,} characters from reader cache")
+        return cached["text"]
+
+    request_headers = _conditional_headers(headers, cached)
 
     print("Fetching PDF via Jina Reader...")
     print("(This may take 30-60 seconds for a large document)")
 
     for attempt in range(max_retries):
-        response = requests.get(url, headers=headers, timeout=120)
+        response = get(url, headers=request_headers, timeout=120)
+        if cached and response.status_code == 304:
+            print(f"\u2713 Source unchanged, using cached {len(cached['text']):,} characters")
+            return cached["text"]
         response.raise_for_status()
 
         content = response.text.strip()
 
         if len(content) >= min_content_length:
             print(f"\u2713 Received {len(response.text):,} characters")
+            if cache is not None:
+                cache.put(
+                    url, response.text, headers,
+                    etag=response.headers.get("ETag"),
+                    last_modified=response.headers.get("Last-Modified"),
+                )
             return response.text
 
         if attempt < max_retries - 1:
@@ -64,3 +134,291 @@ def fetch_with_jina_reader(
         "Jina Reader returned empty content after multiple retries. "
         "This can happen due to rate limiting. Wait a minute and try again."
     )
+
+
+def _retry_after_seconds(response) -> Optional[float]:
+    """Parse a ``Retry-After`` header (delta-seconds or HTTP-date)."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(when.timestamp() - time.time(), 0.0)
+
+
+class _RateLimitGate:
+    """Shared pause so one 429 holds back every worker, not just the caller."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._resume_at = 0.0
+
+    def wait(self) -> None:
+        with self._lock:
+            delay = self._resume_at - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def pause(self, seconds: float) -> None:
+        with self._lock:
+            self._resume_at = max(self._resume_at, time.monotonic() + seconds)
+
+
+def _fetch_one(
+    session: "requests.Session",
+    url: str,
+    headers: dict,
+    gate: _RateLimitGate,
+    max_retries: int,
+    min_content_length: int,
+    backoff_base: float,
+    max_backoff: float,
+    cached: Optional[dict] = None,
+) -> dict:
+    """Fetch a single URL with jittered exponential backoff.
+
+    With a *cached* entry the request is conditional, and a ``304`` returns
+    the cached text.
+
+    Returns:
+        dict with keys: text, etag, last_modified, not_modified
+    """
+    request_headers = _conditional_headers(headers, cached)
+    for attempt in range(max_retries):
+        gate.wait()
+        response = session.get(url, headers=request_headers, timeout=120)
+        last_attempt = attempt == max_retries - 1
+
+        if cached and response.status_code == 304:
+            return {**cached, "not_modified": True}
+
+        if response.status_code in RETRY_STATUSES and not last_attempt:
+            retry_after = _retry_after_seconds(response)
+            if retry_after is not None and retry_after > max_backoff:
+                # Retrying sooner would only hit the quota again.
+                print(f"\u2717 Jina Reader asked to wait {retry_after:.0f}s "
+                      f"(max_backoff={max_backoff:.0f}s): {url}")
+                response.raise_for_status()
+            # Full jitter, but never sooner than the server asked for.
+            delay = random.uniform(0, min(max_backoff, backoff_base * 2 ** attempt))
+            if retry_after is not None:
+                delay = max(delay, retry_after)
+            if response.status_code == 429:
+                gate.pause(delay)
+            else:
+                time.sleep(delay)
+            continue
+
+        response.raise_for_status()
+        if len(response.text.strip()) >= min_content_length:
+            return {
+                "text": response.text,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "not_modified": False,
+            }
+
+        if not last_attempt:
+            time.sleep(random.uniform(0, min(max_backoff, backoff_base * 2 ** attempt)))
+
+    raise ValueError(
+        f"Jina Reader returned empty content after {max_retries} attempts: {url}"
+    )
+
+
+def fetch_many(
+    urls: Iterable[str],
+    api_key: str,
+    concurrency: int = 4,
+    max_retries: int = 5,
+    min_content_length: int = 100,
+    backoff_base: float = 1.0,
+    max_backoff: float = 60.0,
+    session: Optional["requests.Session"] = None,
+    return_exceptions: bool = False,
+    cache: Optional["ReaderCache"] = None,
+    revalidate: bool = False,
+) -> dict:
+    """Fetch many URLs via Jina Reader concurrently over one pooled session.
+
+    At most *concurrency* requests are in flight.  429 and 5xx gateway
+    responses are retried with jittered exponential backoff that honours
+    ``Retry-After``; a 429 pauses every worker so the whole batch backs
+    off together instead of hammering the quota.  A ``Retry-After`` longer
+    than *max_backoff* is not shortened: the URL fails with the HTTP error
+    instead.
+
+    Args:
+        urls: Jina Reader URLs (``https://r.jina.ai/<target_url>``)
+        api_key: Jina API key
+        concurrency: Maximum number of requests in flight
+        max_retries: Attempts per URL before giving up
+        min_content_length: Minimum acceptable response length
+        backoff_base: First backoff ceiling in seconds (doubles per attempt)
+        max_backoff: Upper bound for any single wait, in seconds; also the
+            longest ``Retry-After`` that is waited out
+        session: Session to reuse (default: a new pooled session)
+        return_exceptions: Store failures in the result instead of raising
+        cache: Optional reader cache; hits are served without a request and
+            fresh responses are stored with their ``ETag``/``Last-Modified``
+        revalidate: Send conditional requests for cache hits instead of
+            trusting them, reusing the cached copy on ``304`` (as in
+            :func:`fetch_with_jina_reader`)
+
+    Returns:
+        dict mapping each URL to its markdown (or exception, when
+        *return_exceptions* is set), in input order
+
+    Raises:
+        requests.HTTPError: On a non-retryable HTTP status, or a
+            ``Retry-After`` longer than *max_backoff*
+        ValueError: If a URL keeps returning empty content
+    """
+    urls = list(dict.fromkeys(urls))
+    if not urls:
+        return {}
+
+    owns_session = session is None
+    if owns_session:
+        session = create_reader_session(pool_size=concurrency)
+
+    headers = _reader_headers(api_key)
+    gate = _RateLimitGate()
+    results = {}
+    cached = {}
+    if cache is not None:
+        for url in urls:
+            entry = cache.get_entry(url, headers)
+            if entry is None:
+                continue
+            if revalidate:
+                cached[url] = entry
+            else:
+                results[url] = entry["text"]
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            futures = {
+                url: pool.submit(
+                    _fetch_one, session, url, headers, gate,
+                    max_retries, min_content_length, backoff_base, max_backoff,
+                    cached.get(url),
+                )
+                for url in urls
+                if url not in results
+            }
+            for url, future in futures.items():
+                try:
+                    fetched = future.result()
+                    results[url] = fetched["text"]
+                    if cache is not None and not fetched["not_modified"]:
+                        cache.put(
+                            url, fetched["text"], headers,
+                            etag=fetched["etag"], last_modified=fetched["last_modified"],
+                        )
+                except Exception as e:
+                    if not return_exceptions:
+                        for pending in futures.values():
+                            pending.cancel()
+                        raise
+                    results[url] = e
+    finally:
+        if owns_session:
+            session.close()
+
+    ok = sum(1 for value in results.values() if isinstance(value, str))
+    print(f"\u2713 Fetched {ok}/{len(urls)} documents via Jina Reader")
+    return {url: results[url] for url in urls}
+
+
+def _iter_decoded(response, chunk_size: int, received: list) -> Iterator[str]:
+    """Decode a streamed response incrementally, counting raw bytes in *received*."""
+    content_type = response.headers.get("Content-Type", "")
+    # requests assumes ISO-8859-1 for text/* without a charset; Jina sends UTF-8.
+    encoding = response.encoding if "charset=" in content_type.lower() else "utf-8"
+    decoder = codecs.getincrementaldecoder(encoding or "utf-8")(errors="replace")
+    for raw in response.iter_content(chunk_size=chunk_size):
+        received[0] += len(raw)
+        text = decoder.decode(raw)
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def stream_articles_with_jina_reader(
+    url: str,
+    api_key: str,
+    language: str = "en",
+    max_retries: int = 3,
+    min_content_length: int = 100,
+    chunk_size: int = 64 * 1024,
+    session: Optional["requests.Session"] = None,
+) -> Iterator[dict]:
+    """Stream a Jina Reader conversion and yield articles as they arrive.
+
+    The response body is consumed with ``iter_content`` and fed straight
+    into :func:`utils.parsing.iter_articles_from_blocks`, so the first
+    article can be embedded and indexed while the rest of the document is
+    still downloading.
+
+    A response that ends with fewer than *min_content_length* characters
+    and no articles is treated like an empty response in
+    :func:`fetch_with_jina_reader` and retried.
+
+    Args:
+        url: The Jina Reader URL (``https://r.jina.ai/<target_url>``)
+        api_key: Jina API key
+        language: ISO 639-1 language code for the parsed articles
+        max_retries: Number of attempts before giving up
+        min_content_length: Minimum acceptable response length
+        chunk_size: Bytes per ``iter_content`` read
+        session: Optional pooled session to reuse connections across calls
+
+    Yields:
+        Article dicts as produced by :func:`utils.parsing.parse_articles`
+
+    Raises:
+        requests.HTTPError: On non-2xx HTTP status
+        ValueError: If all retries are exhausted with empty content
+    """
+    import requests
+
+    headers = _reader_headers(api_key)
+    get = session.get if session is not None else requests.get
+
+    for attempt in range(max_retries):
+        received = [0]
+        emitted = 0
+        with get(url, headers=headers, timeout=120, stream=True) as response:
+            response.raise_for_status()
+            for article in iter_articles_from_blocks(
+                _iter_decoded(response, chunk_size, received), language
+            ):
+                emitted += 1
+                yield article
+
+        if emitted or received[0] >= min_content_length:
+            print(f"\u2713 Streamed {received[0]:,} bytes, {emitted} articles")
+            return
+
+        if attempt < max_retries - 1:
+            wait_time = (attempt + 1) * 5
+            print(
+                f"\u26a0 Empty response (attempt {attempt + 1}/{max_retries}). "
+                f"Retrying in {wait_time}s..."
+            )
+            time.sleep(wait_time)
+        else:
+            print(f"\u2717 Failed after {max_retries} attempts — received empty content")
+
+    raise ValueError(
+        "Jina Reader returned empty content after multiple retries. "
+        "This can happen due to rate limiting. Wait a minute and try again."
+    )
@@ -0,0 +1,151 @@
+"""
+Persistent on-disk cache for Jina Reader responses.
+
+Converting the EUR-Lex PDF takes 30-60 seconds per run; this cache keeps
+the gzip-compressed markdown together with the ``ETag``/``Last-Modified``
+validators so repeat runs can skip the network or revalidate cheaply.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional, Union
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "innocenti-risk" / "jina-reader"
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+# Headers that never change the converted content (and must not be stored).
+_UNKEYED_HEADERS = {"authorization"}
+
+
+def cache_key(url: str, headers: Optional[dict] = None) -> str:
+    """Content address for a request: SHA-256 of the URL and keyed headers."""
+    keyed = sorted(
+        (k.lower(), str(v))
+        for k, v in (headers or {}).items()
+        if k.lower() not in _UNKEYED_HEADERS
+    )
+    payload = json.dumps([url, keyed], separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ReaderCache:
+    """Size-bounded LRU cache of Jina Reader markdown on disk.
+
+    Each entry is ``<key>.md.gz`` plus a ``<key>.json`` sidecar holding the
+    URL and HTTP validators.  Recency is tracked through the data file's
+    mtime, which is bumped on every hit; the least recently used entries
+    are evicted once the compressed total exceeds *max_bytes*.
+
+    Args:
+        directory: Cache directory (default: ``$JINA_READER_CACHE_DIR`` or
+            ``~/.cache/innocenti-risk/jina-reader``)
+        max_bytes: Upper bound on total compressed size
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, os.PathLike, None] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        directory = directory or os.getenv("JINA_READER_CACHE_DIR") or DEFAULT_CACHE_DIR
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+
+    def _paths(self, key: str) -> tuple[Path, Path]:
+        return self.directory / f"{key}.md.gz", self.directory / f"{key}.json"
+
+    def get_entry(self, url: str, headers: Optional[dict] = None) -> Optional[dict]:
+        """Return ``{"text", "etag", "last_modified", ...}`` or ``None`` on a miss."""
+        data_path, meta_path = self._paths(cache_key(url, headers))
+        try:
+            meta = json.loads(meta_path.read_text())
+            with gzip.open(data_path, "rt", encoding="utf-8") as f:
+                text = f.read()
+        except (OSError, ValueError, EOFError):
+            return None
+        self.touch(url, headers)
+        return {**meta, "text": text}
+
+    def get(self, url: str, headers: Optional[dict] = None) -> Optional[str]:
+        """Return cached markdown for *url*, or ``None`` on a miss."""
+        entry = self.get_entry(url, headers)
+        return entry["text"] if entry else None
+
+    def touch(self, url: str, headers: Optional[dict] = None) -> None:
+        """Mark an entry as recently used."""
+        data_path, _ = self._paths(cache_key(url, headers))
+        try:
+            os.utime(data_path)
+        except OSError:
+            pass
+
+    def put(
+        self,
+        url: str,
+        text: str,
+        headers: Optional[dict] = None,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        """Store *text* (compressed) with its validators, then enforce the size bound."""
+        data_path, meta_path = self._paths(cache_key(url, headers))
+        meta = {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "stored_at": time.time(),
+            "length": len(text),
+        }
+        self._atomic_write(data_path, gzip.compress(text.encode("utf-8")))
+        self._atomic_write(meta_path, json.dumps(meta).encode("utf-8"))
+        self.evict()
+
+    def _atomic_write(self, path: Path, payload: bytes) -> None:
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    def evict(self) -> int:
+        """Drop least recently used entries until under *max_bytes*.
+
+        Returns:
+            Number of entries removed
+        """
+        entries = []
+        total = 0
+        for data_path in self.directory.glob("*.md.gz"):
+            try:
+                stat = data_path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, data_path))
+            total += stat.st_size
+
+        removed = 0
+        for _, size, data_path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            key = data_path.name[: -len(".md.gz")]
+            data_path.unlink(missing_ok=True)
+            (self.directory / f"{key}.json").unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        return removed
+
+    def clear(self) -> None:
+        """Remove every cached entry."""
+        for path in self.directory.glob("*.md.gz"):
+            path.unlink(missing_ok=True)
+        for path in self.directory.glob("*.json"):
+            path.unlink(missing_ok=True)
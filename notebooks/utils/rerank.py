@@ -0,0 +1,219 @@
+"""
+Client-side two-stage retrieval: cached candidates, then rerank.
+
+The ``text_similarity_reranker`` retriever re-runs first-stage retrieval on
+every request, even when only the reranker or ``rank_window_size`` changes.
+Here the first-stage candidate set is fetched once per query and cached,
+and the rerank inference endpoint is called directly on the cached
+passages.  Relevance scores are memoized per passage, so sweeping window
+sizes only scores passages that have not been scored yet.
+"""
+
+import json
+import threading
+from collections import OrderedDict
+from typing import Iterable, Optional
+
+DEFAULT_WINDOW = 50
+
+
+def default_retriever(query: str, field: str = "text") -> dict:
+    """The first stage used by the rerank notebook: a ``match`` on *field*.
+
+    On the default ``semantic_text`` field this is a semantic query, not
+    BM25; pass a plain ``text`` field for lexical candidates.
+    """
+    return {"standard": {"query": {"match": {field: query}}}}
+
+
+class CandidateCache:
+    """LRU of first-stage candidate sets plus memoized rerank scores.
+
+    Candidate sets are keyed by index, query and retriever; scores by
+    rerank endpoint and query, then document ``_id``.  Both are LRUs of
+    at most *max_queries* entries.
+    """
+
+    def __init__(self, max_queries: int = 1000):
+        self.max_queries = max_queries
+        self.hits = 0
+        self.misses = 0
+        self._candidates: OrderedDict[str, list[dict]] = OrderedDict()
+        self._scores: OrderedDict[tuple, dict[str, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(index_name: str, query: str, retriever: dict) -> str:
+        return json.dumps([index_name, query, retriever], sort_keys=True)
+
+    def get(self, key: str, size: int) -> Optional[list[dict]]:
+        """Cached candidates if at least *size* were fetched (or all exist)."""
+        with self._lock:
+            entry = self._candidates.get(key)
+            if entry is not None and (entry["size"] >= size or entry["exhausted"]):
+                self._candidates.move_to_end(key)
+                self.hits += 1
+                return entry["hits"][:size]
+            self.misses += 1
+            return None
+
+    def put(self, key: str, hits: list[dict], size: int) -> None:
+        with self._lock:
+            self._candidates[key] = {
+                "hits": hits, "size": size, "exhausted": len(hits) < size,
+            }
+            self._candidates.move_to_end(key)
+            while len(self._candidates) > self.max_queries:
+                self._candidates.popitem(last=False)
+
+    def get_scores(self, inference_id: str, query: str, doc_ids: Iterable[str]) -> dict:
+        with self._lock:
+            memo = self._scores.get((inference_id, query))
+            if memo is None:
+                return {}
+            self._scores.move_to_end((inference_id, query))
+            return {doc_id: memo[doc_id] for doc_id in doc_ids if doc_id in memo}
+
+    def put_scores(self, inference_id: str, query: str, scores: dict) -> None:
+        with self._lock:
+            self._scores.setdefault((inference_id, query), {}).update(scores)
+            self._scores.move_to_end((inference_id, query))
+            while len(self._scores) > self.max_queries:
+                self._scores.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._candidates.clear()
+            self._scores.clear()
+
+
+def fetch_candidates(
+    es_client,
+    index_name: str,
+    query: str,
+    size: int = DEFAULT_WINDOW,
+    retriever: Optional[dict] = None,
+    field: str = "text",
+    cache: Optional[CandidateCache] = None,
+) -> list[dict]:
+    """Run (or reuse) first-stage retrieval for *query*.
+
+    Args:
+        es_client: Elasticsearch client
+        index_name: Index to search
+        query: Query text
+        size: Number of candidates (the largest rerank window you need)
+        retriever: First-stage retriever (default: :func:`default_retriever`)
+        field: Passage field returned for reranking
+        cache: Optional :class:`CandidateCache`
+
+    Returns:
+        List of ES hit dicts in first-stage order
+    """
+    retriever = retriever or default_retriever(query, field)
+    key = CandidateCache.key(index_name, query, retriever)
+    if cache is not None:
+        cached = cache.get(key, size)
+        if cached is not None:
+            return cached
+
+    resp = es_client.search(index=index_name, retriever=retriever, size=size)
+    hits = list(resp["hits"]["hits"])
+    if cache is not None:
+        cache.put(key, hits, size)
+    return hits
+
+
+def rerank_candidates(
+    es_client,
+    query: str,
+    hits: list[dict],
+    inference_id: str,
+    window: int = DEFAULT_WINDOW,
+    size: Optional[int] = None,
+    field: str = "text",
+    cache: Optional[CandidateCache] = None,
+) -> list[dict]:
+    """Rerank the top *window* candidates with a ``rerank`` endpoint.
+
+    Mirrors ``text_similarity_reranker``: only the first *window* hits are
+    scored and returned.  Each returned hit is a copy with ``_rerank_score``
+    and ``_first_stage_rank`` added.
+
+    Args:
+        es_client: Elasticsearch client
+        query: Query text sent to the reranker
+        hits: Candidates from :func:`fetch_candidates`
+        inference_id: Rerank endpoint
+        window: Number of candidates to rerank (``rank_window_size``)
+        size: Number of reranked hits to return (default: all of *window*)
+        field: ``_source`` field holding the passage text
+        cache: Optional :class:`CandidateCache` memoizing scores
+
+    Returns:
+        Reranked hit dicts, best first
+    """
+    window_hits = hits[:window]
+    if not window_hits:
+        return []
+    doc_ids = [hit["_id"] for hit in window_hits]
+
+    scores = cache.get_scores(inference_id, query, doc_ids) if cache is not None else {}
+    missing = [i for i, doc_id in enumerate(doc_ids) if doc_id not in scores]
+    if missing:
+        resp = es_client.inference.inference(
+            inference_id=inference_id,
+            body={
+                "query": query,
+                "input": [window_hits[i]["_source"][field] for i in missing],
+            },
+        )
+        fresh = {
+            doc_ids[missing[item["index"]]]: item["relevance_score"]
+            for item in resp["rerank"]
+        }
+        scores.update(fresh)
+        if cache is not None:
+            cache.put_scores(inference_id, query, fresh)
+
+    reranked = [
+        {**hit, "_rerank_score": scores.get(hit["_id"], float("-inf")), "_first_stage_rank": rank}
+        for rank, hit in enumerate(window_hits, 1)
+    ]
+    reranked.sort(key=lambda hit: hit["_rerank_score"], reverse=True)
+    return reranked[:size] if size is not None else reranked
+
+
+def two_stage_search(
+    es_client,
+    index_name: str,
+    query: str,
+    inference_id: str,
+    windows: Iterable[int] = (DEFAULT_WINDOW,),
+    size: int = 10,
+    retriever: Optional[dict] = None,
+    field: str = "text",
+    cache: Optional[CandidateCache] = None,
+) -> dict[int, list[dict]]:
+    """Rerank one query at several window sizes from one candidate fetch.
+
+    Candidates are fetched once for the largest window; with a *cache*,
+    repeat experiments (another reranker, other windows) skip first-stage
+    retrieval and only score passages not scored before.
+
+    Returns:
+        ``{window: reranked hits (top *size*)}``
+    """
+    windows = sorted(set(windows))
+    hits = fetch_candidates(
+        es_client, index_name, query, windows[-1], retriever, field, cache
+    )
+    if cache is None:
+        # Still share scores between the windows of this call.
+        cache = CandidateCache()
+    return {
+        window: rerank_candidates(
+            es_client, query, hits, inference_id, window, size, field, cache
+        )
+        for window in windows
+    }
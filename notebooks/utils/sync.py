@@ -0,0 +1,215 @@
+"""
+Incremental re-ingestion for parsed articles.
+
+Re-indexing a ``semantic_text`` field re-embeds it through EIS, so a full
+delete-and-reload on every run is the dominant cost of the pipeline.  This
+module hashes each article's normalized content, compares it with the
+hashes from the previous run (a JSON manifest or the ``content_hash`` field
+stored in the index) and only sends the creates, updates and deletes that
+are actually needed.
+"""
+
+import hashlib
+import json
+import os
+import re
+import unicodedata
+from pathlib import Path
+from typing import Iterable, Optional, Union
+
+from .indexing import bulk_index
+
+CONTENT_HASH_FIELD = "content_hash"
+
+# Fields that determine what is indexed; ``id`` is the key, not content.
+_HASHED_FIELDS = ("article_number", "title", "text", "language", "url")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _normalize(value) -> str:
+    text = unicodedata.normalize("NFC", str(value))
+    return _WHITESPACE_RE.sub(" ", text).strip()
+
+
+def content_hash(article: dict) -> str:
+    """Stable SHA-256 of an article's normalized, indexed content.
+
+    Whitespace runs are collapsed and text is NFC-normalized, so cosmetic
+    changes in the Jina Reader output do not trigger a re-embed.
+    """
+    digest = hashlib.sha256()
+    for field in _HASHED_FIELDS:
+        digest.update(_normalize(article.get(field, "")).encode("utf-8"))
+        digest.update(b"\x1f")
+    return digest.hexdigest()
+
+
+def load_manifest(path: Union[str, os.PathLike]) -> dict[str, str]:
+    """Load an ``{id: content_hash}`` manifest; missing file means empty."""
+    path = Path(path)
+    if not path.exists():
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_manifest(path: Union[str, os.PathLike], hashes: dict[str, str]) -> None:
+    """Atomically write an ``{id: content_hash}`` manifest."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "w") as f:
+        json.dump(hashes, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def fetch_index_hashes(
+    es_client, index_name: str, languages: Optional[Iterable[str]] = None
+) -> dict[str, str]:
+    """Read ``{_id: content_hash}`` for the documents already in the index.
+
+    Only the hash field is fetched, never the (large) ``semantic_text``.
+    """
+    from elasticsearch.helpers import scan
+
+    if not es_client.indices.exists(index=index_name):
+        return {}
+
+    query = {"match_all": {}}
+    if languages is not None:
+        query = {"terms": {"language": sorted(languages)}}
+
+    return {
+        hit["_id"]: hit.get("_source", {}).get(CONTENT_HASH_FIELD, "")
+        for hit in scan(
+            es_client,
+            index=index_name,
+            query={"query": query},
+            _source=[CONTENT_HASH_FIELD],
+        )
+    }
+
+
+def plan_sync(articles: Iterable[dict], previous: dict[str, str]) -> dict:
+    """Diff parsed articles against the hashes from the previous run.
+
+    Deletes are limited to the languages present in *articles*, so syncing
+    one language never removes another language's documents.
+
+    Args:
+        articles: Output of :func:`utils.parsing.parse_articles`
+        previous: ``{id: content_hash}`` from the manifest or index
+
+    Returns:
+        dict with keys: create, update (lists of articles), delete (list of
+        ids), unchanged (count) and hashes (``{id: content_hash}`` after sync)
+    """
+    create, update = [], []
+    hashes = {}
+    languages = set()
+    unchanged = 0
+
+    for article in articles:
+        digest = content_hash(article)
+        hashes[article["id"]] = digest
+        languages.add(article["language"])
+
+        old = previous.get(article["id"])
+        if old is None:
+            create.append(article)
+        elif old != digest:
+            update.append(article)
+        else:
+            unchanged += 1
+
+    delete = sorted(
+        doc_id for doc_id in previous
+        if doc_id not in hashes and doc_id.split("_", 1)[0] in languages
+    )
+    # Other languages' documents are untouched but stay in the manifest.
+    deleted = set(delete)
+    for doc_id, digest in previous.items():
+        if doc_id not in hashes and doc_id not in deleted:
+            hashes[doc_id] = digest
+
+    return {
+        "create": create,
+        "update": update,
+        "delete": delete,
+        "unchanged": unchanged,
+        "hashes": hashes,
+    }
+
+
+def sync_articles(
+    es_client,
+    index_name: str,
+    articles: Iterable[dict],
+    manifest_path: Union[str, os.PathLike, None] = None,
+    dry_run: bool = False,
+) -> dict:
+    """Index only the articles whose content changed since the last run.
+
+    The previous state comes from *manifest_path* when given, otherwise
+    from the ``content_hash`` field stored alongside each document (which
+    this function writes on every create/update).
+
+    Args:
+        es_client: Elasticsearch client
+        index_name: Target index (must already exist with its mappings)
+        articles: Output of :func:`utils.parsing.parse_articles`
+        manifest_path: Optional JSON manifest of ``{id: content_hash}``
+        dry_run: Compute the plan without sending anything
+
+    Returns:
+        dict with keys: created, updated, deleted, unchanged, errors
+    """
+    articles = list(articles)
+    if manifest_path is not None:
+        previous = load_manifest(manifest_path)
+    else:
+        languages = {a["language"] for a in articles}
+        previous = fetch_index_hashes(es_client, index_name, languages)
+
+    plan = plan_sync(articles, previous)
+    summary = {
+        "created": len(plan["create"]),
+        "updated": len(plan["update"]),
+        "deleted": len(plan["delete"]),
+        "unchanged": plan["unchanged"],
+        "errors": [],
+    }
+    print(f"Sync plan: {summary['created']} new, {summary['updated']} changed, "
+          f"{summary['deleted']} removed, {summary['unchanged']} unchanged")
+
+    if dry_run:
+        return summary
+
+    actions = [
+        {
+            "_index": index_name,
+            "_id": doc["id"],
+            "_source": {**doc, CONTENT_HASH_FIELD: plan["hashes"][doc["id"]]},
+        }
+        for doc in plan["create"] + plan["update"]
+    ]
+    actions += [
+        {"_op_type": "delete", "_index": index_name, "_id": doc_id}
+        for doc_id in plan["delete"]
+    ]
+
+    if actions:
+        if manifest_path is None:
+            es_client.indices.put_mapping(
+                index=index_name,
+                properties={CONTENT_HASH_FIELD: {"type": "keyword"}},
+            )
+        # A 404 on delete means the document is already gone.
+        result = bulk_index(es_client, actions, ignore_status=(404,), verbose=False)
+        summary["errors"] = result["errors"]
+        print(f"✓ Synced {len(actions)} changes ({len(result['errors'])} errors)")
+
+    if manifest_path is not None and not summary["errors"]:
+        save_manifest(manifest_path, plan["hashes"])
+
+    return summary